@@ -0,0 +1,36 @@
+"""대시보드 콜백 벤치마크: update_delayed_data(델타/스냅샷), 히스토리 테이블 페이지 조회"""
+from runner import benchmark, sample_bars
+
+HISTORY_SIZES = [10, 100, 1000]
+
+
+def app_with_history(size):
+    """size개 히스토리가 쌓인 app 모듈 (업스트림 호출 없음)"""
+    import app
+    from history_buffer import HistoryBuffer
+
+    closes = sample_bars()['Close']
+    app.history = HistoryBuffer(capacity=1000)
+    for ts, price in closes.iloc[-size:].items():
+        app.history.append({"Time": ts.strftime('%Y-%m-%d %H:%M'), "Price": float(price)})
+    return app
+
+
+@benchmark("dashboard.update_delayed_data.delta", params=HISTORY_SIZES)
+def bench_update_delta(size):
+    app = app_with_history(size)
+    state = {'seq': app.history.seq - 1}
+    return lambda: app.update_delayed_data(1, state)
+
+
+@benchmark("dashboard.update_delayed_data.snapshot", params=HISTORY_SIZES)
+def bench_update_snapshot(size):
+    app = app_with_history(size)
+    return lambda: app.update_delayed_data(1, {'seq': 0})
+
+
+@benchmark("dashboard.update_history_table", params=HISTORY_SIZES)
+def bench_history_table(size):
+    app = app_with_history(size)
+    sort_by = [{'column_id': 'Price', 'direction': 'asc'}]
+    return lambda: app.update_history_table(2, 15, sort_by, '{Price} ge 5000', {'seq': app.history.seq})
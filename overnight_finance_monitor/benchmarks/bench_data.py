@@ -0,0 +1,60 @@
+"""데이터 계층 벤치마크: T-48h 시점 조회, 오버나이트 변동 계산/차트 장식, 다중 주기 리샘플링"""
+import os
+import sys
+from datetime import timedelta
+
+from runner import benchmark, sample_bars, PACKAGE_DIR
+
+# dash_render 테스트의 FakeDownloader를 함께 사용 (미리 준비한 봉에서 요청 구간만 잘라줌)
+sys.path.append(os.path.join(PACKAGE_DIR, 'dash_render', 'tests'))
+from conftest import FakeDownloader
+
+
+@benchmark("data.get_sp500_futures_at_time")
+def bench_get_sp500_futures_at_time():
+    import data_manager
+    from bar_cache import BarCache
+
+    frame = sample_bars()
+    now = frame.index[-1]
+    data_manager.bar_cache = BarCache(downloader=FakeDownloader(frame=frame), refresh_seconds=10**9)
+    target = (now - timedelta(hours=48)).to_pydatetime()
+    data_manager.get_sp500_futures_at_time(target)  # 캐시 적재 (측정 제외)
+    return lambda: data_manager.get_sp500_futures_at_time(target)
+
+
+@benchmark("data.overnight_gaps", params=[3, 7])
+def bench_overnight_gaps(days):
+    from overnight import overnight_gaps
+
+    close = sample_bars(days=days)['Close'].tz_convert('Asia/Seoul')
+    return lambda: overnight_gaps(close, open="09:00", close="15:30", tz="Asia/Seoul")
+
+
+@benchmark("data.resample_frame", params=[1, 3])
+def bench_resample_frame(days):
+    """1분봉 한 번 훑기로 1m/5m/30m/1h 봉 생성 (주기별 다운로드 대체)"""
+    from resampler import resample_frame
+
+    frame = sample_bars(days=days)
+    return lambda: resample_frame(frame)
+
+
+@benchmark("chart.plot_sp500_tick")
+def bench_plot_sp500_tick():
+    """plot_sp500_futures.py --watch의 한 주기 (새 봉 1개 + 오버나이트 장식 확인, PNG 저장 제외)"""
+    from incremental_chart import IncrementalChart
+    from overnight import overnight_gaps
+
+    close = sample_bars()['Close'].tz_convert('Asia/Seoul')
+    chart = IncrementalChart(None, title='bench', label='ES=F', color='blue')
+    chart.update(close.iloc[:-1])
+    chart.add_gaps(overnight_gaps(close.iloc[:-1]))
+    chart.add_session_markers(close.index[:-1])
+    window = close.iloc[-24 * 60:]
+
+    def tick():
+        chart.update(window)
+        chart.add_gaps(overnight_gaps(window))
+        chart.add_session_markers(window.index)
+    return tick
@@ -0,0 +1,48 @@
+"""KIS 분봉 응답(output2) 파싱 벤치마크: 기존 문자열 DataFrame 경로 vs kis_bars.parse_output2"""
+import pandas as pd
+
+from runner import benchmark, sample_bars
+
+ROW_COUNTS = [100, 1000, 10000]
+
+
+def make_output2(rows):
+    """선물 분봉 API 응답과 같은 모양(모든 값이 문자열)의 output2 레코드"""
+    frame = sample_bars(days=max(1, rows // 1440 + 1)).iloc[-rows:].tz_convert('Asia/Seoul')
+    return [{
+        "stck_bsop_date": ts.strftime('%Y%m%d'),
+        "stck_cntg_hour": str(int(ts.strftime('%H%M%S'))),
+        "futs_prpr": f"{row.Close:.2f}", "futs_oprc": f"{row.Open:.2f}",
+        "futs_hgpr": f"{row.High:.2f}", "futs_lwpr": f"{row.Low:.2f}",
+        "cntg_vol": str(int(row.Volume)),
+    } for ts, row in zip(frame.index, frame.itertuples())]
+
+
+def legacy_parse(output2):
+    """plot_kospi200_futures_direct.py의 기존 전처리"""
+    df = pd.DataFrame(output2)
+    df['close'] = pd.to_numeric(df['futs_prpr'], errors='coerce')
+    df['high'] = pd.to_numeric(df['futs_hgpr'], errors='coerce')
+    df['low'] = pd.to_numeric(df['futs_lwpr'], errors='coerce')
+    df['open'] = pd.to_numeric(df['futs_oprc'], errors='coerce')
+    df['volume'] = pd.to_numeric(df['cntg_vol'], errors='coerce')
+    df = df[df['close'] > 0]
+    df['time'] = pd.to_datetime(
+        df['stck_bsop_date'].astype(str) + df['stck_cntg_hour'].astype(str).str.zfill(6),
+        format='%Y%m%d%H%M%S'
+    )
+    return df.drop_duplicates(subset=['time']).sort_values('time')
+
+
+@benchmark("kis.output2.legacy_dataframe", params=ROW_COUNTS)
+def bench_legacy_parse(rows):
+    output2 = make_output2(rows)
+    return lambda: legacy_parse(output2)
+
+
+@benchmark("kis.output2.parse_output2", params=ROW_COUNTS)
+def bench_parse_output2(rows):
+    from kis_bars import parse_output2
+
+    output2 = make_output2(rows)
+    return lambda: parse_output2(output2).valid().sorted_unique()
@@ -0,0 +1,95 @@
+"""
+KIS 분봉 시각(stck_bsop_date + stck_cntg_hour) 변환 방식별 속도 비교
+
+- concat_to_datetime: 기존 방식 (문자열 결합 + pd.to_datetime(format=...))
+- strptime_apply: 기존 fallback 방식 (행마다 datetime.strptime)
+- integer_decode: kis_bars.decode_kst_datetimes (자릿수 정수 연산)
+
+사용 예) python benchmarks/bench_kis_timestamps.py --rows 100000
+"""
+import os
+import sys
+import timeit
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from kis_bars import decode_kst_datetimes
+from runner import benchmark
+
+
+def make_records(rows, seed=0):
+    """며칠치 분봉과 비슷한 (날짜, 시각) 문자열 목록을 만듭니다. 시각은 KIS처럼 앞자리 0이 빠질 수 있습니다."""
+    rng = np.random.default_rng(seed)
+    days = pd.Timestamp("2026-10-01") + pd.to_timedelta(rng.integers(0, 20, rows), unit="D")
+    minutes = rng.integers(0, 24 * 60, rows)
+    dates = days.strftime("%Y%m%d").tolist()
+    hours = [str((m // 60) * 10000 + (m % 60) * 100) for m in minutes]
+    return dates, hours
+
+
+def concat_to_datetime(dates, hours):
+    df = pd.DataFrame({"stck_bsop_date": dates, "stck_cntg_hour": hours})
+    return pd.to_datetime(
+        df["stck_bsop_date"].astype(str) + df["stck_cntg_hour"].astype(str).str.zfill(6),
+        format="%Y%m%d%H%M%S"
+    ).dt.tz_localize("Asia/Seoul")
+
+
+def strptime_apply(dates, hours):
+    df = pd.DataFrame({"stck_bsop_date": dates, "stck_cntg_hour": hours})
+    combined = df["stck_bsop_date"] + df["stck_cntg_hour"].map(lambda x: str(x).zfill(6))
+    return combined.apply(lambda x: datetime.strptime(x, "%Y%m%d%H%M%S")).dt.tz_localize("Asia/Seoul")
+
+
+def integer_decode(dates, hours):
+    return decode_kst_datetimes(dates, hours)
+
+
+CANDIDATES = [concat_to_datetime, strptime_apply, integer_decode]
+
+
+def register(func):
+    """runner.py 벤치마크로 등록 (kis.timestamps.<방식>[rows])"""
+    def setup(rows):
+        dates, hours = make_records(rows)
+        return lambda: func(dates, hours)
+    benchmark(f"kis.timestamps.{func.__name__}", params=[1000, 10000])(setup)
+
+
+for _func in CANDIDATES:
+    register(_func)
+
+
+def run(rows, repeat=5):
+    """방식별 최소 실행 시간(초)을 {이름: 초}로 반환합니다. 모든 방식의 결과가 같은지도 확인합니다."""
+    dates, hours = make_records(rows)
+    expected = pd.DatetimeIndex(concat_to_datetime(dates, hours))
+    results = {}
+    for func in CANDIDATES:
+        assert pd.DatetimeIndex(func(dates, hours)).equals(expected), func.__name__
+        results[func.__name__] = min(timeit.repeat(lambda: func(dates, hours), number=1, repeat=repeat))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KIS 시각 변환 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        results = run(rows, args.repeat)
+        baseline = results["concat_to_datetime"]
+        print(f"\n[{rows} rows]")
+        for name, seconds in results.items():
+            print(f"  {name:<20} {seconds * 1000:9.2f} ms  (x{baseline / seconds:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+데이터/대시보드 주요 경로 벤치마크 실행기
+
+benchmarks/bench_*.py에서 @benchmark로 등록한 항목을 실행하고, 결과를
+benchmarks/results/<커밋>.json에 저장한 뒤 이전 결과와 비교합니다.
+
+사용 예)
+  python benchmarks/runner.py                  # 전체 실행 + 직전 결과와 비교
+  python benchmarks/runner.py -k history       # 이름에 history가 들어간 항목만
+  python benchmarks/runner.py --baseline abc123 --threshold 1.2
+"""
+import os
+import sys
+import json
+import glob
+import time
+import timeit
+import argparse
+import logging
+import importlib
+import platform
+import statistics
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# 벤치마크에서 상위 폴더(kis_*)와 dash_render 모듈을 모두 import할 수 있도록 합니다.
+for path in (PACKAGE_DIR, os.path.join(PACKAGE_DIR, 'dash_render')):
+    if path not in sys.path:
+        sys.path.append(path)
+
+# 이름 -> (setup 함수, 파라미터 목록)
+REGISTRY = {}
+
+# 녹화된 yfinance fixture (dash_render/fixtures.py) 위치
+FIXTURE_DIR = os.environ.get('MONITOR_FIXTURE_DIR', os.path.join(PACKAGE_DIR, 'dash_render', 'tests', 'fixtures'))
+
+
+def benchmark(name, params=(None,)):
+    """
+    벤치마크 등록 데코레이터. 장식한 함수는 param을 받아 '측정할 호출(인자 없는 함수)'을 반환합니다.
+    (준비 작업은 측정 시간에 포함되지 않습니다.)
+    """
+    def register(setup):
+        REGISTRY[name] = (setup, list(params))
+        return setup
+    return register
+
+
+def discover():
+    """benchmarks/bench_*.py를 import해 벤치마크를 등록합니다."""
+    if BENCH_DIR not in sys.path:
+        sys.path.append(BENCH_DIR)
+    for path in sorted(glob.glob(os.path.join(BENCH_DIR, 'bench_*.py'))):
+        importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+
+
+def sample_bars(ticker="ES=F", interval="1m", days=3):
+    """
+    벤치마크 입력 봉 데이터. 녹화된 fixture가 있으면 그 마지막 days일을, 없으면 같은 모양의
+    규칙적인 1분봉(고정 시드 랜덤워크, 24시간)을 사용합니다. 어느 쪽이든 실행할 때마다 같은 입력입니다.
+    """
+    import numpy as np
+    import pandas as pd
+    from fixtures import FixtureDownloader
+
+    fixture = FixtureDownloader('replay', FIXTURE_DIR).load(ticker, interval)
+    if fixture is not None and not fixture['frame'].empty:
+        frame = fixture['frame']
+        return frame[frame.index >= frame.index[-1] - pd.Timedelta(days=days)]
+
+    index = pd.date_range("2026-10-12 00:00", periods=days * 24 * 60, freq="1min", tz="UTC")
+    rng = np.random.default_rng(0)
+    close = 5000 + np.cumsum(rng.normal(0, 0.5, len(index))).round(2)
+    return pd.DataFrame({'Open': close, 'High': close + 0.25, 'Low': close - 0.25, 'Close': close,
+                         'Volume': rng.integers(0, 500, len(index))}, index=index)
+
+
+def result_key(name, param):
+    return name if param is None else f"{name}[{param}]"
+
+
+def measure(call, repeat=5, min_time=0.2):
+    """call 1회 시간을 초 단위로 측정합니다. (min_time 이상 걸리도록 반복 횟수를 정하고, repeat번 중 최소/중앙값)"""
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {'min': min(runs), 'median': statistics.median(runs), 'number': number, 'repeat': repeat}
+
+
+def run(pattern=None, repeat=5):
+    """등록된 벤치마크를 실행해 {키: 측정 결과}를 반환합니다."""
+    results = {}
+    for name, (setup, params) in sorted(REGISTRY.items()):
+        if pattern and pattern not in name:
+            continue
+        for param in params:
+            key = result_key(name, param)
+            call = setup() if param is None else setup(param)
+            results[key] = measure(call, repeat=repeat)
+            print(f"  {key:<48} {results[key]['min'] * 1000:10.3f} ms")
+    return results
+
+
+def git_revision():
+    """현재 커밋 (작업 중 변경이 있으면 -dirty)"""
+    try:
+        sha = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=PACKAGE_DIR, text=True).strip()
+        dirty = subprocess.call(['git', 'diff', '--quiet', 'HEAD'], cwd=PACKAGE_DIR) != 0
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f"{sha}-dirty" if dirty else sha
+
+
+def save_results(results, revision, directory=RESULTS_DIR):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{revision}.json")
+    payload = {
+        'revision': revision,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def load_baseline(revision=None, exclude=None, directory=RESULTS_DIR):
+    """revision의 결과를 읽습니다. 지정하지 않으면 exclude를 제외한 가장 최근 결과."""
+    if revision:
+        path = os.path.join(directory, f"{revision}.json")
+        if not os.path.exists(path):
+            return None
+    else:
+        paths = [p for p in glob.glob(os.path.join(directory, '*.json'))
+                 if os.path.splitext(os.path.basename(p))[0] != exclude]
+        if not paths:
+            return None
+        path = max(paths, key=os.path.getmtime)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold=1.2):
+    """
+    baseline 대비 최소 시간 비율을 비교해 (키, 이전 ms, 현재 ms, 비율) 중 threshold를 넘은 항목 목록을 반환합니다.
+    """
+    regressions = []
+    for key, current in sorted(results.items()):
+        previous = baseline['results'].get(key)
+        if previous is None:
+            print(f"  {key:<48} (new)")
+            continue
+        ratio = current['min'] / previous['min']
+        flag = "  <-- REGRESSION" if ratio > threshold else ""
+        print(f"  {key:<48} {previous['min'] * 1000:10.3f} -> {current['min'] * 1000:10.3f} ms (x{ratio:.2f}){flag}")
+        if ratio > threshold:
+            regressions.append((key, previous['min'] * 1000, current['min'] * 1000, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 실행/비교")
+    parser.add_argument("-k", dest="pattern", default=None, help="이름에 이 문자열이 포함된 벤치마크만 실행")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=None, help="비교할 결과(커밋). 기본: 가장 최근 다른 결과")
+    parser.add_argument("--threshold", type=float, default=1.2, help="이 배율 이상 느려지면 회귀로 표시")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    # 측정 중 INFO 로그 출력이 시간에 섞이지 않도록 끕니다.
+    logging.disable(logging.INFO)
+    discover()
+    revision = git_revision()
+    print(f"[벤치마크 실행] revision={revision}")
+    results = run(args.pattern, args.repeat)
+
+    if not args.no_save:
+        print(f"[OK] 결과 저장: {save_results(results, revision)}")
+
+    baseline = load_baseline(args.baseline, exclude=revision)
+    if baseline is None:
+        print("비교할 이전 결과가 없습니다.")
+        return
+    print(f"\n[비교] {baseline['revision']} -> {revision}")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n[WARNING] {len(regressions)}개 항목이 x{args.threshold} 이상 느려졌습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # bench_*.py의 'from runner import benchmark'가 이 모듈의 REGISTRY를 쓰도록 합니다.
+    sys.modules.setdefault('runner', sys.modules[__name__])
+    main()
@@ -1,63 +1,21 @@
-import requests
+from kis_client import KISClient, API_INFO_PATH
 
-def load_kis_api_info(filepath):
-    api_info = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line and '\t' in line:
-                key, value = line.split('\t', 1)
-                api_info[key] = value
-    return api_info
+client = KISClient.from_api_info(API_INFO_PATH)
 
-API_INFO_PATH = r"C:\Users\hangs\OneDrive\GitRepositories_related_private_data\KIS_API_INFO.txt"
-api_info = load_kis_api_info(API_INFO_PATH)
-
-APP_KEY = api_info.get('APP_KEY')
-APP_SECRET = api_info.get('APP_Secret')
-
-# Access Token 발급
-print("Access Token 발급 중...")
-token_url = "https://openapi.koreainvestment.com:9443/oauth2/tokenP"
-token_body = {
-    "grant_type": "client_credentials",
-    "appkey": APP_KEY,
-    "appsecret": APP_SECRET
-}
-
-token_res = requests.post(token_url, json=token_body)
-if token_res.status_code == 200:
-    access_token = token_res.json().get("access_token")
-    print(f"[OK] Access Token 발급 성공 (길이: {len(access_token)})")
+# Access Token 발급 (kis_token.dat에 저장된 토큰이 유효하면 재사용)
+print("Access Token 준비 중...")
+access_token = client.get_access_token()
+if access_token:
+    print(f"[OK] Access Token 준비 완료 (길이: {len(access_token)})")
 else:
-    print(f"[ERROR] Token 발급 실패: {token_res.text}")
     exit()
 
 # 선물 현재가 조회 (권한 테스트)
 print("\n=== 코스피200 선물 현재가 조회 (권한 테스트) ===")
 
-url = "https://openapi.koreainvestment.com:9443/uapi/domestic-futureoption/v1/quotations/inquire-price"
-
-headers = {
-    "content-type": "application/json; charset=utf-8",
-    "authorization": f"Bearer {access_token}",
-    "appkey": APP_KEY,
-    "appsecret": APP_SECRET,
-    "tr_id": "FHMIF10000000",  # 선물 현재가 조회
-    "custtype": "P"
-}
-
-params = {
-    "FID_COND_MRKT_DIV_CODE": "F",  # F: 선물
-    "FID_INPUT_ISCD": "101SC000"    # 코스피200 선물 연속
-}
-
-res = requests.get(url, headers=headers, params=params)
-
-print(f"HTTP 상태: {res.status_code}")
+data = client.inquire_price("101SC000")  # 코스피200 선물 연속
 
-if res.status_code == 200:
-    data = res.json()
+if data is not None:
     print(f"응답 코드: {data.get('rt_cd')}")
     print(f"메시지: {data.get('msg1')}")
     
@@ -85,4 +43,4 @@ if res.status_code == 200:
             print("\n>>> 파생상품 권한이 없을 가능성이 높습니다!")
             print(">>> KIS Developers 포털에서 권한을 확인해주세요.")
 else:
-    print(f"[ERROR] HTTP 오류: {res.text[:500]}")
+    print("[ERROR] HTTP 오류 (위 로그 참조)")
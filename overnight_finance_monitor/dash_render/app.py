@@ -1,7 +1,15 @@
 import dash
-from dash import dcc, html, dash_table, Input, Output, State
+from dash import dcc, html, dash_table, Input, Output, State, no_update
 import dash_bootstrap_components as dbc
-from data_manager import get_sp500_futures_at_time
+from data_manager import store, downloader, bar_cache
+from fixtures import fixture_clock
+from history_buffer import HistoryBuffer, parse_filter_query
+from live_chart import make_live_figure
+from market_calendar import CME, SessionSchedule
+from delta_codec import encode_points, PRICE_SCALE
+from poller import BackgroundPoller
+from replay import ReplayEngine
+from shared_store import worker_id
 import pandas as pd
 from datetime import datetime, timedelta
 import logging
@@ -17,7 +25,8 @@ try:
     app = dash.Dash(
         __name__, 
         external_stylesheets=[dbc.themes.FLATLY],
-        meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}]
+        meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}],
+        compress=True  # flask-compress로 콜백 응답/자원을 gzip·brotli 압축
     )
     server = app.server
     logger.info("Dash App and Server initialized successfully.")
@@ -25,8 +34,19 @@ except Exception as e:
     logger.error(f"Failed to initialize Dash App: {e}", exc_info=True)
     raise
 
+# 모든 세션이 공유하는 서버 측 히스토리 (최대 1000개 유지)
+history = HistoryBuffer(capacity=1000)
+
+# T-48h 재생 엔진: 공유 BarCache(봉은 store에 저장)에서 tick마다 재생 시각의 봉 하나씩 꺼냄
+# (MONITOR_REPLAY_SPEED=60이면 1초에 1분봉씩 재생, 재생 시작 시각은 store에 기록해 워커끼리 공유)
+# (fixture 재생 모드에서는 녹화 시각 기준 시계를 사용해 네트워크 없이 같은 구간을 재생)
+replay = ReplayEngine("ES=F", delay=timedelta(hours=48), cache=bar_cache, store=store,
+                      clock=fixture_clock(downloader, "ES=F"))
+POLL_INTERVAL_SECONDS = replay.tick_seconds()
+
 app.layout = dbc.Container([
-    dcc.Store(id='data-history-store', data=[]), # 과거 데이터 저장소
+    dcc.Store(id='history-cursor', data={'seq': 0}), # 이 세션이 받은 히스토리 위치만 (매 tick State로 올라가므로 작게 유지)
+    dcc.Store(id='history-delta'), # 마지막으로 받은 델타 (delta_codec 형식, 서버 → 브라우저 방향으로만 전송)
     
     dbc.Row([
         dbc.Col(html.H1("S&P 500 Delayed Monitor (T-48h)", className="text-center my-4"), width=12)
@@ -46,13 +66,28 @@ app.layout = dbc.Container([
             dbc.Card([
                 dbc.CardHeader("Latest Delayed Price (48h ago)"),
                 dbc.CardBody([
-                    html.H2(id="current-delayed-price", className="text-primary text-center"),
-                    html.P(id="current-delayed-time", className="text-center text-muted")
+                    html.H2("No Data", id="current-delayed-price", className="text-primary text-center"),
+                    html.P("Fetching...", id="current-delayed-time", className="text-center text-muted")
                 ])
             ], className="mb-4")
         ], width=12)
     ]),
 
+    dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardHeader("Price Chart (T-48h, 1m)"),
+                dbc.CardBody(
+                    dcc.Graph(
+                        id='live-price-chart',
+                        figure=make_live_figure(max_points=history.capacity),
+                        config={'displayModeBar': False}
+                    )
+                )
+            ], className="mb-4")
+        ], width=12)
+    ]),
+
     dbc.Row([
         dbc.Col([
             dbc.Card([
@@ -65,7 +100,16 @@ app.layout = dbc.Container([
                             {"name": "Price", "id": "Price"}
                         ],
                         data=[],
+                        # 페이징/정렬/필터는 서버의 히스토리 인덱스에서 처리하고 보이는 페이지만 전송
+                        page_action='custom',
+                        page_current=0,
                         page_size=15,
+                        page_count=1,
+                        sort_action='custom',
+                        sort_mode='single',
+                        sort_by=[],
+                        filter_action='custom',
+                        filter_query='',
                         style_table={'overflowX': 'auto'},
                         style_cell={'textAlign': 'center'},
                         style_header={
@@ -80,53 +124,177 @@ app.layout = dbc.Container([
     
     dcc.Interval(
         id='interval-component',
-        interval=60*1000, # 1분마다 실행
+        interval=max(int(POLL_INTERVAL_SECONDS * 1000), 1000), # 재생 tick마다 실행 (기본 1분)
         n_intervals=0
     )
 ], fluid=True)
 
-@app.callback(
-    [Output('data-history-store', 'data'),
-     Output('current-delayed-price', 'children'),
-     Output('current-delayed-time', 'children'),
-     Output('history-table', 'data')],
-    [Input('interval-component', 'n_intervals')],
-    [State('data-history-store', 'data')]
-)
-def update_delayed_data(n_intervals, existing_data):
-    logger.info(f"Interval triggered (n_intervals={n_intervals}). Fetching delayed data...")
-    
-    # 현재 시간 기준 48시간 전 계산
-    target_time = datetime.now() - timedelta(hours=48)
-    logger.info(f"Targeting historical time: {target_time}")
-    
-    # 데이터 가져오기
-    try:
-        new_point = get_sp500_futures_at_time(target_time)
+# 공유 저장소에서 마지막으로 동기화한 히스토리 id
+_synced_history_id = 0
+
+# 리더 lease는 다음에 깨어날 시각보다 이만큼 더 유지합니다. (job 실행 시간 + 여유)
+LEASE_GRACE_SECONDS = POLL_INTERVAL_SECONDS + 30
+
+def poll_delayed_point():
+    """
+    백그라운드 수집 작업.
+    - 리더 워커만 재생 엔진에서 48시간 전 1분봉 종가를 꺼내 공유 저장소와 히스토리에 추가합니다.
+    - 모든 워커는 공유 저장소의 새 히스토리를 자기 HistoryBuffer로 동기화합니다.
+    """
+    global _synced_history_id
+    if acquire_leader(POLL_INTERVAL_SECONDS + LEASE_GRACE_SECONDS):
+        # 재생 시각(기본: 현재 시간 기준 48시간 전)의 봉을 공유 BarCache에서 조회
+        new_point = replay.next_point()
         
-        if new_point:
-            # 중복 체크
-            if not any(d['Time'] == new_point['Time'] for d in existing_data):
-                existing_data.insert(0, new_point)
-                logger.info(f"New data point added to history: {new_point}")
-            else:
-                logger.info("Data point already exists in history. Skipping.")
-        else:
+        if not new_point:
             logger.warning("No new data point found for the target time.")
-    except Exception as e:
-        logger.error(f"Error during callback update: {e}", exc_info=True)
+        elif new_point['Time'] in history:
+            # 재생 시각이 아직 다음 봉에 닿지 않음 (tick마다 흔하므로 debug로만)
+            logger.debug("Data point already exists in history. Skipping.")
+        else:
+            # 공유 저장소에 먼저 쓰고, 저장소가 발급한 history.id를 seq로 삼아 로컬 버퍼에 반영
+            row_id = store.append_history(new_point)
+            if row_id is None:
+                logger.debug("Data point already exists in shared history. Skipping.")
+            else:
+                sync_history_from_store()
+                # LocalStore는 저장소에서 다시 읽을 수 없으므로 직접 추가
+                if row_id > _synced_history_id:
+                    history.append(new_point, seq=row_id)
+                    _synced_history_id = row_id
+                logger.info(f"New data point added to history: {new_point}")
     
-    # 최대 1000개까지만 유지
-    updated_history = existing_data[:1000]
+    sync_history_from_store()
+
+def sync_history_from_store():
+    """
+    다른 워커(리더)가 공유 저장소에 쓴 히스토리를 가져옵니다. (LocalStore에서는 아무것도 없음)
+    저장소의 history.id를 그대로 seq로 쓰므로 어느 워커가 응답해도 클라이언트의 델타 위치가 같습니다.
+    """
+    global _synced_history_id
+    for row_id, point in store.history_since(_synced_history_id, limit=history.capacity):
+        history.append(point, seq=row_id)
+        _synced_history_id = row_id
+
+def renew_leader_lease(sleep_seconds):
+    """
+    수집 스레드가 잠들기 직전에 호출됩니다. 리더 lease를 다음에 깨어날 시각 이후까지 연장해
+    장 마감 등으로 오래 잠들어도 lease가 중간에 만료되어 다른 워커가 가져가지 않게 합니다.
+    (lease가 이미 만료된 워커라면 이어받고, 다른 워커의 유효한 lease는 건드리지 않음)
+    """
+    acquire_leader(sleep_seconds + LEASE_GRACE_SECONDS)
+
+def acquire_leader(ttl_seconds):
+    """
+    리더 lease를 얻거나 연장합니다. 아무도 리더가 아니던 상태(첫 기동/재시작)에서 얻으면
+    이전 실행이 store에 남긴 재생 시작 시각을 지워 재생을 지금부터 다시 시작합니다.
+    """
+    return store.try_acquire_leader(worker_id(), ttl_seconds=ttl_seconds, reset_keys=(replay.settings_key,))
+
+# 프로세스당 하나의 수집 스레드가 모든 세션을 위해 재생 tick(기본 1분)마다 데이터를 가져옵니다.
+# 재생 시각 기준으로 CME 장이 닫혀 있으면(주말/휴장/일일 정지) 다음 개장까지 업스트림을 호출하지 않습니다.
+# 재생은 tick마다 메모리(BarCache)에서 봉을 꺼내므로 간격을 늘려도 아끼는 호출 없이 봉만 건너뛰게 됩니다.
+# 그래서 tick 간격은 고정하고, 새 봉이 없을 때의 백오프는 실제로 업스트림을 부르는 BarCache 꼬리 보충에만 둡니다.
+schedule = SessionSchedule(CME, POLL_INTERVAL_SECONDS, clock=replay.replay_time, speed=replay.speed)
+poller = BackgroundPoller(poll_delayed_point, interval_seconds=POLL_INTERVAL_SECONDS, schedule=schedule,
+                          heartbeat=renew_leader_lease)
+
+@server.before_request
+def ensure_poller_started():
+    # import 시점이 아닌 첫 요청 시 시작 (gunicorn --preload로 fork 전에 스레드가 생기는 것을 방지)
+    if not poller.running:
+        # 수집 일정이 재생 시계를 읽기 전에 lease부터 확인합니다. (재시작이면 이전 재생 시작 시각을 지움)
+        acquire_leader(POLL_INTERVAL_SECONDS + LEASE_GRACE_SECONDS)
+    poller.start()
+
+@app.callback(
+    [Output('history-delta', 'data'),
+     Output('history-cursor', 'data')],
+    [Input('interval-component', 'n_intervals')],
+    [State('history-cursor', 'data')]
+)
+def update_delayed_data(n_intervals, client_state):
+    # 세션 콜백은 업스트림을 호출하지 않고 백그라운드 수집 결과만 읽습니다.
+    # 델타는 history-delta로만 내려보내고, 요청에 실려 올라가는 history-cursor에는 seq만 남깁니다.
+    logger.debug(f"Interval triggered (n_intervals={n_intervals}).")
+    delta = build_history_update(client_state)
+    cursor = no_update if delta is no_update else {'seq': delta['seq']}
+    return delta, cursor
+
+def build_history_update(client_state):
+    """
+    클라이언트가 마지막으로 받은 seq 이후의 변경분만 delta_codec 형식으로 내려보냅니다.
+    - 변경 없음: no_update (응답 본문 없음)
+    - 델타 가능: 새 점만 (epoch 초 / 정수 가격, 차분 인코딩)
+    - 너무 뒤처졌거나 첫 요청: 전체 스냅샷 (reset=True)
+    가격/시각 표시와 차트 갱신은 브라우저의 clientside 콜백(decode_history_delta)이 처리하고,
+    테이블은 seq가 바뀌면 update_history_table이 현재 페이지만 다시 조회합니다.
+    """
+    client_seq = (client_state or {}).get('seq', 0)
     
-    if not updated_history:
-        return [], "No Data", "Fetching...", []
-        
-    latest = updated_history[0]
-    price_display = f"${latest['Price']:,.2f}"
-    time_display = f"Target Time: {latest['Time']}"
+    if client_seq == history.seq:
+        return no_update
     
-    return updated_history, price_display, time_display, updated_history
+    seq, new_rows = history.delta(client_seq) if client_seq else (None, None)
+    if new_rows is None:
+        seq, rows = history.snapshot()
+        return encode_points(list(reversed(rows)), seq, reset=True)
+    return encode_points(list(reversed(new_rows)), seq)
+
+# 델타를 풀어 가격/시각 표시와 차트를 갱신합니다. (서버 왕복 없이 브라우저에서 실행)
+app.clientside_callback(
+    """
+    function(delta, figure) {
+        const noUpdate = window.dash_clientside.no_update;
+        if (!delta || !delta.t || delta.t.length === 0) {
+            return [noUpdate, noUpdate, noUpdate, noUpdate];
+        }
+        const scale = delta.s || %d;
+        const xs = [], ys = [];
+        let t = 0, p = 0;
+        for (let i = 0; i < delta.t.length; i++) {
+            t += delta.t[i];
+            p += delta.p[i];
+            xs.push(t * 1000);
+            ys.push(p / scale);
+        }
+        const lastTime = new Date(xs[xs.length - 1]).toISOString().slice(0, 16).replace('T', ' ');
+        const lastPrice = ys[ys.length - 1].toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+        if (delta.reset) {
+            const trace = Object.assign({}, figure.data[0], {x: xs, y: ys});
+            return ['$' + lastPrice, 'Target Time: ' + lastTime, Object.assign({}, figure, {data: [trace]}), noUpdate];
+        }
+        return ['$' + lastPrice, 'Target Time: ' + lastTime, noUpdate, [{x: [xs], y: [ys]}, [0], %d]];
+    }
+    """ % (PRICE_SCALE, history.capacity),
+    [Output('current-delayed-price', 'children'),
+     Output('current-delayed-time', 'children'),
+     Output('live-price-chart', 'figure'),
+     Output('live-price-chart', 'extendData')],
+    [Input('history-delta', 'data')],
+    [State('live-price-chart', 'figure')]
+)
+
+@app.callback(
+    [Output('history-table', 'data'),
+     Output('history-table', 'page_count')],
+    [Input('history-table', 'page_current'),
+     Input('history-table', 'page_size'),
+     Input('history-table', 'sort_by'),
+     Input('history-table', 'filter_query'),
+     Input('history-cursor', 'data')]
+)
+def update_history_table(page_current, page_size, sort_by, filter_query, client_state):
+    """서버 히스토리에서 현재 페이지(기본: 최신순)만 조회해 내려보냅니다."""
+    sort = sort_by[0] if sort_by else {'column_id': 'Time', 'direction': 'desc'}
+    total, rows = history.query(
+        page=page_current or 0,
+        page_size=page_size,
+        sort_by=sort['column_id'],
+        descending=sort['direction'] == 'desc',
+        filters=parse_filter_query(filter_query),
+    )
+    return rows, max((total + page_size - 1) // page_size, 1)
 
 if __name__ == '__main__':
     logger.info("Running Dash server on http://127.0.0.1:8050/")
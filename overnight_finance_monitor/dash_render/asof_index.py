@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+
+def to_epoch_ns(values):
+    """datetime/Timestamp(단일 또는 목록)을 UTC epoch 나노초(int64)로 변환합니다. (naive는 UTC로 간주)"""
+    converted = pd.to_datetime(values, utc=True)
+    if isinstance(converted, pd.Timestamp):
+        converted = [converted]
+    return pd.DatetimeIndex(converted).as_unit('ns').asi8
+
+
+class AsOfIndex:
+    """
+    정렬된 봉 시각(int64 epoch ns) 위에서 'target 이전(포함) 마지막 봉'을 찾는 인덱스입니다.
+
+    np.searchsorted를 사용하므로 단건/다건 조회 모두 O(log n)이며,
+    DataFrame을 복사하거나 불리언 마스크를 만들지 않고 행 위치만 돌려줍니다.
+    """
+
+    def __init__(self, index):
+        index = pd.DatetimeIndex(index)
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+        self._epoch = index.as_unit('ns').asi8
+        if len(self._epoch) > 1 and not (np.diff(self._epoch) >= 0).all():
+            raise ValueError("AsOfIndex requires a sorted DatetimeIndex")
+
+    def __len__(self):
+        return len(self._epoch)
+
+    def positions(self, targets, tolerance=None, direction="backward"):
+        """
+        각 target에 대해 행 위치를 반환합니다. 없으면 -1.
+        - direction="backward": target 이전(포함) 마지막 봉
+        - direction="forward": target 이후(포함) 첫 봉
+        tolerance(timedelta)를 주면 target과 그보다 멀리 떨어진 봉은 없는 것으로 처리합니다.
+        """
+        target_ns = to_epoch_ns(targets)
+        n = len(self._epoch)
+        if direction == "backward":
+            pos = np.searchsorted(self._epoch, target_ns, side='right') - 1
+        elif direction == "forward":
+            pos = np.searchsorted(self._epoch, target_ns, side='left')
+            pos = np.where(pos >= n, -1, pos)
+        else:
+            raise ValueError(f"direction must be 'backward' or 'forward', got {direction!r}")
+        if tolerance is not None and n:
+            limit = pd.Timedelta(tolerance).value
+            stale = np.abs(target_ns - self._epoch[np.clip(pos, 0, n - 1)]) > limit
+            pos = np.where(stale, -1, pos)
+        return pos
+
+    def position(self, target, tolerance=None, direction="backward"):
+        """단건 조회용 positions()."""
+        return int(self.positions(target, tolerance, direction)[0])
+
+    def window(self, start, end):
+        """[start, end] 구간에 해당하는 행 위치 범위(slice)를 반환합니다."""
+        lo, hi = to_epoch_ns([start, end])
+        return slice(int(np.searchsorted(self._epoch, lo, side='left')),
+                     int(np.searchsorted(self._epoch, hi, side='right')))
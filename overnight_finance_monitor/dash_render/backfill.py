@@ -0,0 +1,214 @@
+"""
+yfinance 분봉 조회 한도를 지키면서 긴 구간을 한꺼번에 채우는 백필 도구입니다.
+
+check_yfinance_limit.py / check_yfinance_history.py로 확인한 한도:
+- 1m: 요청 1회당 최대 7일, 최근 30일 이내만 조회 가능
+- 2m~90m: 최근 60일 이내
+- 60m/1h: 최근 730일 이내
+
+사용 예) python backfill.py ES=F --start 2026-10-01 --end 2026-10-15 --interval 1m --calendar CME
+"""
+import os
+import json
+import argparse
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from bar_cache import download_bars, to_utc_timestamp
+from bar_archive import BarArchive, DEFAULT_ARCHIVE_DIR
+from market_calendar import CME, KRX
+
+logger = logging.getLogger(__name__)
+
+# interval -> (요청 1회당 최대 구간, 현재 시각 기준 조회 가능한 과거 한도)
+INTERVAL_LIMITS = {
+    "1m": (timedelta(days=7), timedelta(days=30)),
+    "2m": (timedelta(days=60), timedelta(days=60)),
+    "5m": (timedelta(days=60), timedelta(days=60)),
+    "15m": (timedelta(days=60), timedelta(days=60)),
+    "30m": (timedelta(days=60), timedelta(days=60)),
+    "90m": (timedelta(days=60), timedelta(days=60)),
+    "60m": (timedelta(days=730), timedelta(days=730)),
+    "1h": (timedelta(days=730), timedelta(days=730)),
+}
+CALENDARS = {"CME": CME, "KRX": KRX}
+
+
+def merge_ranges(ranges):
+    """겹치거나 맞닿은 [start, end) 구간들을 하나로 합쳐 정렬된 목록으로 반환합니다."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(start, end, covered):
+    """[start, end)에서 이미 채운 구간(covered)을 뺀 나머지 구간들을 반환합니다."""
+    gaps = []
+    cursor = start
+    for c_start, c_end in merge_ranges(covered):
+        if c_end <= cursor or c_start >= end:
+            continue
+        if c_start > cursor:
+            gaps.append((cursor, c_start))
+        cursor = max(cursor, c_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def split_windows(start, end, interval="1m", covered=(), now=None):
+    """
+    [start, end)를 yfinance가 허용하는 최대 길이의 요청 구간들로 나눕니다.
+    - 조회 가능한 과거 한도보다 오래된 부분은 잘라내고 경고를 남깁니다.
+    - covered에 포함된 구간은 건너뜁니다.
+    """
+    max_span, lookback = INTERVAL_LIMITS[interval]
+    now = to_utc_timestamp(now or datetime.now(timezone.utc))
+    start, end = to_utc_timestamp(start), min(to_utc_timestamp(end), now)
+
+    # 경계에서 거절되지 않도록 1분 여유를 둡니다.
+    earliest = now - lookback + timedelta(minutes=1)
+    if start < earliest:
+        logger.warning(f"{interval} data is only available since {earliest}; clipping start {start}")
+        start = earliest
+
+    windows = []
+    for gap_start, gap_end in subtract_ranges(start, end, covered):
+        cursor = gap_start
+        while cursor < gap_end:
+            window_end = min(cursor + max_span, gap_end)
+            windows.append((cursor, window_end))
+            cursor = window_end
+    return windows
+
+
+class CoverageLedger:
+    """(ticker, interval)별로 이미 받아온 구간을 JSON 파일에 기록합니다. 재실행 시 이 구간은 다시 받지 않습니다."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._ranges = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for key, ranges in json.load(f).items():
+                    self._ranges[key] = [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in ranges]
+
+    @staticmethod
+    def _key(ticker, interval):
+        return f"{ticker}|{interval}"
+
+    def covered(self, ticker, interval):
+        with self._lock:
+            return list(self._ranges.get(self._key(ticker, interval), []))
+
+    def add(self, ticker, interval, start, end):
+        with self._lock:
+            key = self._key(ticker, interval)
+            self._ranges[key] = merge_ranges(self._ranges.get(key, []) + [(start, end)])
+
+    def save(self):
+        with self._lock:
+            data = {key: [(s.isoformat(), e.isoformat()) for s, e in ranges] for key, ranges in self._ranges.items()}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+
+def merge_bars(frames):
+    """여러 구간의 봉을 하나로 합치고 시각 기준으로 중복 제거/정렬합니다."""
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    merged = pd.concat(frames)
+    return merged[~merged.index.duplicated(keep='last')].sort_index()
+
+
+def backfill(ticker, start, end, interval="1m", ledger=None, archive=None, calendar=None, max_workers=4,
+             downloader=None, now=None):
+    """
+    [start, end) 구간의 봉을 허용된 최대 구간 단위로 나눠 동시에(max_workers개까지) 받아온 뒤
+    하나로 합쳐 반환합니다. ledger를 주면 이미 받은 구간은 건너뜁니다.
+
+    받은 구간은 archive(BarArchive)에 봉을 추가한 뒤에만 ledger에 기록하므로, 저장 전에 중단되면
+    다음 실행에서 다시 받습니다. 빈 구간은 calendar 기준으로 장이 닫혀 있던 구간만 기록합니다.
+    (calendar가 없으면 빈 구간은 기록하지 않음)
+    """
+    if ledger is not None and archive is None:
+        raise ValueError("ledger requires an archive: coverage is recorded only for archived bars")
+    downloader = downloader or download_bars
+    now = to_utc_timestamp(now or datetime.now(timezone.utc))
+    covered = ledger.covered(ticker, interval) if ledger is not None else []
+    windows = split_windows(start, end, interval, covered=covered, now=now)
+    if not windows:
+        logger.info(f"{ticker} ({interval}): requested range already covered. Nothing to fetch.")
+        return pd.DataFrame()
+
+    logger.info(f"{ticker} ({interval}): fetching {len(windows)} windows with up to {max_workers} workers")
+
+    def fetch(window):
+        w_start, w_end = window
+        data = downloader(ticker, interval, w_start.to_pydatetime(), w_end.to_pydatetime())
+        logger.info(f"  {w_start} ~ {w_end}: {len(data)} rows")
+        return data
+
+    results = []
+    fetched = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetch, window) for window in windows]
+        for window, future in zip(windows, futures):
+            try:
+                data = future.result()
+            except Exception as e:
+                # 실패한 구간은 기록하지 않으므로 다음 실행에서 다시 시도됩니다.
+                logger.error(f"  {window[0]} ~ {window[1]} failed: {e}")
+                continue
+            results.append(data)
+            if data is not None and not data.empty:
+                fetched.append(window)
+            elif calendar is not None and not calendar.sessions_between(window[0], window[1]):
+                fetched.append(window)
+            else:
+                logger.warning(f"  {window[0]} ~ {window[1]} returned no rows; leaving it uncovered")
+
+    bars = merge_bars(results)
+    if archive is not None and not bars.empty:
+        archive.append(ticker, bars, interval)
+    if ledger is not None and fetched:
+        for w_start, w_end in fetched:
+            # 아직 끝나지 않은 최근 1분은 다음 실행에서 다시 받도록 기록하지 않습니다.
+            ledger.add(ticker, interval, w_start, min(w_end, now - timedelta(minutes=1)))
+        ledger.save()
+    return bars
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="yfinance 분봉 백필")
+    parser.add_argument("ticker", nargs="?", default="ES=F")
+    parser.add_argument("--start", required=True, help="시작 시각 (UTC, 예: 2026-10-01)")
+    parser.add_argument("--end", default=None, help="종료 시각 (UTC, 기본: 현재)")
+    parser.add_argument("--interval", default="1m", choices=sorted(INTERVAL_LIMITS))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ledger", default="backfill_coverage.json")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE_DIR, help="결과를 추가할 Parquet 보관소 경로")
+    parser.add_argument("--calendar", default="CME", choices=sorted(CALENDARS),
+                        help="빈 구간이 휴장 때문인지 판단할 거래소 달력")
+    args = parser.parse_args()
+
+    ledger = CoverageLedger(args.ledger)
+    bars = backfill(args.ticker, args.start, args.end or datetime.now(timezone.utc), args.interval,
+                    ledger=ledger, archive=BarArchive(args.archive), calendar=CALENDARS[args.calendar],
+                    max_workers=args.workers)
+    print(f"Fetched and archived {len(bars)} new rows for {args.ticker} ({args.interval}) to {args.archive}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+class Backoff:
+    """
+    변화가 없는 결과가 patience번 이어지면 간격을 factor배씩 늘리고(최대 max_seconds),
+    변화가 있으면 바로 base_seconds로 되돌립니다.
+    """
+
+    def __init__(self, base_seconds, max_seconds, factor=2.0, patience=1):
+        self.base_seconds = base_seconds
+        self.max_seconds = max(max_seconds, base_seconds)
+        self.factor = factor
+        self.patience = patience
+        self.seconds = base_seconds
+        self.unchanged = 0
+
+    def record(self, changed):
+        """이번 결과의 변화 여부를 반영하고 다음 간격(초)을 반환합니다."""
+        if changed:
+            self.reset()
+        else:
+            self.unchanged += 1
+            if self.unchanged >= self.patience:
+                self.seconds = min(self.seconds * self.factor, self.max_seconds)
+        return self.seconds
+
+    def reset(self):
+        self.seconds = self.base_seconds
+        self.unchanged = 0
@@ -0,0 +1,133 @@
+import os
+import time
+import logging
+from datetime import timedelta
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bar_cache import to_utc_timestamp
+
+logger = logging.getLogger(__name__)
+
+# 기본 보관 위치 (MONITOR_ARCHIVE_DIR 환경변수로 변경 가능)
+DEFAULT_ARCHIVE_DIR = os.environ.get(
+    'MONITOR_ARCHIVE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bar_archive'))
+
+
+class BarArchive:
+    """
+    봉 데이터를 Parquet(열 기반) 파일로 영구 보관합니다.
+
+    디렉토리 구성: <root>/<symbol>/<interval>/<YYYY-MM-DD (UTC)>/part-<작성시각 ns>.parquet
+    - append: 날짜별 디렉토리에 새 part 파일만 추가합니다. (기존 파일은 수정하지 않음)
+    - append_new: 주기적으로 같은 구간을 다시 받아 쓰는 경우용. 마지막 보관 시각 이후의 봉만 추가하고,
+      part 파일이 많이 쌓인 날짜는 compact로 합칩니다.
+    - read: 날짜 디렉토리로 먼저 거르고(파티션 pruning), 파일 내부는 ts 필터로
+      row group 단위 predicate pushdown을 적용합니다. 같은 시각은 나중에 쓴 파일이 우선합니다.
+    """
+
+    def __init__(self, root=DEFAULT_ARCHIVE_DIR, row_group_size=240):
+        self.root = root
+        self.row_group_size = row_group_size
+
+    def _series_dir(self, symbol, interval):
+        return os.path.join(self.root, symbol.replace('/', '_'), interval)
+
+    def append(self, symbol, frame, interval="1m"):
+        """frame(DatetimeIndex)을 날짜별 part 파일로 추가하고, 작성한 파일 수를 반환합니다."""
+        if frame is None or frame.empty:
+            return 0
+        frame = frame.copy()
+        if isinstance(frame.columns, pd.MultiIndex):
+            frame.columns = frame.columns.get_level_values(0)
+        index = pd.DatetimeIndex(frame.index)
+        frame.index = (index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')).as_unit('ns')
+        frame.index.name = 'ts'
+        frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+
+        written = 0
+        stamp = time.time_ns()
+        for day, part in frame.groupby(frame.index.date):
+            day_dir = os.path.join(self._series_dir(symbol, interval), day.isoformat())
+            os.makedirs(day_dir, exist_ok=True)
+            table = pa.Table.from_pandas(part.reset_index(), preserve_index=False)
+            pq.write_table(table, os.path.join(day_dir, f"part-{stamp}.parquet"), row_group_size=self.row_group_size)
+            written += 1
+        logger.info(f"Archived {len(frame)} rows of {symbol} ({interval}) into {written} daily files")
+        return written
+
+    def append_new(self, symbol, frame, interval="1m", max_parts=24):
+        """frame 중 latest() 이후의 봉만 추가하고, 추가한 봉 개수를 반환합니다. (part 파일이 max_parts개를 넘은 날짜는 합침)"""
+        if frame is None or frame.empty:
+            return 0
+        latest = self.latest(symbol, interval)
+        if latest is not None:
+            index = pd.DatetimeIndex(frame.index)
+            index = index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')
+            frame = frame[index > latest]
+        if frame.empty:
+            return 0
+        self.append(symbol, frame, interval)
+        for day in sorted(set(pd.DatetimeIndex(frame.index).tz_convert('UTC').date)):
+            if len(self._day_files(symbol, interval, day)) > max_parts:
+                self.compact(symbol, day, interval)
+        return len(frame)
+
+    def latest(self, symbol, interval="1m"):
+        """보관된 마지막 봉의 시각 (UTC Timestamp, 없으면 None). 마지막 날짜의 ts 컬럼만 읽습니다."""
+        for day in reversed(self.days(symbol, interval)):
+            files = self._day_files(symbol, interval, day)
+            if files:
+                return max(pd.Timestamp(pq.read_table(f, columns=['ts']).column('ts').to_pandas().max()) for f in files)
+        return None
+
+    def _day_files(self, symbol, interval, day):
+        day_dir = os.path.join(self._series_dir(symbol, interval), day.isoformat())
+        return [os.path.join(day_dir, name) for name in sorted(os.listdir(day_dir)) if name.endswith('.parquet')]
+
+    def days(self, symbol, interval="1m"):
+        """보관 중인 날짜 목록(정렬)을 반환합니다."""
+        series_dir = self._series_dir(symbol, interval)
+        if not os.path.isdir(series_dir):
+            return []
+        return sorted(pd.Timestamp(name).date() for name in os.listdir(series_dir))
+
+    def read(self, symbol, start=None, end=None, interval="1m", columns=None):
+        """[start, end) 구간의 봉을 UTC DatetimeIndex DataFrame으로 읽어옵니다."""
+        start = to_utc_timestamp(start) if start is not None else None
+        end = to_utc_timestamp(end) if end is not None else None
+
+        files = []
+        for day in self.days(symbol, interval):
+            # 파티션 pruning: 구간과 겹치지 않는 날짜 디렉토리는 열지 않습니다.
+            day_start = pd.Timestamp(day, tz='UTC')
+            if (start is not None and day_start + timedelta(days=1) <= start) or (end is not None and day_start >= end):
+                continue
+            files.extend(self._day_files(symbol, interval, day))
+        if not files:
+            return pd.DataFrame()
+
+        filters = []
+        if start is not None:
+            filters.append(('ts', '>=', start))
+        if end is not None:
+            filters.append(('ts', '<', end))
+        read_columns = ['ts'] + list(columns) if columns is not None else None
+        tables = [pq.read_table(f, columns=read_columns, filters=filters or None) for f in files]
+        frame = pa.concat_tables(tables, promote_options='default').to_pandas().set_index('ts')
+        frame.index.name = None
+        return frame[~frame.index.duplicated(keep='last')].sort_index(kind='stable')
+
+    def compact(self, symbol, day, interval="1m"):
+        """하루치 part 파일들을 중복 제거된 파일 하나로 합칩니다. (읽기 속도 향상용, 선택)"""
+        day_dir = os.path.join(self._series_dir(symbol, interval), pd.Timestamp(day).date().isoformat())
+        old_files = [name for name in sorted(os.listdir(day_dir)) if name.endswith('.parquet')]
+        if len(old_files) <= 1:
+            return
+        frame = self.read(symbol, pd.Timestamp(day, tz='UTC'), pd.Timestamp(day, tz='UTC') + timedelta(days=1), interval)
+        self.append(symbol, frame, interval)
+        for name in old_files:
+            os.remove(os.path.join(day_dir, name))
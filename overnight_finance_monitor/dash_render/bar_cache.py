@@ -0,0 +1,183 @@
+import threading
+import logging
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from asof_index import AsOfIndex
+from backoff import Backoff
+
+logger = logging.getLogger(__name__)
+
+# yfinance 1분봉은 요청 1회당 최대 7~8일 범위까지만 허용됩니다.
+MAX_SPAN = timedelta(days=7)
+
+
+def to_utc_timestamp(value):
+    """datetime/문자열을 UTC 기준 tz-aware Timestamp로 변환합니다. (naive는 UTC로 간주)"""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        return ts.tz_localize('UTC')
+    return ts.tz_convert('UTC')
+
+
+def download_bars(ticker, interval, start, end=None):
+    """
+    yf.download 결과를 캐시에 바로 넣을 수 있는 형태로 정리합니다.
+    - MultiIndex 컬럼을 단일 레벨로 평탄화
+    - 인덱스를 UTC tz-aware로 통일
+    """
+    data = yf.download(ticker, start=start, end=end, interval=interval, progress=False)
+    if data is None or data.empty:
+        return pd.DataFrame()
+
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+
+    if data.index.tz is None:
+        data.index = data.index.tz_localize('UTC')
+    else:
+        data.index = data.index.tz_convert('UTC')
+    return data
+
+
+class BarCache:
+    """
+    (ticker, interval, 분) 단위로 봉 데이터를 메모리에 보관하는 캐시입니다.
+
+    - 처음 조회 시 필요한 구간을 한 번에 대량으로 내려받고,
+    - 이후에는 마지막 조회 이후의 '꼬리' 구간만 refresh_seconds 간격으로 보충합니다.
+    따라서 매 분 호출되는 시점 조회는 대부분 네트워크 없이 메모리에서 처리됩니다.
+    - 꼬리 조회에서 마지막으로 본 봉보다 새 봉이 없으면(주말/정지) 보충 간격을 max_refresh_seconds까지
+      두 배씩 늘리고, 새 봉이 오면 다시 refresh_seconds로 돌아갑니다.
+
+    store(shared_store의 LocalStore/SQLiteStore)를 주면 받아온 봉과 캐시 구간을 함께 저장하고,
+    처음 보는 key는 store에 저장된 내용부터 불러와 이어서 보충합니다.
+    """
+
+    def __init__(self, downloader=None, refresh_seconds=60, retention_days=8, pad=timedelta(days=3), store=None,
+                 max_refresh_seconds=900):
+        self._downloader = downloader or download_bars
+        self._store = store
+        self.refresh_seconds = refresh_seconds
+        self.max_refresh_seconds = max_refresh_seconds
+        self.retention = timedelta(days=retention_days)
+        self.pad = pad
+        self._frames = {}        # (ticker, interval) -> 분 단위로 정렬된 DataFrame (UTC)
+        self._indexes = {}       # (ticker, interval) -> _frames 인덱스에 대한 AsOfIndex
+        self._covered_from = {}  # (ticker, interval) -> 캐시가 보장하는 구간의 시작
+        self._fetched_at = {}    # (ticker, interval) -> 마지막으로 꼬리를 받아온 시각
+        self._refresh = {}       # (ticker, interval) -> 꼬리 보충 간격 (Backoff)
+        self._lock = threading.Lock()
+
+    def get_frame(self, ticker, target_time, interval="1m", now=None):
+        """target_time 조회에 필요한 구간이 캐시에 있도록 보장한 뒤 전체 DataFrame을 반환합니다."""
+        with self._lock:
+            key = self._ensure(ticker, interval, to_utc_timestamp(target_time), now)
+            return self._frames[key]
+
+    def lookup(self, ticker, target_time, interval="1m", now=None):
+        """target_time 이전(포함) 마지막 봉을 (시각, 행) 튜플로 반환합니다. 없으면 None."""
+        with self._lock:
+            key = self._ensure(ticker, interval, to_utc_timestamp(target_time), now)
+            frame = self._frames[key]
+            pos = self._indexes[key].position(target_time)
+        if pos < 0:
+            return None
+        return frame.index[pos], frame.iloc[pos]
+
+    def lookup_many(self, ticker, target_times, interval="1m", now=None):
+        """
+        여러 시점을 한 번에 as-of 조회합니다. (예: T-48h 시점 목록)
+        가장 이른 시점 기준으로 캐시를 보장하고, (찾은 행들의 DataFrame, 시점별 발견 여부 배열)을 반환합니다.
+        """
+        target_times = list(target_times)
+        if not target_times:
+            return pd.DataFrame(), np.zeros(0, dtype=bool)
+        earliest = min(to_utc_timestamp(t) for t in target_times)
+        with self._lock:
+            key = self._ensure(ticker, interval, earliest, now)
+            frame = self._frames[key]
+            positions = self._indexes[key].positions(target_times)
+        found = positions >= 0
+        return frame.iloc[positions[found]], found
+
+    def _ensure(self, ticker, interval, target, now):
+        """(lock 보유 상태에서 호출) target 조회에 필요한 구간을 채우고 key를 반환합니다."""
+        now = to_utc_timestamp(now or datetime.now(timezone.utc))
+        key = (ticker, interval)
+
+        if key not in self._frames:
+            stored = self._store.load_bars(ticker, interval) if self._store is not None else None
+            if stored is not None:
+                frame, covered_from, fetched_at = stored
+                logger.info(f"BarCache loaded {len(frame)} stored rows for {ticker} ({interval})")
+            else:
+                frame, covered_from, fetched_at = pd.DataFrame(), now, now
+            self._frames[key] = frame
+            self._indexes[key] = AsOfIndex(frame.index)
+            self._covered_from[key] = covered_from
+            self._fetched_at[key] = fetched_at
+            self._refresh[key] = Backoff(self.refresh_seconds, self.max_refresh_seconds)
+
+        # 1. 앞쪽(과거) 구간이 비어 있으면 MAX_SPAN 단위로 나눠 채웁니다.
+        if target - self.pad < self._covered_from[key]:
+            while target - self.pad < self._covered_from[key]:
+                chunk_end = self._covered_from[key]
+                chunk_start = max(target - self.pad, chunk_end - MAX_SPAN)
+                new_data = self._merge(key, self._fetch(ticker, interval, chunk_start, None if chunk_end >= now else chunk_end))
+                self._covered_from[key] = chunk_start
+                self._save(key, new_data)
+
+        # 2. 마지막 조회 이후 구간이 필요하고 갱신 주기가 지났으면 꼬리만 보충합니다.
+        elif target > self._fetched_at[key] and (now - self._fetched_at[key]).total_seconds() >= self._refresh[key].seconds:
+            frame = self._frames[key]
+            last_seen = frame.index[-1] if not frame.empty else None
+            tail_start = last_seen if last_seen is not None else self._fetched_at[key]
+            new_data = self._merge(key, self._fetch(ticker, interval, tail_start, None))
+            self._fetched_at[key] = now
+            self._save(key, new_data)
+            frame = self._frames[key]
+            self._refresh[key].record(not frame.empty and (last_seen is None or frame.index[-1] > last_seen))
+
+        self._trim(key, min(now - self.retention, target - self.pad))
+        return key
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._indexes.clear()
+            self._covered_from.clear()
+            self._fetched_at.clear()
+            self._refresh.clear()
+
+    def _fetch(self, ticker, interval, start, end):
+        logger.info(f"BarCache fetching {ticker} ({interval}) from {start} to {end or 'now'}")
+        data = self._downloader(ticker, interval, start.to_pydatetime(), end.to_pydatetime() if end is not None else None)
+        logger.info(f"BarCache received {len(data)} rows.")
+        return data
+
+    def _merge(self, key, new_data):
+        """새 봉을 분 단위로 맞춰 병합하고, 정리된 새 봉을 반환합니다."""
+        if new_data is None or new_data.empty:
+            return None
+        new_data = new_data.copy()
+        new_data.index = new_data.index.floor('min')
+        frame = pd.concat([self._frames[key], new_data]) if not self._frames[key].empty else new_data
+        frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+        self._frames[key] = frame
+        self._indexes[key] = AsOfIndex(frame.index)
+        return new_data
+
+    def _save(self, key, new_data):
+        if self._store is not None:
+            self._store.save_bars(key[0], key[1], new_data, self._covered_from[key], self._fetched_at[key])
+
+    def _trim(self, key, cutoff):
+        if self._covered_from[key] < cutoff:
+            frame = self._frames[key]
+            self._frames[key] = frame[frame.index >= cutoff]
+            self._indexes[key] = AsOfIndex(self._frames[key].index)
+            self._covered_from[key] = cutoff
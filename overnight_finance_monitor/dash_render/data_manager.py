@@ -1,48 +1,39 @@
-import yfinance as yf
-import pandas as pd
-from datetime import datetime, timedelta
 import logging
+from bar_cache import BarCache
+from shared_store import create_store
+from fixtures import fixture_downloader
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 워커 간 공유 저장소 (MONITOR_STORE_PATH가 설정되면 SQLite, 아니면 프로세스 로컬)
+store = create_store()
+
+# yfinance 호출 방식 (MONITOR_FIXTURE_MODE=record/replay면 fixture 녹화/재생)
+downloader = fixture_downloader()
+
+# 프로세스 내 공유 1분봉 캐시 (매 분 호출되는 콜백이 전체 일자를 다시 받지 않도록 함)
+bar_cache = BarCache(downloader=downloader, store=store)
+
 def get_sp500_futures_at_time(target_time):
     """
     특정 시점(target_time)의 S&P 500 선물 데이터를 가져옵니다.
-    1분 단위 데이터를 가져오기 위해 target_time 전후로 짧은 범위를 조회합니다.
+    1분봉은 BarCache에 누적되어 있으므로, 캐시가 target_time을 포함하면 네트워크 호출 없이
+    메모리에서 바로 조회하고 부족한 구간(최초 적재/최근 꼬리)만 yfinance에서 보충합니다.
     """
     ticker = "ES=F"
-    # target_time이 포함된 날의 데이터를 가져오기 위해 start/end 설정
-    start_date = (target_time - timedelta(minutes=10)).strftime('%Y-%m-%d')
-    end_date = (target_time + timedelta(days=1)).strftime('%Y-%m-%d')
-    
-    logger.info(f"Fetching data for {ticker} around {target_time} (Start: {start_date}, End: {end_date})")
+    logger.info(f"Looking up {ticker} around {target_time} from bar cache")
     
     try:
-        data = yf.download(ticker, start=start_date, end=end_date, interval="1m", progress=False)
-        
-        if data.empty:
-            logger.warning(f"No data returned for {ticker} in the range {start_date} to {end_date}")
-            return None
-
-        logger.info(f"Downloaded {len(data)} rows of data.")
-
-        if isinstance(data.columns, pd.MultiIndex):
-            data.columns = data.columns.get_level_values(0)
-            
-        # target_time과 가장 가까운(이전) 데이터 1개를 찾음
-        if data.index.tz is not None and target_time.tzinfo is None:
-            import pytz
-            target_time = pytz.utc.localize(target_time)
-        
-        # target_time 직전의 데이터 필터링
-        point = data[data.index <= target_time].tail(1)
+        # target_time 이전(포함) 마지막 봉을 as-of 인덱스(searchsorted)로 찾음 (naive 시각은 UTC로 간주)
+        point = bar_cache.lookup(ticker, target_time, interval="1m")
         
-        if not point.empty:
+        if point is not None:
+            ts, row = point
             res = {
-                "Time": point.index[0].strftime('%Y-%m-%d %H:%M'),
-                "Price": float(point['Close'].iloc[0])
+                "Time": ts.strftime('%Y-%m-%d %H:%M'),
+                "Price": float(row['Close'])
             }
             logger.info(f"Successfully found data point: {res}")
             return res
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+# 가격은 0.01 단위 정수로 전송 (ES=F 호가 단위 0.25도 정확히 표현)
+PRICE_SCALE = 100
+TIME_FORMAT = '%Y-%m-%d %H:%M'
+
+
+def time_to_epoch(time_text):
+    """'YYYY-MM-DD HH:MM' 표시용 시각을 epoch 초로 변환합니다. (문자열 그대로의 벽시계 시각을 UTC로 취급)"""
+    return int(datetime.strptime(time_text, TIME_FORMAT).replace(tzinfo=timezone.utc).timestamp())
+
+
+def epoch_to_time(seconds):
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime(TIME_FORMAT)
+
+
+def _deltas(values):
+    return [values[0]] + [b - a for a, b in zip(values, values[1:])] if values else []
+
+
+def _undeltas(deltas):
+    values = []
+    for delta in deltas:
+        values.append(values[-1] + delta if values else delta)
+    return values
+
+
+def encode_points(rows, seq, reset=False, scale=PRICE_SCALE):
+    """
+    시간순(오래된 것 먼저) {'Time', 'Price'} 목록을 브라우저로 보낼 작은 dict로 변환합니다.
+    - t: epoch 초, p: scale배 한 정수 가격. 둘 다 첫 값만 그대로 두고 나머지는 직전 값과의 차이로 보냅니다.
+      (1분 간격이면 t는 [첫 시각, 60, 60, ...]처럼 짧은 숫자가 됩니다.)
+    - reset: True면 클라이언트가 기존 차트를 버리고 이 점들로 다시 그립니다. (전체 스냅샷)
+    """
+    times = [time_to_epoch(row['Time']) for row in rows]
+    prices = [int(round(row['Price'] * scale)) for row in rows]
+    payload = {'seq': seq, 't': _deltas(times), 'p': _deltas(prices)}
+    if reset:
+        payload['reset'] = True
+    if scale != PRICE_SCALE:
+        payload['s'] = scale
+    return payload
+
+
+def decode_points(payload):
+    """encode_points의 역변환입니다. (브라우저 clientside 콜백과 같은 규칙, 테스트/디버깅용)"""
+    scale = payload.get('s', PRICE_SCALE)
+    times = _undeltas(payload.get('t', []))
+    prices = _undeltas(payload.get('p', []))
+    return [{'Time': epoch_to_time(t), 'Price': p / scale} for t, p in zip(times, prices)]
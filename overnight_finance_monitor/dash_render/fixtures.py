@@ -0,0 +1,111 @@
+"""
+yfinance 응답을 압축 파일(fixture)로 녹화하고 다시 재생하는 도구입니다.
+
+- MONITOR_FIXTURE_MODE=record : 실제 yfinance를 호출하고 받은 봉을 fixture 파일에 누적 저장
+- MONITOR_FIXTURE_MODE=replay : 네트워크 없이 fixture 파일에서 요청 구간만 잘라 반환
+- 설정하지 않으면 기존과 같이 yfinance를 직접 호출
+
+fixture 파일은 (ticker, interval)마다 하나씩 MONITOR_FIXTURE_DIR(기본: tests/fixtures)에
+<ticker>_<interval>.pkl.gz (gzip pickle)로 저장됩니다. 재생 시각이 날짜에 따라 달라지지 않도록
+녹화 시각(recorded_at)을 함께 저장하고, fixture_clock()으로 그 시각부터 흐르는 시계를 제공합니다.
+"""
+import os
+import gzip
+import pickle
+import threading
+import logging
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from bar_cache import download_bars, to_utc_timestamp
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_MODE = os.environ.get('MONITOR_FIXTURE_MODE', '')
+FIXTURE_DIR = os.environ.get(
+    'MONITOR_FIXTURE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests', 'fixtures'))
+
+
+class FixtureDownloader:
+    """download_bars와 같은 시그니처로 호출되는 녹화/재생 downloader입니다."""
+
+    def __init__(self, mode, directory=FIXTURE_DIR, downloader=None):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.mode = mode
+        self.directory = directory
+        self._downloader = downloader or download_bars
+        self._fixtures = {}  # (ticker, interval) -> {'frame': DataFrame, 'recorded_at': Timestamp}
+        self._lock = threading.Lock()
+
+    def path(self, ticker, interval):
+        name = ''.join(c if c.isalnum() else '_' for c in ticker)
+        return os.path.join(self.directory, f"{name}_{interval}.pkl.gz")
+
+    def load(self, ticker, interval):
+        """fixture를 읽어 {'frame', 'recorded_at'}로 반환합니다. 파일이 없으면 None."""
+        key = (ticker, interval)
+        with self._lock:
+            if key not in self._fixtures:
+                path = self.path(ticker, interval)
+                if not os.path.exists(path):
+                    return None
+                with gzip.open(path, 'rb') as f:
+                    self._fixtures[key] = pickle.load(f)
+            return self._fixtures[key]
+
+    def __call__(self, ticker, interval, start, end=None):
+        if self.mode == 'replay':
+            return self._replay(ticker, interval, start, end)
+        return self._record(ticker, interval, start, end)
+
+    def _replay(self, ticker, interval, start, end):
+        fixture = self.load(ticker, interval)
+        if fixture is None:
+            raise FileNotFoundError(f"No fixture for {ticker} ({interval}): {self.path(ticker, interval)}")
+        frame = fixture['frame']
+        mask = frame.index >= to_utc_timestamp(start)
+        if end is not None:
+            mask &= frame.index < to_utc_timestamp(end)
+        return frame[mask].copy()
+
+    def _record(self, ticker, interval, start, end):
+        data = self._downloader(ticker, interval, start, end)
+        fixture = self.load(ticker, interval) or {'frame': pd.DataFrame(), 'recorded_at': None}
+        with self._lock:
+            frames = [f for f in (fixture['frame'], data) if f is not None and not f.empty]
+            if frames:
+                merged = pd.concat(frames)
+                fixture['frame'] = merged[~merged.index.duplicated(keep='last')].sort_index()
+            fixture['recorded_at'] = fixture['recorded_at'] or pd.Timestamp.now(tz='UTC')
+            self._fixtures[(ticker, interval)] = fixture
+            os.makedirs(self.directory, exist_ok=True)
+            with gzip.open(self.path(ticker, interval), 'wb') as f:
+                pickle.dump(fixture, f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info(f"Recorded {len(data)} rows of {ticker} ({interval}) into {self.path(ticker, interval)}")
+        return data
+
+
+def fixture_downloader(mode=FIXTURE_MODE, directory=FIXTURE_DIR):
+    """모드에 맞는 downloader를 반환합니다. (모드가 없으면 download_bars 그대로)"""
+    if not mode:
+        return download_bars
+    logger.info(f"Using yfinance fixtures ({mode}) from {directory}")
+    return FixtureDownloader(mode, directory)
+
+
+def fixture_clock(downloader, ticker, interval="1m"):
+    """
+    재생 모드에서 fixture 녹화 시각부터 실제 경과 시간만큼 흐르는 시계를 반환합니다.
+    (녹화한 날과 같은 T-48h 시점이 재생되도록 함) 재생 모드가 아니면 None.
+    """
+    if not isinstance(downloader, FixtureDownloader) or downloader.mode != 'replay':
+        return None
+    fixture = downloader.load(ticker, interval)
+    if fixture is None or fixture['recorded_at'] is None:
+        return None
+    recorded_at = fixture['recorded_at'].to_pydatetime()
+    started = datetime.now(timezone.utc)
+    return lambda: recorded_at + (datetime.now(timezone.utc) - started)
@@ -0,0 +1,186 @@
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+
+# DataTable(filter_action='custom')의 filter_query 조건 하나: {컬럼} 연산자 값
+# 연산자는 컬럼 바로 뒤에서만 찾으므로 컬럼 이름이나 값에 연산자 글자가 있어도 잘못 나뉘지 않습니다.
+FILTER_CLAUSE = re.compile(
+    r'^\{(?P<col>[^}]+)\}\s*'
+    r'(?P<op>s?[<>]=?|s?[!=]?=|(?:eq|ne|lt|le|gt|ge|contains|datestartswith)(?=\s))\s*(?P<val>.+)$')
+
+# filter_query 연산자 표기 -> 내부 연산자 ('s' 접두사는 떼고 찾음)
+FILTER_OPERATORS = {'>=': '>=', 'ge': '>=', '<=': '<=', 'le': '<=', '<': '<', 'lt': '<', '>': '>', 'gt': '>',
+                    '!=': '!=', 'ne': '!=', '=': '=', '==': '=', 'eq': '=',
+                    'contains': 'contains', 'datestartswith': 'datestartswith'}
+
+# 정렬 인덱스에서 bisect로 구간을 좁힐 수 있는 연산자
+RANGE_OPERATORS = ('>=', '>', '<=', '<', '=', 'datestartswith')
+
+
+class HistoryBuffer:
+    """
+    서버 측에서 모든 세션이 공유하는 고정 용량 링 버퍼입니다.
+
+    - append: deque(maxlen) 기반 O(1) 추가, 용량 초과 시 가장 오래된 항목 자동 삭제
+    - 중복 체크: 'Time' 값 집합(set)으로 O(1)
+    - seq: 마지막으로 추가된 항목의 번호. 기본은 누적 개수이고, append(point, seq)로 공유 저장소의
+      history.id를 넘기면 모든 워커가 같은 번호를 씁니다. (증가하기만 하면 중간에 빠진 번호가 있어도 됨)
+      클라이언트는 자신이 받은 seq만 들고 있다가 since(seq)로 그 이후의 변경분(델타)만 받아갑니다.
+    - query: Time/Price 정렬 인덱스(bisect)로 테이블 한 페이지만 잘라 반환합니다. (서버 측 페이징/정렬/필터)
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self._rows = deque(maxlen=capacity)
+        self._seqs = deque(maxlen=capacity)
+        self._times = set()
+        # 정렬 인덱스: (키, 추가 순번, point) 오름차순 목록. 순번이 유일하므로 point끼리 비교할 일은 없습니다.
+        self._by_time = []
+        self._by_price = []
+        self._seq = 0
+        self._evicted_seq = 0  # 버퍼에서 밀려난 마지막 항목의 seq
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def __contains__(self, time):
+        with self._lock:
+            return time in self._times
+
+    def append(self, point, seq=None):
+        """
+        새 데이터 포인트를 추가합니다. 이미 같은 Time이 있으면 False를 반환합니다.
+        seq를 주면 그 번호로 추가합니다. (현재 seq 이하면 이미 반영된 것으로 보고 False)
+        """
+        with self._lock:
+            seq = self._seq + 1 if seq is None else seq
+            if point['Time'] in self._times or seq <= self._seq:
+                return False
+            if len(self._rows) == self.capacity:
+                oldest, oldest_no = self._rows[0], self._seqs[0]
+                self._times.discard(oldest['Time'])
+                self._remove(self._by_time, (oldest['Time'], oldest_no))
+                self._remove(self._by_price, (oldest['Price'], oldest_no))
+                self._evicted_seq = oldest_no
+            self._rows.append(point)
+            self._seqs.append(seq)
+            self._times.add(point['Time'])
+            self._seq = seq
+            insort(self._by_time, (point['Time'], self._seq, point))
+            insort(self._by_price, (point['Price'], self._seq, point))
+            return True
+
+    @staticmethod
+    def _remove(index, key):
+        del index[bisect_left(index, key)]
+
+    def latest(self):
+        with self._lock:
+            return self._rows[-1] if self._rows else None
+
+    def snapshot(self):
+        """(seq, 최신순 전체 목록)을 반환합니다."""
+        with self._lock:
+            return self._seq, list(reversed(self._rows))
+
+    def since(self, seq):
+        """
+        seq 이후 추가된 항목을 최신순으로 반환합니다.
+        요청한 seq가 너무 오래되어 버퍼에서 이미 밀려났다면(또는 현재 seq보다 크면) None을 반환합니다. (전체 스냅샷 필요)
+        """
+        return self.delta(seq)[1]
+
+    def delta(self, seq):
+        """(현재 seq, since(seq)) 를 한 번에 반환합니다. (두 값 사이에 다른 스레드의 추가가 끼어들지 않음)"""
+        with self._lock:
+            if seq > self._seq or seq < self._evicted_seq:
+                return self._seq, None
+            rows = []
+            for i in range(len(self._rows) - 1, -1, -1):
+                if self._seqs[i] <= seq:
+                    break
+                rows.append(self._rows[i])
+            return self._seq, rows
+
+    def query(self, page=0, page_size=15, sort_by='Time', descending=True, filters=()):
+        """
+        조건에 맞는 항목 중 한 페이지만 (전체 개수, 페이지 목록)으로 반환합니다.
+        - sort_by: 'Time' 또는 'Price' (해당 정렬 인덱스를 그대로 사용)
+        - filters: (컬럼, 연산자, 값) 목록. 정렬 컬럼의 범위 조건은 bisect로 구간을 먼저 좁히고,
+          나머지 조건만 구간 안에서 확인합니다.
+        """
+        with self._lock:
+            index = self._by_price if sort_by == 'Price' else self._by_time
+            lo, hi = 0, len(index)
+            others = []
+            for column, op, value in filters:
+                if column != sort_by or op not in RANGE_OPERATORS or (op == 'datestartswith' and not isinstance(value, str)):
+                    others.append((column, op, value))
+                    continue
+                if op in ('>=', '=', 'datestartswith'):
+                    lo = max(lo, bisect_left(index, (value,)))
+                if op == '>':
+                    lo = max(lo, bisect_right(index, (value, float('inf'))))
+                if op in ('<=', '='):
+                    hi = min(hi, bisect_right(index, (value, float('inf'))))
+                if op == '<':
+                    hi = min(hi, bisect_left(index, (value,)))
+                if op == 'datestartswith':
+                    hi = min(hi, bisect_left(index, (value + '\uffff',)))
+
+            entries = index[lo:hi] if lo < hi else []
+            if descending:
+                entries.reverse()
+            if others:
+                entries = [e for e in entries if all(_matches(e[2], *f) for f in others)]
+            start = page * page_size
+            return len(entries), [e[2] for e in entries[start:start + page_size]]
+
+
+def _matches(point, column, op, value):
+    field = point.get(column)
+    if op == 'contains':
+        return str(value) in str(field)
+    if op == 'datestartswith':
+        return str(field).startswith(str(value))
+    if op == '!=':
+        return field != value
+    if op == '>=':
+        return field >= value
+    if op == '<=':
+        return field <= value
+    if op == '>':
+        return field > value
+    if op == '<':
+        return field < value
+    return field == value
+
+
+def parse_filter_query(filter_query, numeric_columns=('Price',)):
+    """
+    DataTable filter_query 문자열(예: "{Price} ge 5000 && {Time} contains 10-16")을
+    query()에 넘길 (컬럼, 연산자, 값) 목록으로 변환합니다. 해석할 수 없는 조건은 무시합니다.
+    """
+    filters = []
+    for part in (filter_query or '').split(' && '):
+        match = FILTER_CLAUSE.match(part.strip())
+        if match is None:
+            continue
+        column = match.group('col')
+        op = FILTER_OPERATORS[match.group('op').lstrip('s')]
+        value = match.group('val').strip()
+        if len(value) > 1 and value[0] == value[-1] and value[0] in ("'", '"', '`'):
+            value = value[1:-1].replace('\\' + value[0], value[0])
+        if column in numeric_columns and op not in ('contains', 'datestartswith'):
+            try:
+                value = float(value)
+            except ValueError:
+                continue
+        filters.append((column, op, value))
+    return filters
@@ -0,0 +1,28 @@
+import plotly.graph_objects as go
+
+# 차트에 유지할 최대 점 개수 (서버 히스토리 용량과 같게 사용)
+DEFAULT_MAX_POINTS = 1000
+
+
+def make_live_figure(rows=(), max_points=DEFAULT_MAX_POINTS):
+    """
+    WebGL(Scattergl) 라인 하나로 된 가격 차트 figure를 만듭니다.
+    rows는 시간순(오래된 것 먼저) {'Time', 'Price'} 목록이며, 최근 max_points개만 사용합니다.
+    """
+    rows = list(rows)[-max_points:]
+    figure = go.Figure(go.Scattergl(
+        x=[row['Time'] for row in rows],
+        y=[row['Price'] for row in rows],
+        mode='lines',
+        line={'color': '#2c3e50', 'width': 1.5},
+        name='ES=F (T-48h)',
+    ))
+    figure.update_layout(
+        margin={'l': 40, 'r': 10, 't': 10, 'b': 30},
+        height=320,
+        xaxis={'type': 'date'},
+        yaxis={'tickformat': ',.2f'},
+        uirevision='live-price',  # 데이터가 추가돼도 사용자의 확대/이동 상태 유지
+    )
+    return figure
+
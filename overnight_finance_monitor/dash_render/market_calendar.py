@@ -0,0 +1,176 @@
+"""
+KRX/CME 거래 세션 달력과 장 상태 기반 폴링 일정입니다.
+
+휴장일 표(KRX_HOLIDAYS, CME_HOLIDAYS)는 수작업으로 관리하므로 매년 거래소 공지에 맞춰 다음 해 휴장일을 추가해야 합니다.
+표의 마지막 해 이후 날짜는 휴장일을 모르는 채로 평일을 거래일로 보며, 그런 조회가 있으면 해마다 한 번 경고를 남깁니다.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from bar_cache import to_utc_timestamp
+from market_hours import KRX_FUTURES_OPEN, KRX_FUTURES_CLOSE
+
+logger = logging.getLogger(__name__)
+
+# 전일 휴장일 (매년 거래소 공지에 맞춰 추가)
+# KRX: 설/추석 연휴, 대체공휴일, 선거일, 연말 휴장일 포함
+KRX_HOLIDAYS = frozenset(pd.to_datetime([
+    "2025-01-01", "2025-01-27", "2025-01-28", "2025-01-29", "2025-01-30", "2025-03-03",
+    "2025-05-01", "2025-05-05", "2025-05-06", "2025-06-03", "2025-06-06", "2025-08-15",
+    "2025-10-03", "2025-10-06", "2025-10-07", "2025-10-08", "2025-10-09", "2025-12-25", "2025-12-31",
+    "2026-01-01", "2026-02-16", "2026-02-17", "2026-02-18", "2026-03-02", "2026-05-01",
+    "2026-05-05", "2026-05-25", "2026-06-03", "2026-08-17", "2026-09-24", "2026-09-25",
+    "2026-10-05", "2026-10-09", "2026-12-25", "2026-12-31",
+]).date)
+# CME Globex 주가지수 선물: 종일 휴장인 날만 (조기 마감일은 장이 열린 것으로 취급)
+CME_HOLIDAYS = frozenset(pd.to_datetime([
+    "2025-01-01", "2025-04-18", "2025-12-25",
+    "2026-01-01", "2026-04-03", "2026-12-25",
+]).date)
+
+# 요일(월=0)별 현지 시각 세션: (시작, 끝, 거래일 오프셋). 끝 "24:00"은 다음 날 0시입니다.
+# 거래일 오프셋: 이 구간이 속한 거래일 (CME 저녁 세션은 다음 거래일 소속 → 그 날이 휴장이면 함께 닫힘)
+# KRX는 감시 대상인 코스피200 선물 정규장 기준입니다. (현물 09:00~15:30이 아님)
+KRX_SESSIONS = {day: [(KRX_FUTURES_OPEN, KRX_FUTURES_CLOSE, 0)] for day in range(5)}
+CME_SESSIONS = {
+    0: [("00:00", "16:00", 0), ("17:00", "24:00", 1)],
+    1: [("00:00", "16:00", 0), ("17:00", "24:00", 1)],
+    2: [("00:00", "16:00", 0), ("17:00", "24:00", 1)],
+    3: [("00:00", "16:00", 0), ("17:00", "24:00", 1)],
+    4: [("00:00", "16:00", 0)],
+    6: [("17:00", "24:00", 1)],
+}
+
+
+class MarketCalendar:
+    """
+    거래소 세션 달력입니다. (요일별 세션 + 휴장일, 현지 시간대 기준 → DST 자동 반영)
+
+    - is_open(ts): ts(UTC 또는 tz-aware)에 장이 열려 있는지
+    - next_open(ts) / next_close(ts): ts 이후 첫 개장/마감 시각 (UTC Timestamp)
+    - 연속된 세션(CME 일요일 저녁 → 월요일)은 하나로 합쳐 자정에 가짜 경계가 생기지 않습니다.
+    - holidays에 있는 마지막 해(holidays_until) 이후의 날짜를 물으면 해마다 한 번 경고를 남깁니다.
+    """
+
+    def __init__(self, name, tz, sessions, holidays=()):
+        self.name = name
+        self.tz = tz
+        self.sessions = sessions
+        self.holidays = frozenset(holidays)
+        self.holidays_until = max((day.year for day in self.holidays), default=None)
+        self._warned_years = set()
+
+    def __repr__(self):
+        return f"MarketCalendar({self.name!r})"
+
+    def is_trading_day(self, day):
+        """현지 날짜 day가 거래일(평일이고 휴장일이 아님)인지. 휴장일 표가 끝난 해면 경고를 남깁니다."""
+        if self.holidays_until is not None and day.year > self.holidays_until and day.year not in self._warned_years:
+            self._warned_years.add(day.year)
+            logger.warning(f"{self.name} holiday table ends in {self.holidays_until}; "
+                           f"treating every weekday of {day.year} as a trading day")
+        return day.weekday() < 5 and day not in self.holidays
+
+    def _day_sessions(self, day):
+        """현지 날짜 day의 세션 [(open, close)] (UTC, 휴장 제외)"""
+        result = []
+        for start, end, offset in self.sessions.get(day.weekday(), ()):
+            if not self.is_trading_day(day + timedelta(days=offset)):
+                continue
+            base = pd.Timestamp(day)
+            open_time = (base + pd.Timedelta(f"{start}:00")).tz_localize(self.tz)
+            close_time = (base + pd.Timedelta(f"{end}:00")).tz_localize(self.tz)
+            result.append((open_time.tz_convert('UTC'), close_time.tz_convert('UTC')))
+        return result
+
+    def sessions_between(self, start, end):
+        """[start, end]와 겹치는 세션 구간 목록 (UTC, 이어진 구간은 합침)"""
+        start, end = to_utc_timestamp(start), to_utc_timestamp(end)
+        day = start.tz_convert(self.tz).date() - timedelta(days=1)
+        last_day = end.tz_convert(self.tz).date() + timedelta(days=1)
+        merged = []
+        while day <= last_day:
+            for open_time, close_time in self._day_sessions(day):
+                if merged and merged[-1][1] >= open_time:
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], close_time))
+                else:
+                    merged.append((open_time, close_time))
+            day += timedelta(days=1)
+        return [(o, c) for o, c in merged if c > start and o <= end]
+
+    def is_open(self, ts):
+        ts = to_utc_timestamp(ts)
+        return any(o <= ts < c for o, c in self.sessions_between(ts, ts))
+
+    def next_open(self, ts, horizon=timedelta(days=14)):
+        """ts 이후(ts 포함) 첫 개장 시각. 이미 열려 있으면 ts를 그대로 반환합니다."""
+        ts = to_utc_timestamp(ts)
+        for open_time, close_time in self.sessions_between(ts, ts + horizon):
+            if close_time > ts:
+                return max(open_time, ts)
+        return None
+
+    def next_close(self, ts, horizon=timedelta(days=14)):
+        """ts 이후 첫 마감 시각 (장이 닫혀 있으면 다음 세션의 마감)"""
+        ts = to_utc_timestamp(ts)
+        for open_time, close_time in self.sessions_between(ts, ts + horizon):
+            if close_time > ts:
+                return close_time
+        return None
+
+    def last_close(self, ts, horizon=timedelta(days=14)):
+        """ts 이전(ts 포함) 마지막 마감 시각"""
+        ts = to_utc_timestamp(ts)
+        closes = [c for o, c in self.sessions_between(ts - horizon, ts) if c <= ts]
+        return closes[-1] if closes else None
+
+
+KRX = MarketCalendar("KRX", "Asia/Seoul", KRX_SESSIONS, KRX_HOLIDAYS)
+CME = MarketCalendar("CME", "America/Chicago", CME_SESSIONS, CME_HOLIDAYS)
+
+
+class SessionSchedule:
+    """
+    달력 기준 폴링 일정입니다. (BackgroundPoller의 schedule로 사용)
+
+    - 장중: interval_seconds마다 실행하되, 마감 시각에 정확히 한 번 더 깨어나 마지막 봉을 받습니다.
+    - 장 마감 후: 다음 개장 시각까지 잠듭니다. (최대 max_sleep_seconds마다 다시 확인)
+    - clock: '시장 시각'을 반환하는 함수 (기본: 현재 시각, T-48h 재생에서는 재생 시각)
+    - speed: 시장 시각이 실제 시간보다 몇 배 빠르게 흐르는지 (재생 속도)
+    """
+
+    def __init__(self, calendar, interval_seconds=60, clock=None, speed=1.0, max_sleep_seconds=3600):
+        self.calendar = calendar
+        self.interval_seconds = interval_seconds
+        self.speed = speed
+        self.max_sleep_seconds = max_sleep_seconds
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+
+    def _now(self):
+        return to_utc_timestamp(self._clock())
+
+    def _step(self):
+        return pd.Timedelta(seconds=self.interval_seconds * self.speed)
+
+    def should_run(self, now=None):
+        """장중이거나, 마감한 지 한 주기가 지나지 않았으면(마감 봉 수집) True"""
+        now = to_utc_timestamp(now) if now is not None else self._now()
+        if self.calendar.is_open(now):
+            return True
+        last_close = self.calendar.last_close(now)
+        return last_close is not None and now - last_close < self._step()
+
+    def seconds_until_next(self, now=None):
+        """다음 실행까지 기다릴 실제 시간(초)"""
+        now = to_utc_timestamp(now) if now is not None else self._now()
+        if self.calendar.is_open(now):
+            wake = min(now + self._step(), self.calendar.next_close(now))
+        else:
+            wake = self.calendar.next_open(now)
+            if wake is None:
+                return self.max_sleep_seconds
+            logger.info(f"{self.calendar.name} closed at {now}; sleeping until {wake}")
+        seconds = (wake - now).total_seconds() / self.speed
+        return min(max(seconds, 0.0), self.max_sleep_seconds)
@@ -0,0 +1,8 @@
+"""
+거래소 정규 세션 시각 (현지 시간 "HH:MM")입니다.
+market_calendar의 세션 달력과 상위 폴더의 kis_client(분봉 조회 시작 시각)가 같은 값을 쓰도록 여기에 둡니다.
+"""
+
+# 코스피200 선물 정규장 (KST). 현물(09:00~15:30)보다 15분 일찍 열고 15분 늦게 닫습니다.
+KRX_FUTURES_OPEN = "08:45"
+KRX_FUTURES_CLOSE = "15:45"
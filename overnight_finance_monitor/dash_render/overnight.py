@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from asof_index import AsOfIndex
+
+
+def overnight_gaps(series, open="09:00", close="15:30", tz="Asia/Seoul", tolerance=pd.Timedelta(minutes=5)):
+    """
+    각 거래일 close 시각(예: 15:30 KST) → 다음 거래일 open 시각(예: 09:00 KST) 사이의 가격 변동을 계산합니다.
+
+    - 날짜별 반복 없이 모든 세션의 기준 시각을 한 번에 as-of 조회합니다. (searchsorted)
+    - close 가격: close 시각 이전(포함) 마지막 봉, open 가격: open 시각 이후(포함) 첫 봉
+    - 해당 분봉이 비어 있어도 tolerance 이내의 봉이 있으면 사용하고, 없으면 그 구간은 제외합니다.
+    - '다음 거래일'은 series에 데이터가 있는 다음 날짜입니다. (주말/휴일 자동 건너뜀)
+
+    반환: close_time을 인덱스로 하는 DataFrame
+          (open_time, close_price, open_price, change, pct_change)
+    """
+    series = series.dropna()
+    index = pd.DatetimeIndex(series.index)
+    if index.tz is None:
+        index = index.tz_localize(tz)
+    local = index.tz_convert(tz)
+
+    days = pd.DatetimeIndex(np.unique(local.tz_localize(None).normalize()))
+    if len(days) < 2:
+        return pd.DataFrame(columns=['open_time', 'close_price', 'open_price', 'change', 'pct_change'])
+
+    close_times = (days[:-1] + pd.Timedelta(f"{close}:00")).tz_localize(tz)
+    open_times = (days[1:] + pd.Timedelta(f"{open}:00")).tz_localize(tz)
+
+    asof = AsOfIndex(local)
+    values = series.to_numpy(dtype=float)
+    close_pos = asof.positions(close_times, tolerance=tolerance, direction="backward")
+    open_pos = asof.positions(open_times, tolerance=tolerance, direction="forward")
+
+    valid = (close_pos >= 0) & (open_pos >= 0)
+    close_price = values[close_pos[valid]]
+    open_price = values[open_pos[valid]]
+    change = open_price - close_price
+
+    return pd.DataFrame({
+        'open_time': open_times[valid],
+        'close_price': close_price,
+        'open_price': open_price,
+        'change': change,
+        'pct_change': change / close_price * 100,
+    }, index=close_times[valid].rename('close_time'))
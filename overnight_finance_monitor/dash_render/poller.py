@@ -0,0 +1,81 @@
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundPoller:
+    """
+    프로세스당 하나만 도는 백그라운드 수집 스레드입니다.
+
+    job을 interval_seconds마다 실행하여 공유 상태(예: HistoryBuffer)를 갱신하고,
+    각 브라우저 세션의 콜백은 그 상태를 읽기만 합니다.
+    → 접속자 수와 무관하게 업스트림(yfinance) 호출은 1분에 한 번입니다.
+
+    schedule(예: market_calendar.SessionSchedule)을 주면 장이 닫힌 동안에는 job을 건너뛰고
+    다음 개장 시각까지 잠들며, 장중에는 세션 경계(마감 시각)에 맞춰 깨어납니다.
+    heartbeat(seconds)를 주면 잠들기 직전마다(장이 닫혀 job을 건너뛴 경우 포함) 이번에 잘 시간(초)으로 호출합니다.
+    (리더 lease를 다음에 깨어날 때까지 연장하는 용도)
+    """
+
+    def __init__(self, job, interval_seconds=60, name="background-poller", schedule=None, heartbeat=None):
+        self.job = job
+        self.interval_seconds = interval_seconds
+        self.name = name
+        self.schedule = schedule
+        self.heartbeat = heartbeat
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._start_lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """스레드를 시작합니다. 이미 실행 중이면 아무것도 하지 않습니다. (여러 번 호출해도 안전)"""
+        if self.running:
+            return
+        with self._start_lock:
+            if self.running:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            logger.info(f"{self.name} started (interval={self.interval_seconds}s)")
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_once(self):
+        """job을 한 번 실행하고 결과를 반환합니다. 예외는 로그만 남기고 None (다음 주기에 재시도)"""
+        try:
+            return self.job()
+        except Exception as e:
+            logger.error(f"{self.name} job failed: {e}", exc_info=True)
+            return None
+
+    def _ask_schedule(self, method, default):
+        """schedule.method()의 결과. schedule이 없거나 달력 계산이 실패하면 default (수집은 멈추지 않음)"""
+        if self.schedule is None:
+            return default
+        try:
+            return getattr(self.schedule, method)()
+        except Exception as e:
+            logger.error(f"{self.name} schedule.{method} failed: {e}", exc_info=True)
+            return default
+
+    def _run(self):
+        # 시작 직후 한 번 실행하고, 이후 interval_seconds(또는 schedule이 정한 시간)마다 반복합니다.
+        while not self._stop_event.is_set():
+            if self._ask_schedule('should_run', True):
+                self.run_once()
+            sleep_seconds = self._ask_schedule('seconds_until_next', self.interval_seconds)
+            if self.heartbeat is not None:
+                try:
+                    self.heartbeat(sleep_seconds)
+                except Exception as e:
+                    logger.error(f"{self.name} heartbeat failed: {e}", exc_info=True)
+            self._stop_event.wait(sleep_seconds)
@@ -0,0 +1,74 @@
+import os
+import threading
+import logging
+from datetime import datetime, timedelta, timezone
+
+from bar_cache import BarCache, to_utc_timestamp
+
+logger = logging.getLogger(__name__)
+
+# 재생 속도 배율 (1: 실제 시간과 같은 속도, 60: 1초에 1분씩 재생)
+DEFAULT_SPEED = float(os.environ.get('MONITOR_REPLAY_SPEED', '1'))
+
+
+class ReplayEngine:
+    """
+    'delay 전' 시점의 봉을 시계처럼 재생하는 엔진입니다. (T-48h 지연 모드)
+
+    - 재생 시각 = (시작 시각 - delay) + (경과 시간 × speed)
+    - 봉은 공유 BarCache에서 as-of로 찾습니다. 첫 조회 때 재생 시각 이전부터 현재까지를 한 번에 받아두므로
+      재생 시각이 현재에 닿기 전까지는 업스트림을 호출하지 않고, 닿은 뒤에는 BarCache의 꼬리 보충(백오프 포함)만 일어납니다.
+      BarCache가 받은 봉을 store에 저장하므로 새 리더도 처음부터 다시 받지 않습니다.
+    - 시작 시각은 store의 settings_key에 한 번만 기록해 모든 워커가 같은 재생 시계를 씁니다. (리더가 바뀌어도 재생이 이어짐)
+      앱을 다시 기동하면 새 리더가 lease를 얻으면서 이 키를 지우므로(shared_store.try_acquire_leader의 reset_keys)
+      재생도 처음부터 다시 시작합니다. 그래서 store가 있으면 시작 시각을 메모리에 캐시하지 않고 매번 store에서 읽습니다.
+    """
+
+    def __init__(self, ticker="ES=F", interval="1m", delay=timedelta(hours=48), speed=DEFAULT_SPEED,
+                 cache=None, store=None, clock=None):
+        if speed <= 0:
+            raise ValueError(f"speed must be positive: {speed}")
+        self.ticker = ticker
+        self.interval = interval
+        self.delay = delay
+        self.speed = speed
+        self.cache = cache or BarCache()
+        self._store = store
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self.settings_key = f"replay_started_at|{ticker}|{interval}|{delay}|{speed:g}"
+        self._started_at = None
+        self._lock = threading.Lock()
+
+    def _now(self):
+        return to_utc_timestamp(self._clock())
+
+    def started_at(self, now=None):
+        """재생 시작 시각. store가 있으면 이번 실행에서 가장 먼저 재생을 시작한 워커의 시각을 씁니다."""
+        now = to_utc_timestamp(now) if now is not None else self._now()
+        if self._store is not None:
+            return to_utc_timestamp(self._store.setdefault(self.settings_key, now.isoformat()))
+        if self._started_at is None:
+            self._started_at = now
+        return self._started_at
+
+    def replay_time(self, now=None):
+        """현재(now) 기준 재생 시각을 반환합니다."""
+        now = to_utc_timestamp(now) if now is not None else self._now()
+        started_at = self.started_at(now)
+        replay = started_at - self.delay + (now - started_at) * self.speed
+        # 빠르게 재생해도 실제 현재 시각을 넘지는 않습니다.
+        return min(replay, now)
+
+    def next_point(self, now=None):
+        """재생 시각 이전(포함) 마지막 봉을 {"Time", "Price"}로 반환합니다. 없으면 None."""
+        with self._lock:
+            now = to_utc_timestamp(now) if now is not None else self._now()
+            point = self.cache.lookup(self.ticker, self.replay_time(now), self.interval, now=now)
+        if point is None:
+            return None
+        ts, row = point
+        return {"Time": ts.strftime('%Y-%m-%d %H:%M'), "Price": float(row['Close'])}
+
+    def tick_seconds(self, bar_seconds=60):
+        """한 tick에 봉 하나씩 재생되도록 하는 폴링 간격(초)을 반환합니다."""
+        return bar_seconds / self.speed
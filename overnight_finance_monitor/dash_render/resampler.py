@@ -0,0 +1,126 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 주기 이름 -> 길이(초)
+INTERVAL_SECONDS = {"1m": 60, "2m": 120, "5m": 300, "15m": 900, "30m": 1800, "60m": 3600, "1h": 3600, "1d": 86400}
+DEFAULT_INTERVALS = ("1m", "5m", "30m", "1h")
+NS_PER_SECOND = 10 ** 9
+
+
+class Resampler:
+    """
+    하나의 기본 스트림(1분봉 또는 체결)에서 여러 주기의 OHLCV 봉을 한 번에 만드는 증분 리샘플러입니다.
+
+    - 주기마다 진행 중인 봉 하나 [시작, O, H, L, C, V]만 보관합니다. (주기당 O(1) 상태, 과거 봉은 보관하지 않음)
+    - update(ts_ns, open, high, low, close, volume): 입력 하나를 모든 주기에 반영하고,
+      이번 입력으로 완성된 봉을 [(주기, 봉)]으로 반환합니다. 체결은 open=high=low=close=가격으로 넣습니다.
+    - roll(now_ns): 새 입력이 없어도 구간이 끝난 봉을 완성합니다. (실시간 체결 스트림용)
+    - 봉 경계는 epoch(UTC) 기준 정렬입니다. (30m/1h는 KST, CME 모두 정시/30분 경계와 같음)
+    - 이미 완성된(지난) 봉 구간의 입력은 반영하지 않고 late로만 셉니다.
+    봉은 (ts, open, high, low, close, volume) 튜플이며 ts는 봉 시작 epoch ns (UTC)입니다.
+    """
+
+    def __init__(self, intervals=DEFAULT_INTERVALS):
+        unknown = [name for name in intervals if name not in INTERVAL_SECONDS]
+        if unknown:
+            raise ValueError(f"Unsupported intervals: {unknown}")
+        self.intervals = tuple(intervals)
+        self._widths = [INTERVAL_SECONDS[name] * NS_PER_SECOND for name in self.intervals]
+        self._current = [None] * len(self.intervals)
+        self._last_completed = [None] * len(self.intervals)  # 주기별 마지막으로 완성된 봉의 시작
+        self.late = 0
+
+    def update(self, ts_ns, open, high, low, close, volume=0):
+        completed = []
+        for i, width in enumerate(self._widths):
+            start = ts_ns - ts_ns % width
+            bar = self._current[i]
+            if bar is not None and start == bar[0]:
+                if high > bar[2]:
+                    bar[2] = high
+                if low < bar[3]:
+                    bar[3] = low
+                bar[4] = close
+                bar[5] += volume
+                continue
+            if bar is not None and start < bar[0]:
+                self.late += 1
+                continue
+            last = self._last_completed[i]
+            if bar is None and last is not None and start <= last:
+                self.late += 1
+                continue
+            if bar is not None:
+                completed.append((self.intervals[i], tuple(bar)))
+                self._last_completed[i] = bar[0]
+            self._current[i] = [start, open, high, low, close, volume]
+        return completed
+
+    def partial(self, interval):
+        """interval의 진행 중인 봉 (없으면 None)"""
+        bar = self._current[self.intervals.index(interval)]
+        return tuple(bar) if bar is not None else None
+
+    def roll(self, now_ns=None):
+        """진행 중인 봉 중 now_ns가 구간 끝을 지난 것(now_ns가 None이면 전부)을 완성해 [(주기, 봉)]으로 반환합니다."""
+        completed = []
+        for i, width in enumerate(self._widths):
+            bar = self._current[i]
+            if bar is not None and (now_ns is None or now_ns >= bar[0] + width):
+                completed.append((self.intervals[i], tuple(bar)))
+                self._last_completed[i] = bar[0]
+                self._current[i] = None
+        return completed
+
+    def flush(self):
+        """진행 중인 봉을 모두 완성된 것으로 보고 [(주기, 봉)]으로 반환합니다."""
+        return self.roll()
+
+
+def bars_to_frame(bars):
+    """봉 튜플 목록을 yfinance와 같은 모양(Open/High/Low/Close/Volume, UTC 인덱스)의 DataFrame으로 변환합니다."""
+    if not bars:
+        return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+    ts, o, h, l, c, v = (np.array(column) for column in zip(*bars))
+    return pd.DataFrame({'Open': o, 'High': h, 'Low': l, 'Close': c, 'Volume': v},
+                        index=pd.to_datetime(ts.astype(np.int64), utc=True))
+
+
+def resample_frame(frame, intervals=DEFAULT_INTERVALS, include_partial=True):
+    """
+    1분봉 DataFrame 하나를 한 번 훑어서 intervals의 봉 DataFrame들을 {주기: DataFrame}으로 반환합니다.
+    (주기마다 yfinance에 따로 요청하지 않고 1분봉 한 번으로 모든 차트 주기를 만듦)
+    include_partial=False면 아직 끝나지 않은 마지막 봉은 제외합니다.
+    """
+    result = {name: [] for name in intervals}
+    if frame is None or frame.empty:
+        return {name: bars_to_frame([]) for name in intervals}
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame = frame.copy()
+        frame.columns = frame.columns.get_level_values(0)
+    frame = frame.dropna(subset=['Close']).sort_index()
+
+    index = pd.DatetimeIndex(frame.index)
+    index = index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')
+    close = frame['Close'].to_numpy(dtype=np.float64)
+    columns = [index.as_unit('ns').asi8.tolist()]
+    for name in ('Open', 'High', 'Low'):
+        columns.append((frame[name].to_numpy(dtype=np.float64) if name in frame else close).tolist())
+    columns.append(close.tolist())
+    volume = frame['Volume'].to_numpy(dtype=np.float64) if 'Volume' in frame else np.zeros(len(close))
+    columns.append(np.nan_to_num(volume).astype(np.int64).tolist())
+
+    resampler = Resampler(intervals)
+    for ts, o, h, l, c, v in zip(*columns):
+        for name, bar in resampler.update(ts, o, h, l, c, v):
+            result[name].append(bar)
+    if include_partial:
+        for name, bar in resampler.flush():
+            result[name].append(bar)
+    if resampler.late:
+        logger.warning(f"Resampler skipped {resampler.late} out-of-order rows")
+    return {name: bars_to_frame(bars) for name, bars in result.items()}
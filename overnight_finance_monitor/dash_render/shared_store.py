@@ -0,0 +1,201 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def worker_id():
+    """이 프로세스(워커)의 식별자. 리더 선출 시 lease 소유자로 기록됩니다. (fork 이후 pid 기준)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LocalStore:
+    """
+    단일 프로세스용 기본 백엔드입니다. 공유할 상대가 없으므로 항상 리더이고,
+    봉/히스토리는 BarCache와 HistoryBuffer가 메모리에 이미 갖고 있으므로 따로 저장하지 않습니다.
+    (히스토리 id만 발급해 HistoryBuffer의 seq로 쓰게 합니다.)
+    """
+
+    def __init__(self):
+        self._history_id = 0
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def try_acquire_leader(self, owner, ttl_seconds, name="poller", reset_keys=()):
+        # 설정값은 프로세스 메모리에만 있으므로 재시작하면 이미 비어 있습니다. (reset_keys 처리 불필요)
+        return True
+
+    def load_bars(self, ticker, interval):
+        return None
+
+    def save_bars(self, ticker, interval, frame, covered_from, fetched_at):
+        pass
+
+    def append_history(self, point):
+        with self._lock:
+            self._history_id += 1
+            return self._history_id
+
+    def history_since(self, last_id, limit=1000):
+        return []
+
+    def setdefault(self, key, value):
+        with self._lock:
+            return self._values.setdefault(key, value)
+
+
+class SQLiteStore:
+    """
+    gunicorn 다중 워커가 함께 쓰는 SQLite(WAL 모드) 백엔드입니다.
+
+    - leader 테이블의 lease로 '쓰기 담당' 워커 하나를 선출합니다. 리더만 yfinance를 호출하고,
+      lease가 만료되면(리더 워커 종료 등) 다른 워커가 이어받습니다.
+    - bars/bar_coverage: 리더가 받아온 1분봉과 캐시 구간 (새 리더가 처음부터 다시 받지 않도록)
+    - history: 모든 워커가 같은 히스토리를 보도록 하는 공용 로그 (id 순으로 증가, 클라이언트 델타의 seq로 사용)
+    - settings: 워커 간에 한 번 정하면 바뀌지 않는 값 (재생 시작 시각 등)
+      try_acquire_leader(reset_keys=...)로 실행(기동)마다 새로 정할 값을 지정할 수 있습니다.
+    """
+
+    def __init__(self, path, busy_timeout=5.0, history_limit=1000):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.history_limit = history_limit
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS leader (
+                name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS bars (
+                ticker TEXT NOT NULL, interval TEXT NOT NULL, ts INTEGER NOT NULL,
+                open REAL, high REAL, low REAL, close REAL, volume REAL,
+                PRIMARY KEY (ticker, interval, ts)) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS bar_coverage (
+                ticker TEXT NOT NULL, interval TEXT NOT NULL,
+                covered_from INTEGER NOT NULL, fetched_at INTEGER NOT NULL,
+                PRIMARY KEY (ticker, interval));
+            CREATE TABLE IF NOT EXISTS history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, time TEXT NOT NULL UNIQUE, price REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        """)
+
+    def try_acquire_leader(self, owner, ttl_seconds, name="poller", reset_keys=()):
+        """
+        lease를 획득/연장하면 True. 다른 워커가 유효한 lease를 갖고 있으면 False.
+        lease가 없거나 만료된 상태(첫 기동, 모든 워커가 멈췄다가 재시작)에서 얻으면 같은 트랜잭션에서
+        settings의 reset_keys를 지웁니다. (이전 실행에서 정한 값을 이어 쓰지 않도록)
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT owner, expires FROM leader WHERE name = ?", (name,)).fetchone()
+            if row is None or row[1] < now:
+                conn.executemany("DELETE FROM settings WHERE key = ?", [(key,) for key in reset_keys])
+                if reset_keys:
+                    logger.info(f"Leader lease started fresh by {owner}; reset {list(reset_keys)}")
+            if row is None or row[0] == owner or row[1] < now:
+                conn.execute(
+                    "INSERT INTO leader (name, owner, expires) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires = excluded.expires",
+                    (name, owner, now + ttl_seconds))
+                acquired = True
+                if row is not None and row[0] != owner:
+                    logger.info(f"Leader lease taken over by {owner} (previous: {row[0]})")
+            else:
+                acquired = False
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return acquired
+
+    def load_bars(self, ticker, interval):
+        """저장된 봉과 캐시 구간을 (frame, covered_from, fetched_at)으로 반환합니다. 없으면 None."""
+        conn = self._connect()
+        coverage = conn.execute(
+            "SELECT covered_from, fetched_at FROM bar_coverage WHERE ticker = ? AND interval = ?",
+            (ticker, interval)).fetchone()
+        if coverage is None:
+            return None
+        rows = conn.execute(
+            "SELECT ts, open, high, low, close, volume FROM bars WHERE ticker = ? AND interval = ? ORDER BY ts",
+            (ticker, interval)).fetchall()
+        frame = pd.DataFrame(rows, columns=['ts'] + BAR_COLUMNS)
+        frame.index = pd.to_datetime(frame.pop('ts'), unit='ns', utc=True)
+        frame.index.name = None
+        return frame, pd.Timestamp(coverage[0], tz='UTC'), pd.Timestamp(coverage[1], tz='UTC')
+
+    def save_bars(self, ticker, interval, frame, covered_from, fetched_at):
+        """새로 받아온 봉을 upsert하고 캐시 구간을 갱신합니다."""
+        conn = self._connect()
+        records = []
+        if frame is not None and not frame.empty:
+            values = frame.reindex(columns=BAR_COLUMNS).astype(float)
+            records = [(ticker, interval, int(ts)) + tuple(row)
+                       for ts, row in zip(frame.index.as_unit('ns').asi8, values.itertuples(index=False))]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?)", records)
+            # 캐시 구간 밖으로 밀려난 오래된 봉은 함께 정리합니다.
+            conn.execute("DELETE FROM bars WHERE ticker = ? AND interval = ? AND ts < ?",
+                         (ticker, interval, covered_from.value))
+            conn.execute(
+                "INSERT OR REPLACE INTO bar_coverage VALUES (?, ?, ?, ?)",
+                (ticker, interval, covered_from.value, fetched_at.value))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def append_history(self, point):
+        """히스토리에 추가하고 새 id를 반환합니다. 같은 Time이 이미 있으면 None. 최근 history_limit개만 유지합니다."""
+        conn = self._connect()
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO history (time, price) VALUES (?, ?)", (point['Time'], point['Price']))
+        if cur.rowcount != 1:
+            return None
+        conn.execute("DELETE FROM history WHERE id <= ?", (cur.lastrowid - self.history_limit,))
+        return cur.lastrowid
+
+    def history_since(self, last_id, limit=1000):
+        """id가 last_id보다 큰 히스토리를 오래된 순 [(id, point), ...]으로 반환합니다. (최근 limit개까지)"""
+        rows = self._connect().execute(
+            "SELECT id, time, price FROM (SELECT id, time, price FROM history WHERE id > ? ORDER BY id DESC LIMIT ?) "
+            "ORDER BY id", (last_id, limit)).fetchall()
+        return [(row_id, {"Time": t, "Price": price}) for row_id, t, price in rows]
+
+    def setdefault(self, key, value):
+        """key가 없으면 value(문자열)를 저장합니다. 먼저 저장한 워커의 값을 반환합니다. (dict.setdefault와 같음)"""
+        conn = self._connect()
+        conn.execute("INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)", (key, value))
+        return conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()[0]
+
+
+def create_store(path=None, history_limit=1000):
+    """path(또는 MONITOR_STORE_PATH 환경변수)가 있으면 SQLiteStore, 없으면 LocalStore를 만듭니다."""
+    path = path or os.environ.get('MONITOR_STORE_PATH')
+    if path:
+        logger.info(f"Using shared SQLite store at {path}")
+        return SQLiteStore(path, history_limit=history_limit)
+    return LocalStore()
@@ -0,0 +1,36 @@
+import sys
+import os
+
+import pandas as pd
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+
+class FakeDownloader:
+    """
+    yf.download 대신 쓰는 downloader입니다. (네트워크 없음, 호출 구간을 calls에 기록)
+
+    frame을 주면 미리 준비한 봉에서 요청 구간만 잘라 주고,
+    없으면 규칙적인 1분봉(종가 = 분)을 만들어 줍니다. (end가 없으면 now까지)
+    테스트(test_bar_cache/test_replay/test_fixtures)와 benchmarks/bench_data.py가 함께 사용합니다.
+    """
+
+    def __init__(self, now=None, frame=None):
+        self.calls = []
+        self.now = now
+        self.frame = frame
+
+    def __call__(self, ticker, interval, start, end=None):
+        self.calls.append((start, end))
+        if self.frame is not None:
+            mask = self.frame.index >= start
+            if end is not None:
+                mask &= self.frame.index < end
+            return self.frame[mask]
+
+        end = end or self.now
+        index = pd.date_range(pd.Timestamp(start).ceil('min'), pd.Timestamp(end), freq='1min', inclusive='left')
+        return pd.DataFrame({'Close': [float(ts.minute) for ts in index]}, index=index)
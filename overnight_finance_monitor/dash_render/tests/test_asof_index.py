@@ -0,0 +1,53 @@
+import sys
+import os
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from asof_index import AsOfIndex
+
+
+def make_index():
+    # 중간에 30분 공백이 있는 1분봉 시각
+    first = pd.date_range("2026-10-14 00:00", periods=60, freq="1min", tz="UTC")
+    second = pd.date_range("2026-10-14 01:30", periods=60, freq="1min", tz="UTC")
+    return first.append(second)
+
+
+def test_matches_boolean_mask_lookup():
+    index = make_index()
+    asof = AsOfIndex(index)
+    targets = pd.date_range("2026-10-13 23:58", "2026-10-14 02:40", freq="7min", tz="UTC")
+
+    positions = asof.positions(targets)
+    for target, pos in zip(targets, positions):
+        expected = index[index <= target]
+        if len(expected) == 0:
+            assert pos == -1
+        else:
+            assert index[pos] == expected[-1]
+
+
+def test_naive_targets_are_treated_as_utc_and_tolerance_applies():
+    index = make_index()
+    asof = AsOfIndex(index)
+
+    assert asof.position(pd.Timestamp("2026-10-14 00:10")) == 10
+    # 공백 구간 한가운데: 직전 봉은 00:59, 허용 오차 5분이면 없는 것으로 처리
+    gap_target = pd.Timestamp("2026-10-14 01:15", tz="UTC")
+    assert index[asof.position(gap_target)] == pd.Timestamp("2026-10-14 00:59", tz="UTC")
+    assert asof.position(gap_target, tolerance=timedelta(minutes=5)) == -1
+
+
+def test_window_returns_inclusive_slice():
+    index = make_index()
+    asof = AsOfIndex(index)
+    window = asof.window(pd.Timestamp("2026-10-14 00:58", tz="UTC"), pd.Timestamp("2026-10-14 01:31", tz="UTC"))
+    assert list(index[window]) == [index[58], index[59], index[60], index[61]]
+    assert np.array_equal(asof.positions([]), np.array([], dtype=np.int64))
@@ -0,0 +1,91 @@
+import sys
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from backfill import CoverageLedger, backfill, split_windows
+from bar_archive import BarArchive
+from market_calendar import CME
+
+NOW = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def hourly_downloader(calls):
+    lock = threading.Lock()
+
+    def downloader(ticker, interval, start, end=None):
+        with lock:
+            calls.append((start, end))
+        # 구간 경계의 봉이 겹치도록 앞뒤로 1시간씩 더 돌려줍니다.
+        index = pd.date_range(pd.Timestamp(start) - timedelta(hours=1), pd.Timestamp(end), freq='1h')
+        return pd.DataFrame({'Close': range(len(index))}, index=index)
+    return downloader
+
+
+def test_split_windows_respects_span_and_lookback():
+    windows = split_windows(NOW - timedelta(days=40), NOW, "1m", now=NOW)
+    assert windows[0][0] > pd.Timestamp(NOW - timedelta(days=30))
+    assert windows[-1][1] == pd.Timestamp(NOW)
+    assert all(end - start <= timedelta(days=7) for start, end in windows)
+    assert len(windows) == 5
+    for (_, prev_end), (next_start, _) in zip(windows, windows[1:]):
+        assert prev_end == next_start
+
+
+def test_backfill_merges_windows_and_rerun_fetches_nothing(tmp_path):
+    calls = []
+    ledger_path = str(tmp_path / "coverage.json")
+    start, end = NOW - timedelta(days=20), NOW - timedelta(days=1)
+
+    archive = BarArchive(str(tmp_path / "archive"))
+
+    bars = backfill("ES=F", start, end, "1m", ledger=CoverageLedger(ledger_path), archive=archive,
+                    downloader=hourly_downloader(calls), now=NOW)
+    assert len(calls) == 3
+    assert bars.index.is_unique and bars.index.is_monotonic_increasing
+
+    # 새로 연 ledger로 같은 구간을 다시 요청하면 아무것도 받지 않고,
+    # 구간을 늘리면 늘어난 부분만 받습니다.
+    again = backfill("ES=F", start, end, "1m", ledger=CoverageLedger(ledger_path), archive=archive,
+                     downloader=hourly_downloader(calls), now=NOW)
+    assert again.empty and len(calls) == 3
+    backfill("ES=F", start, NOW, "1m", ledger=CoverageLedger(ledger_path), archive=archive,
+             downloader=hourly_downloader(calls), now=NOW)
+    assert len(calls) == 4 and pd.Timestamp(calls[-1][0]) == pd.Timestamp(end)
+
+
+def test_coverage_is_recorded_only_for_archived_or_closed_windows(tmp_path):
+    ledger_path = str(tmp_path / "coverage.json")
+
+    def empty_downloader(ticker, interval, start, end=None):
+        return pd.DataFrame()
+
+    # 장중(2026-10-14 수요일) 빈 응답은 기록하지 않고, 휴장(2026-10-10~11 주말) 빈 구간만 기록합니다.
+    open_day = (datetime(2026, 10, 14, 14, tzinfo=timezone.utc), datetime(2026, 10, 14, 15, tzinfo=timezone.utc))
+    weekend = (datetime(2026, 10, 10, 12, tzinfo=timezone.utc), datetime(2026, 10, 11, 12, tzinfo=timezone.utc))
+    for window in (open_day, weekend):
+        backfill("ES=F", *window, "1m", ledger=CoverageLedger(ledger_path), archive=BarArchive(str(tmp_path)),
+                 calendar=CME, downloader=empty_downloader, now=NOW)
+    assert CoverageLedger(ledger_path).covered("ES=F", "1m") == [tuple(pd.Timestamp(t) for t in weekend)]
+
+
+def test_failed_archive_append_leaves_range_uncovered(tmp_path):
+    ledger_path = str(tmp_path / "coverage.json")
+
+    class BrokenArchive:
+        def append(self, symbol, frame, interval="1m"):
+            raise OSError("disk full")
+
+    start, end = NOW - timedelta(days=2), NOW - timedelta(days=1)
+    with pytest.raises(OSError):
+        backfill("ES=F", start, end, "1m", ledger=CoverageLedger(ledger_path), archive=BrokenArchive(),
+                 downloader=hourly_downloader([]), now=NOW)
+    assert CoverageLedger(ledger_path).covered("ES=F", "1m") == []
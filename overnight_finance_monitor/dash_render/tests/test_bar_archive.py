@@ -0,0 +1,56 @@
+import sys
+import os
+
+import pandas as pd
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from bar_archive import BarArchive
+
+
+def bars(start, periods, close=1.0):
+    index = pd.date_range(start, periods=periods, freq="1min", tz="UTC")
+    return pd.DataFrame({"Close": close, "Volume": 1.0}, index=index)
+
+
+def test_append_partitions_by_day_and_reads_time_range(tmp_path):
+    archive = BarArchive(str(tmp_path))
+    # 자정을 넘기는 구간은 날짜별 파일 두 개로 나뉩니다.
+    assert archive.append("ES=F", bars("2026-10-14 23:00", 120)) == 2
+    assert [d.isoformat() for d in archive.days("ES=F")] == ["2026-10-14", "2026-10-15"]
+
+    frame = archive.read("ES=F", "2026-10-14 23:30", "2026-10-15 00:10")
+    assert len(frame) == 40
+    assert frame.index[0] == pd.Timestamp("2026-10-14 23:30", tz="UTC")
+    assert frame.index[-1] == pd.Timestamp("2026-10-15 00:09", tz="UTC")
+
+
+def test_later_appends_win_and_compact_keeps_result(tmp_path):
+    archive = BarArchive(str(tmp_path))
+    archive.append("ES=F", bars("2026-10-14 10:00", 10, close=1.0))
+    archive.append("ES=F", bars("2026-10-14 10:05", 10, close=2.0))
+
+    frame = archive.read("ES=F")
+    assert len(frame) == 15 and frame.index.is_monotonic_increasing
+    assert frame["Close"].iloc[4] == 1.0 and frame["Close"].iloc[5] == 2.0
+
+    archive.compact("ES=F", "2026-10-14")
+    day_dir = os.path.join(str(tmp_path), "ES=F", "1m", "2026-10-14")
+    assert len(os.listdir(day_dir)) == 1
+    assert archive.read("ES=F").equals(frame)
+
+
+def test_append_new_skips_archived_bars_and_compacts_small_parts(tmp_path):
+    archive = BarArchive(str(tmp_path))
+    assert archive.latest("ES=F") is None
+    assert archive.append_new("ES=F", bars("2026-10-14 10:00", 10)) == 10
+    # --watch처럼 겹치는 구간을 다시 넣으면 새 봉만 추가됩니다.
+    assert archive.append_new("ES=F", bars("2026-10-14 10:00", 10)) == 0
+    for minute in range(10, 14):
+        archive.append_new("ES=F", bars("2026-10-14 10:00", minute + 1), max_parts=3)
+    assert archive.latest("ES=F") == pd.Timestamp("2026-10-14 10:13", tz="UTC")
+    assert len(archive._day_files("ES=F", "1m", pd.Timestamp("2026-10-14").date())) <= 3
+    assert len(archive.read("ES=F")) == 14
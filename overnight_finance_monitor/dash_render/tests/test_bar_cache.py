@@ -0,0 +1,104 @@
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+import logging
+
+import pandas as pd
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from bar_cache import BarCache
+from conftest import FakeDownloader
+
+
+def test_lookups_inside_cached_range_do_not_refetch():
+    now = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+    downloader = FakeDownloader()
+    downloader.now = now
+    cache = BarCache(downloader=downloader, refresh_seconds=60)
+
+    target = now - timedelta(hours=48)
+    frame = cache.get_frame("ES=F", target, now=now)
+    assert len(downloader.calls) == 1
+    assert frame.index[0] <= target - timedelta(days=3) + timedelta(minutes=1)
+
+    # 이후 1분씩 이동하는 T-48h 조회는 모두 메모리에서 처리됩니다.
+    for minutes in range(1, 30):
+        cache.get_frame("ES=F", target + timedelta(minutes=minutes), now=now + timedelta(minutes=minutes))
+    assert len(downloader.calls) == 1
+
+
+def test_tail_is_topped_up_only_after_refresh_interval():
+    now = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+    downloader = FakeDownloader()
+    downloader.now = now
+    cache = BarCache(downloader=downloader, refresh_seconds=60)
+    cache.get_frame("ES=F", now - timedelta(minutes=5), now=now)
+
+    # 갱신 주기 이전에는 최근 시점을 물어도 다시 받지 않습니다.
+    cache.get_frame("ES=F", now + timedelta(seconds=30), now=now + timedelta(seconds=30))
+    assert len(downloader.calls) == 1
+
+    later = now + timedelta(minutes=5)
+    downloader.now = later
+    frame = cache.get_frame("ES=F", later, now=later)
+    assert len(downloader.calls) == 2
+    # 꼬리 보충은 마지막 봉부터만 요청합니다.
+    assert pd.Timestamp(downloader.calls[1][0]) == now - timedelta(minutes=1)
+    assert frame.index.is_unique and frame.index.is_monotonic_increasing
+    assert frame.index[-1] == later - timedelta(minutes=1)
+
+
+def test_tail_refresh_backs_off_while_no_new_bars_arrive():
+    now = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+    downloader = FakeDownloader()
+    downloader.now = now  # 업스트림 봉이 now에서 멈춘 상태 (주말/정지)
+    cache = BarCache(downloader=downloader, refresh_seconds=60, max_refresh_seconds=240)
+    cache.get_frame("ES=F", now - timedelta(minutes=5), now=now)
+
+    def ask(seconds):
+        t = now + timedelta(seconds=seconds)
+        cache.get_frame("ES=F", t, now=t)
+        return len(downloader.calls)
+
+    assert ask(60) == 2      # 새 봉 없음 → 다음 보충은 120초 뒤
+    assert ask(120) == 2
+    assert ask(180) == 3     # 여전히 없음 → 240초 (최대)
+    assert ask(400) == 3
+
+    downloader.now = now + timedelta(minutes=10)
+    assert ask(420) == 4     # 새 봉 도착 → 다시 60초 간격
+    assert ask(480) == 5
+
+
+def test_lookup_many_answers_batched_targets_from_one_fill():
+    now = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+    downloader = FakeDownloader()
+    downloader.now = now
+    cache = BarCache(downloader=downloader)
+
+    targets = [now - timedelta(hours=48) + timedelta(minutes=m, seconds=30) for m in range(0, 120, 10)]
+    rows, found = cache.lookup_many("ES=F", targets, now=now)
+    assert found.all() and len(rows) == len(targets)
+    assert list(rows.index) == [pd.Timestamp(t).floor('min') for t in targets]
+    assert len(downloader.calls) == 1
+
+    ts, row = cache.lookup("ES=F", targets[0], now=now)
+    assert ts == rows.index[0] and row['Close'] == rows['Close'].iloc[0]
+
+
+def test_lookup_many_with_no_targets_returns_empty_result():
+    downloader = FakeDownloader()
+    downloader.now = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+    cache = BarCache(downloader=downloader)
+
+    rows, found = cache.lookup_many("ES=F", [])
+    assert rows.empty and len(found) == 0
+    assert downloader.calls == []
@@ -1,8 +1,11 @@
 import sys
 import os
-from datetime import datetime, timedelta
+import importlib
+from datetime import datetime, timedelta, timezone
 import logging
 
+import pytest
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -12,48 +15,65 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
-logger.info(f"Current dir: {current_dir}")
-logger.info(f"Adding parent dir to sys.path: {parent_dir}")
+import fixtures
+import data_manager
+
+# 녹화된 ES=F 1분봉 (tests/fixtures/ES_F_1m.pkl.gz)
+FIXTURE_DIR = os.path.join(current_dir, 'fixtures')
+
 
-try:
-    from data_manager import get_sp500_futures_at_time
-    logger.info("Successfully imported get_sp500_futures_at_time from data_manager")
-except ImportError as e:
-    logger.error(f"Failed to import data_manager: {e}")
-    sys.exit(1)
+def reload_data_manager():
+    """MONITOR_FIXTURE_* 환경변수를 반영하도록 fixtures/data_manager를 다시 import합니다."""
+    importlib.reload(fixtures)
+    return importlib.reload(data_manager)
 
-def test_fetch_48h_delayed_point():
-    logger.info("Starting test: test_fetch_48h_delayed_point")
-    target_time = datetime.now() - timedelta(hours=48)
+
+def fetch_48h_delayed_point(manager):
+    """재생 모드면 녹화 시각, 아니면 현재 시각 기준 T-48h 시점과 그 시점의 봉을 반환합니다."""
+    clock = fixtures.fixture_clock(manager.downloader, "ES=F")
+    target_time = (clock() if clock else datetime.now(timezone.utc)) - timedelta(hours=48)
     logger.info(f"Calculated Target Time (T-48h): {target_time}")
-    
-    try:
-        point = get_sp500_futures_at_time(target_time)
-        
-        if point:
-            logger.info(f"SUCCESS: Found data point: {point}")
-            return True
-        else:
-            logger.warning("FAILED: Could not fetch data point for 48h ago.")
-            
-            # 주말인 경우를 대비해 72시간 전으로 시도
-            alt_target = target_time - timedelta(hours=24)
-            logger.info(f"Trying alternative target (72h ago): {alt_target}")
-            point = get_sp500_futures_at_time(alt_target)
-            if point:
-                logger.info(f"SUCCESS with alternative: {point}")
-                return True
-            else:
-                logger.error("FAILED even with alternative target.")
-    except Exception as e:
-        logger.error(f"Exception during test: {e}", exc_info=True)
-            
-    return False
+    return target_time, manager.get_sp500_futures_at_time(target_time)
+
+
+@pytest.fixture
+def replay_manager(monkeypatch):
+    """네트워크 없이 녹화된 fixture를 재생하는 data_manager (테스트가 끝나면 원래 설정으로 되돌림)"""
+    monkeypatch.setenv('MONITOR_FIXTURE_MODE', 'replay')
+    monkeypatch.setenv('MONITOR_FIXTURE_DIR', FIXTURE_DIR)
+    monkeypatch.delenv('MONITOR_STORE_PATH', raising=False)
+    yield reload_data_manager()
+    monkeypatch.undo()
+    reload_data_manager()
+
+
+def test_fetch_48h_delayed_point(replay_manager):
+    # 녹화 시각 기준으로 계산하므로 항상 같은 결과
+    manager = replay_manager
+    assert isinstance(manager.downloader, fixtures.FixtureDownloader)
+
+    target_time, point = fetch_48h_delayed_point(manager)
+    assert point is not None
+    assert set(point) == {"Time", "Price"}
+
+    frame = manager.bar_cache.get_frame("ES=F", target_time)
+    assert list(frame.columns) == ['Close', 'High', 'Low', 'Open', 'Volume']
+    assert len(frame) > 1000 and frame.index.is_unique and frame.index.is_monotonic_increasing
+    assert str(frame.index.tz) == 'UTC'
+    assert frame.index[0] <= target_time - timedelta(days=1)
+
+    # 조회 결과는 녹화된 봉 중 T-48h 이전(포함) 마지막 봉
+    recorded = manager.downloader.load("ES=F", "1m")['frame']
+    expected = recorded[recorded.index <= target_time].iloc[-1]
+    assert point == {"Time": expected.name.strftime('%Y-%m-%d %H:%M'), "Price": float(expected['Close'])}
+
 
 if __name__ == "__main__":
+    # MONITOR_FIXTURE_MODE=record면 실제 yfinance를 호출하고 받은 봉을 fixture로 녹화합니다.
     logger.info("Running data fetch test script...")
-    if test_fetch_48h_delayed_point():
-        logger.info("=== FINAL RESULT: TEST PASSED ===")
+    _, point = fetch_48h_delayed_point(data_manager)
+    if point:
+        logger.info(f"=== FINAL RESULT: TEST PASSED === {point}")
     else:
         logger.info("=== FINAL RESULT: TEST FAILED ===")
         sys.exit(1)
@@ -0,0 +1,36 @@
+import sys
+import os
+import json
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from delta_codec import encode_points, decode_points, time_to_epoch
+
+
+def make_rows(n):
+    return [{'Time': f"2026-10-16 {9 + i // 60:02d}:{i % 60:02d}", 'Price': 5000.25 + (i % 5) * 0.25} for i in range(n)]
+
+
+def test_encode_points_round_trip_with_small_deltas():
+    rows = make_rows(120)
+    payload = encode_points(rows, seq=120, reset=True)
+
+    assert payload['seq'] == 120 and payload['reset'] is True
+    assert payload['t'][0] == time_to_epoch("2026-10-16 09:00")
+    assert set(payload['t'][1:]) == {60}
+    assert payload['p'][0] == 500025
+    assert all(isinstance(v, int) for v in payload['p'])
+    assert decode_points(payload) == rows
+
+
+def test_single_point_delta_is_compact():
+    row = make_rows(1)
+    payload = encode_points(row, seq=7)
+
+    assert 'reset' not in payload
+    assert decode_points(payload) == row
+    # 기존 4개 출력(전체 히스토리 2벌)을 보내던 것과 달리 한 점당 수십 바이트
+    assert len(json.dumps(payload)) < 50
@@ -0,0 +1,50 @@
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from fixtures import FixtureDownloader, fixture_downloader, fixture_clock
+from bar_cache import BarCache, download_bars
+from replay import ReplayEngine
+from conftest import FakeDownloader
+
+
+def test_recorded_bars_are_replayed_offline(tmp_path):
+    upstream = FakeDownloader()
+    recorder = FixtureDownloader('record', str(tmp_path), downloader=upstream)
+    start = datetime(2026, 10, 14, 12, 0, tzinfo=timezone.utc)
+    recorder("ES=F", "1m", start, start + timedelta(hours=2))
+    recorder("ES=F", "1m", start + timedelta(hours=1), start + timedelta(hours=3))
+    assert os.path.exists(recorder.path("ES=F", "1m"))
+
+    player = FixtureDownloader('replay', str(tmp_path))
+    frame = player("ES=F", "1m", start + timedelta(minutes=30), start + timedelta(hours=2, minutes=30))
+    assert len(frame) == 120
+    assert frame.index[0] == pd.Timestamp("2026-10-14 12:30", tz="UTC")
+
+    with pytest.raises(FileNotFoundError):
+        player("NQ=F", "1m", start, start + timedelta(hours=1))
+
+
+def test_replay_engine_runs_from_fixture_clock(tmp_path):
+    recorder = FixtureDownloader('record', str(tmp_path), downloader=FakeDownloader())
+    recorder("ES=F", "1m", pd.Timestamp.now(tz='UTC') - timedelta(hours=50), pd.Timestamp.now(tz='UTC'))
+
+    player = FixtureDownloader('replay', str(tmp_path))
+    clock = fixture_clock(player, "ES=F")
+    engine = ReplayEngine(cache=BarCache(downloader=player), clock=clock)
+    point = engine.next_point()
+    expected = player.load("ES=F", "1m")['recorded_at'] - timedelta(hours=48)
+    assert abs(pd.Timestamp(point["Time"], tz="UTC") - expected) < timedelta(minutes=2)
+
+
+def test_fixture_mode_off_uses_yfinance_downloader():
+    assert fixture_downloader('') is download_bars
+    assert fixture_clock(download_bars, "ES=F") is None
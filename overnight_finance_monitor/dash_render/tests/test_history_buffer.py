@@ -0,0 +1,95 @@
+import sys
+import os
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from history_buffer import HistoryBuffer, parse_filter_query
+
+
+def point(minute, price=100.0):
+    return {"Time": f"2026-10-14 00:{minute:02d}", "Price": price}
+
+
+def test_append_dedups_and_evicts_oldest():
+    history = HistoryBuffer(capacity=3)
+    assert history.append(point(0))
+    assert not history.append(point(0))
+    for minute in range(1, 5):
+        history.append(point(minute))
+
+    seq, rows = history.snapshot()
+    assert seq == 5 and len(history) == 3
+    assert [r["Time"] for r in rows] == [point(4)["Time"], point(3)["Time"], point(2)["Time"]]
+    # 밀려난 항목의 Time은 중복 집합에서도 빠져서 다시 추가할 수 있습니다.
+    assert history.append(point(0))
+
+
+def test_since_returns_only_delta_or_none_when_too_old():
+    history = HistoryBuffer(capacity=3)
+    for minute in range(3):
+        history.append(point(minute))
+    assert history.since(3) == []
+    assert history.since(1) == [point(2), point(1)]
+
+    for minute in range(3, 7):
+        history.append(point(minute))
+    assert history.since(1) is None
+
+
+def test_external_seq_allows_gaps_and_rejects_stale_rows():
+    history = HistoryBuffer(capacity=3)
+    for seq, minute in [(10, 0), (12, 1), (15, 2)]:
+        assert history.append(point(minute), seq=seq)
+    # 이미 반영한 id(다른 워커가 먼저 동기화한 행)는 다시 추가하지 않습니다.
+    assert not history.append(point(9), seq=12)
+    assert history.seq == 15
+    assert history.delta(12) == (15, [point(2)])
+    assert history.since(11) == [point(2), point(1)]
+    assert history.since(16) is None
+
+    history.append(point(3), seq=20)
+    assert history.since(9) is None
+    assert history.since(10) == [point(3), point(2), point(1)]
+
+
+def test_query_pages_sorts_and_filters_with_indexes():
+    history = HistoryBuffer(capacity=5)
+    prices = [103.0, 101.0, 105.0, 102.0, 104.0, 100.0, 106.0]
+    for minute, price in enumerate(prices):
+        history.append(point(minute, price))
+    # 용량 5: minute 2~6 (105, 102, 104, 100, 106)만 남음
+
+    total, rows = history.query(page=0, page_size=2)
+    assert total == 5
+    assert [r["Time"] for r in rows] == [point(6)["Time"], point(5)["Time"]]
+
+    total, rows = history.query(page=1, page_size=2, sort_by="Price", descending=False)
+    assert [r["Price"] for r in rows] == [104.0, 105.0]
+
+    total, rows = history.query(page_size=10, sort_by="Price", filters=[("Price", ">", 102.0), ("Price", "<=", 105.0)])
+    assert total == 2 and [r["Price"] for r in rows] == [105.0, 104.0]
+
+    # 정렬 컬럼이 아닌 조건은 구간 안에서 확인
+    total, rows = history.query(page_size=10, filters=[("Price", ">=", 104.0), ("Time", "<", point(6)["Time"])])
+    assert [r["Price"] for r in rows] == [104.0, 105.0]
+
+
+def test_parse_filter_query():
+    filters = parse_filter_query("{Price} ge 5000 && {Time} contains 10-14 && {Price} s< 6000.5 && {Bad} xx")
+    assert filters == [("Price", ">=", 5000.0), ("Time", "contains", "10-14"), ("Price", "<", 6000.5)]
+
+    history = HistoryBuffer()
+    for minute in range(3):
+        history.append(point(minute, 100.0 + minute))
+    total, rows = history.query(filters=parse_filter_query('{Time} datestartswith "2026-10-14 00:01"'))
+    assert total == 1 and rows == [point(1, 101.0)]
+
+
+def test_parse_filter_query_takes_operator_right_after_column():
+    # 값이나 컬럼 이름에 연산자 글자가 있어도 {컬럼} 바로 뒤의 연산자로만 나눕니다.
+    assert parse_filter_query('{Time} contains "lt 5" && {Note} eq "a >= b" && {a>=b} = 1 && {Price} s>= 5') == [
+        ("Time", "contains", "lt 5"), ("Note", "=", "a >= b"), ("a>=b", "=", "1"), ("Price", ">=", 5.0)]
+    assert parse_filter_query('{Price} contains5 && Price > 5 && {Price} >') == []
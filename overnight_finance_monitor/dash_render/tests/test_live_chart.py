@@ -0,0 +1,23 @@
+import sys
+import os
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from live_chart import make_live_figure
+
+
+def make_rows(n):
+    return [{'Time': f"2026-10-16 09:{i:02d}", 'Price': 5000.0 + i} for i in range(n)]
+
+
+def test_make_live_figure_uses_webgl_and_keeps_recent_points():
+    figure = make_live_figure(make_rows(10), max_points=4)
+
+    trace = figure.data[0]
+    assert trace.type == 'scattergl'
+    assert list(trace.x) == ["2026-10-16 09:06", "2026-10-16 09:07", "2026-10-16 09:08", "2026-10-16 09:09"]
+    assert list(trace.y) == [5006.0, 5007.0, 5008.0, 5009.0]
+
@@ -0,0 +1,84 @@
+import sys
+import os
+import logging
+from datetime import date
+
+import pandas as pd
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from market_calendar import KRX, CME, SessionSchedule
+
+
+def kst(text):
+    return pd.Timestamp(text, tz="Asia/Seoul")
+
+
+def chicago(text):
+    return pd.Timestamp(text, tz="America/Chicago")
+
+
+def test_krx_session_weekend_and_holiday():
+    assert KRX.is_open(kst("2026-10-16 10:00"))          # 금요일 장중
+    assert not KRX.is_open(kst("2026-10-16 15:45"))      # 마감 시각은 닫힘
+    assert not KRX.is_open(kst("2026-10-17 10:00"))      # 토요일
+    assert not KRX.is_open(kst("2026-10-09 10:00"))      # 한글날
+
+    # 금요일 장 마감 후 → 다음 개장은 월요일 08:45
+    assert KRX.next_open(kst("2026-10-16 16:00")) == kst("2026-10-19 08:45")
+    # 한글날(금) 전날 마감 후 → 월요일
+    assert KRX.next_open(kst("2026-10-08 15:46")) == kst("2026-10-12 08:45")
+    assert KRX.next_close(kst("2026-10-16 10:00")) == kst("2026-10-16 15:45")
+    assert KRX.last_close(kst("2026-10-19 08:00")) == kst("2026-10-16 15:45")
+    # 코스피200 선물 정규장: 현물보다 15분 일찍 열고 15분 늦게 닫음
+    assert not KRX.is_open(kst("2026-10-16 08:44"))
+    assert KRX.is_open(kst("2026-10-16 08:45")) and KRX.is_open(kst("2026-10-16 15:40"))
+
+
+def test_cme_weekly_session_daily_halt_and_dst():
+    assert CME.is_open(chicago("2026-10-14 03:00"))
+    assert not CME.is_open(chicago("2026-10-14 16:30"))   # 일일 정지 16:00~17:00 CT
+    assert not CME.is_open(chicago("2026-10-17 12:00"))   # 토요일
+    # 금요일 16:00 마감 → 일요일 17:00 개장, 일요일 저녁~월요일은 하나의 세션
+    assert CME.next_open(chicago("2026-10-16 16:00")) == chicago("2026-10-18 17:00")
+    assert CME.next_close(chicago("2026-10-18 18:00")) == chicago("2026-10-19 16:00")
+    # 크리스마스(금): 목요일 저녁 세션부터 닫히고 일요일 저녁에 다시 개장
+    assert not CME.is_open(chicago("2026-12-24 18:00"))
+    assert CME.next_open(chicago("2026-12-24 16:00")) == chicago("2026-12-27 17:00")
+    # 서머타임 종료 전후에도 현지 시각 기준 (UTC 시각은 1시간 달라짐)
+    assert CME.next_close(chicago("2026-11-02 10:00")).tz_convert("UTC") == pd.Timestamp("2026-11-02 22:00", tz="UTC")
+    assert CME.next_close(chicago("2026-10-30 10:00")).tz_convert("UTC") == pd.Timestamp("2026-10-30 21:00", tz="UTC")
+
+
+def test_schedule_sleeps_through_closed_market_and_wakes_at_close():
+    schedule = SessionSchedule(KRX, interval_seconds=60, max_sleep_seconds=7 * 24 * 3600)
+
+    # 장중: 1분 주기, 마감 직전에는 마감 시각에 맞춰 깨어남
+    assert schedule.should_run(kst("2026-10-16 10:00"))
+    assert schedule.seconds_until_next(kst("2026-10-16 10:00")) == 60
+    assert schedule.seconds_until_next(kst("2026-10-16 15:44:30")) == 30
+    # 마감 직후 한 번은 실행(마지막 봉), 그 뒤로는 월요일 08:45까지 잠듦
+    assert schedule.should_run(kst("2026-10-16 15:45"))
+    assert not schedule.should_run(kst("2026-10-16 15:46"))
+    assert schedule.seconds_until_next(kst("2026-10-16 15:45")) == (kst("2026-10-19 08:45") - kst("2026-10-16 15:45")).total_seconds()
+
+    # 재생 속도 60배: 시장 시각 1시간 = 실제 60초, 장중 주기는 시장 시각 기준 60분
+    fast = SessionSchedule(KRX, interval_seconds=1, speed=60)
+    assert fast.seconds_until_next(kst("2026-10-16 08:00")) == 45
+    assert fast.seconds_until_next(kst("2026-10-16 10:00")) == 1
+    # 잠드는 시간은 max_sleep_seconds로 제한
+    assert SessionSchedule(KRX).seconds_until_next(kst("2026-10-17 10:00")) == 3600
+
+
+def test_holiday_table_past_its_last_year_warns_once_per_year(caplog):
+    assert KRX.holidays_until == 2026 and CME.holidays_until == 2026
+    with caplog.at_level(logging.WARNING, logger="market_calendar"):
+        assert KRX.is_trading_day(date(2026, 10, 16))
+        assert not caplog.records
+        assert KRX.is_trading_day(date(2099, 1, 5))
+        assert KRX.is_trading_day(date(2099, 1, 6))
+    assert [r.getMessage() for r in caplog.records] == [
+        "KRX holiday table ends in 2026; treating every weekday of 2099 as a trading day"]
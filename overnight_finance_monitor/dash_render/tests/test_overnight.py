@@ -0,0 +1,54 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from overnight import overnight_gaps
+
+
+def make_series():
+    index = pd.date_range("2026-10-12 00:00", "2026-10-16 00:00", freq="1min", tz="UTC")
+    return pd.Series(np.arange(len(index), dtype=float), index=index)
+
+
+def legacy_loop(close_prices):
+    """plot_sp500_futures.py의 기존 날짜별 반복 계산 (정확한 분봉이 있을 때만)"""
+    close_prices = close_prices.copy()
+    close_prices.index = close_prices.index.tz_convert('Asia/Seoul')
+    unique_days = sorted(pd.Series(close_prices.index.date).unique())
+    result = {}
+    for day, next_day in zip(unique_days, unique_days[1:]):
+        kst_1530 = pd.Timestamp(year=day.year, month=day.month, day=day.day, hour=15, minute=30, tz='Asia/Seoul')
+        kst_0900 = pd.Timestamp(year=next_day.year, month=next_day.month, day=next_day.day, hour=9, tz='Asia/Seoul')
+        if kst_1530 in close_prices.index and kst_0900 in close_prices.index:
+            result[kst_1530] = close_prices.loc[kst_0900] - close_prices.loc[kst_1530]
+    return result
+
+
+def test_matches_legacy_loop_when_minutes_are_complete():
+    series = make_series()
+    gaps = overnight_gaps(series)
+    expected = legacy_loop(series)
+    assert list(gaps.index) == list(expected)
+    assert np.allclose(gaps['change'].to_numpy(), list(expected.values()))
+
+
+def test_missing_minutes_use_nearby_bars_within_tolerance():
+    series = make_series()
+    # 10/13 15:30 KST(06:30 UTC)와 10/14 09:00 KST(10/14 00:00 UTC) 분봉이 빠진 경우
+    missing = [pd.Timestamp("2026-10-13 06:30", tz="UTC"), pd.Timestamp("2026-10-14 00:00", tz="UTC")]
+    gaps = overnight_gaps(series.drop(missing))
+    row = gaps.loc[pd.Timestamp("2026-10-13 15:30", tz="Asia/Seoul")]
+    assert row['close_price'] == series[pd.Timestamp("2026-10-13 06:29", tz="UTC")]
+    assert row['open_price'] == series[pd.Timestamp("2026-10-14 00:01", tz="UTC")]
+
+    # tolerance보다 긴 공백이면 해당 구간은 제외됩니다.
+    hole = series.drop(series.loc["2026-10-13 06:00":"2026-10-13 06:40"].index)
+    assert pd.Timestamp("2026-10-13 15:30", tz="Asia/Seoul") not in overnight_gaps(hole).index
+    assert len(legacy_loop(series.drop(missing))) == len(gaps) - 1
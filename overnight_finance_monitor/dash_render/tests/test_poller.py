@@ -0,0 +1,79 @@
+import sys
+import os
+import threading
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from poller import BackgroundPoller
+
+
+def test_start_is_idempotent_and_job_errors_do_not_kill_thread():
+    calls = []
+    ran_twice = threading.Event()
+
+    def job():
+        calls.append(1)
+        if len(calls) >= 2:
+            ran_twice.set()
+        raise RuntimeError("upstream failure")
+
+    poller = BackgroundPoller(job, interval_seconds=0.01)
+    poller.start()
+    first_thread = poller._thread
+    poller.start()
+    assert poller._thread is first_thread
+
+    assert ran_twice.wait(2)
+    assert poller.running
+    poller.stop(timeout=2)
+    assert not poller.running
+
+
+def test_schedule_skips_job_while_market_is_closed():
+    calls = []
+    checked = threading.Event()
+
+    class ClosedMarket:
+        def __init__(self):
+            self.checks = 0
+
+        def should_run(self):
+            self.checks += 1
+            if self.checks >= 3:
+                checked.set()
+            return False
+
+        def seconds_until_next(self):
+            return 0.01
+
+    poller = BackgroundPoller(lambda: calls.append(1), interval_seconds=0.01, schedule=ClosedMarket())
+    poller.start()
+    assert checked.wait(2)
+    poller.stop(timeout=2)
+    assert calls == []
+
+
+def test_heartbeat_gets_the_sleep_even_when_the_job_is_skipped():
+    slept = []
+    beat = threading.Event()
+
+    class ClosedMarket:
+        def should_run(self):
+            return False
+
+        def seconds_until_next(self):
+            return 0.01
+
+    def heartbeat(seconds):
+        slept.append(seconds)
+        if len(slept) >= 2:
+            beat.set()
+
+    poller = BackgroundPoller(lambda: None, interval_seconds=1, schedule=ClosedMarket(), heartbeat=heartbeat)
+    poller.start()
+    assert beat.wait(2)
+    poller.stop(timeout=2)
+    assert set(slept) == {0.01}
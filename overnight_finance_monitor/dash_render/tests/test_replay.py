@@ -0,0 +1,93 @@
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from bar_cache import BarCache
+from replay import ReplayEngine
+from shared_store import SQLiteStore
+from conftest import FakeDownloader
+
+START = datetime(2026, 10, 16, 12, 0, 30, tzinfo=timezone.utc)
+
+
+def test_replay_serves_ticks_from_the_shared_cache():
+    downloader = FakeDownloader()
+    cache = BarCache(downloader=downloader)
+    engine = ReplayEngine(cache=cache)
+
+    points = []
+    for i in range(90):
+        downloader.now = START + timedelta(minutes=i)
+        points.append(engine.next_point(downloader.now))
+
+    # T-48h ~ 현재 구간은 첫 조회 때 한 번에 받아두므로 재생 중에는 다시 받지 않습니다.
+    assert len(downloader.calls) == 1
+    assert points[0] == {"Time": "2026-10-14 12:00", "Price": 0.0}
+    assert points[89] == {"Time": "2026-10-14 13:29", "Price": 29.0}
+    assert len({p["Time"] for p in points}) == 90
+    # 같은 캐시를 쓰는 다른 조회도 그대로 메모리에서 처리됩니다.
+    assert cache.lookup("ES=F", START - timedelta(hours=30), now=START) is not None
+
+
+def test_speed_multiplier_replays_faster_and_uses_tail_refresh_at_real_time():
+    downloader = FakeDownloader()
+    engine = ReplayEngine(delay=timedelta(hours=1), speed=60, cache=BarCache(downloader=downloader))
+    assert engine.tick_seconds() == 1
+
+    # 1초 tick마다 1분봉 하나씩: 60초 뒤에는 재생 시각이 현재에 닿습니다.
+    points = []
+    for i in range(180):
+        downloader.now = START + timedelta(seconds=i)
+        points.append(engine.next_point(downloader.now))
+
+    assert [p["Time"] for p in points[:3]] == ["2026-10-16 11:00", "2026-10-16 11:01", "2026-10-16 11:02"]
+    assert points[-1]["Time"] == "2026-10-16 12:02"
+    # 처음 한 번 + 현재에 닿은 뒤 refresh_seconds(60초)마다 꼬리만 보충 (tick마다 다시 받지 않음)
+    assert len(downloader.calls) == 3
+    assert [pd.Timestamp(start) for start, _ in downloader.calls[1:]] == [
+        pd.Timestamp("2026-10-16 12:00", tz="UTC"), pd.Timestamp("2026-10-16 12:01", tz="UTC")]
+
+
+def test_replay_clock_is_shared_through_the_store(tmp_path):
+    path = str(tmp_path / "store.db")
+    downloader = FakeDownloader(START + timedelta(minutes=30))
+    first = ReplayEngine(speed=60, cache=BarCache(downloader=downloader), store=SQLiteStore(path))
+    first.replay_time(START)
+
+    # 나중에 리더가 된 워커도 처음 워커의 시작 시각부터 이어서 재생합니다.
+    second = ReplayEngine(speed=60, cache=BarCache(downloader=downloader), store=SQLiteStore(path))
+    later = START + timedelta(seconds=30)
+    assert second.replay_time(later) == first.replay_time(later)
+    assert second.replay_time(later) == pd.Timestamp(START - timedelta(hours=48) + timedelta(minutes=30))
+
+
+def test_restart_with_a_fresh_leader_lease_restarts_the_replay_clock(tmp_path):
+    path = str(tmp_path / "store.db")
+    downloader = FakeDownloader(START + timedelta(minutes=30))
+    old = ReplayEngine(speed=60, cache=BarCache(downloader=downloader), store=SQLiteStore(path))
+    old_store = SQLiteStore(path)
+    assert old_store.try_acquire_leader("old", ttl_seconds=60, reset_keys=(old.settings_key,))
+    old.replay_time(START)
+    # lease를 연장하는 동안에는 시작 시각이 유지됨
+    assert old_store.try_acquire_leader("old", ttl_seconds=-1, reset_keys=(old.settings_key,))
+
+    # 재시작: 이전 lease가 만료된 뒤 처음 리더가 된 워커가 시작 시각을 지우고 지금부터 다시 재생
+    restarted = START + timedelta(hours=5)
+    new = ReplayEngine(speed=60, cache=BarCache(downloader=downloader), store=SQLiteStore(path))
+    assert SQLiteStore(path).try_acquire_leader("new", ttl_seconds=60, reset_keys=(new.settings_key,))
+    assert new.replay_time(restarted) == pd.Timestamp(restarted - timedelta(hours=48))
+    # 메모리에 캐시하지 않으므로 이전 엔진(다른 워커)도 새 시계를 따름
+    assert old.replay_time(restarted) == new.replay_time(restarted)
+
+
+def test_invalid_speed_is_rejected():
+    with pytest.raises(ValueError):
+        ReplayEngine(speed=0)
@@ -0,0 +1,84 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from resampler import Resampler, resample_frame
+
+
+def make_minute_bars(periods=600, start="2026-10-15 22:13"):
+    index = pd.date_range(start, periods=periods, freq="1min", tz="UTC")
+    rng = np.random.default_rng(1)
+    close = 5000 + np.cumsum(rng.normal(0, 1, periods))
+    open_ = close + rng.normal(0, 0.5, periods)
+    return pd.DataFrame({'Open': open_, 'High': np.maximum(open_, close) + 0.25, 'Low': np.minimum(open_, close) - 0.25,
+                         'Close': close, 'Volume': rng.integers(0, 100, periods)}, index=index)
+
+
+def test_one_pass_matches_pandas_resample_for_every_interval():
+    bars = make_minute_bars()
+    bars = bars.drop(bars.index[100:140])  # 중간에 빈 구간
+
+    frames = resample_frame(bars, intervals=("1m", "5m", "30m", "1h"))
+
+    for name, rule in (("1m", "1min"), ("5m", "5min"), ("30m", "30min"), ("1h", "1h")):
+        expected = bars.resample(rule).agg({'Open': 'first', 'High': 'max', 'Low': 'min',
+                                            'Close': 'last', 'Volume': 'sum'}).dropna()
+        result = frames[name]
+        assert result.index.equals(expected.index)
+        np.testing.assert_allclose(result[['Open', 'High', 'Low', 'Close']].to_numpy(),
+                                   expected[['Open', 'High', 'Low', 'Close']].to_numpy())
+        assert (result['Volume'].to_numpy() == expected['Volume'].to_numpy()).all()
+
+
+def test_incremental_updates_emit_completed_bars_and_keep_one_partial_per_interval():
+    resampler = Resampler(("1m", "5m"))
+    base = pd.Timestamp("2026-10-16 00:00", tz="UTC").value
+    second = 10 ** 9
+
+    # 체결 입력: open=high=low=close=가격
+    assert resampler.update(base + 10 * second, 10.0, 10.0, 10.0, 10.0, 1) == []
+    assert resampler.update(base + 50 * second, 12.0, 12.0, 12.0, 12.0, 2) == []
+    completed = resampler.update(base + 70 * second, 11.0, 11.0, 11.0, 11.0, 3)
+    assert completed == [("1m", (base, 10.0, 12.0, 10.0, 12.0, 3))]
+    assert resampler.partial("5m") == (base, 10.0, 12.0, 10.0, 11.0, 6)
+
+    # 이미 닫힌 분의 늦은 입력은 1m에는 반영하지 않음 (5m 봉은 아직 진행 중이므로 반영)
+    resampler.update(base + 30 * second, 20.0, 20.0, 20.0, 20.0, 1)
+    assert resampler.late == 1
+    assert resampler.partial("5m")[2] == 20.0
+
+    completed = resampler.update(base + 301 * second, 9.0, 9.0, 9.0, 9.0, 1)
+    assert [name for name, _ in completed] == ["1m", "5m"]
+    assert len(resampler.flush()) == 2
+    assert resampler.partial("1m") is None
+
+
+def test_partial_last_bar_can_be_excluded():
+    bars = make_minute_bars(periods=45, start="2026-10-16 00:00")
+    assert len(resample_frame(bars, intervals=("30m",))["30m"]) == 2
+    assert len(resample_frame(bars, intervals=("30m",), include_partial=False)["30m"]) == 1
+    assert resample_frame(pd.DataFrame(), intervals=("5m",))["5m"].empty
+
+
+def test_roll_completes_ended_bars_without_new_input_and_rejects_late_ones():
+    resampler = Resampler(("1m", "5m"))
+    base = pd.Timestamp("2026-10-16 00:00", tz="UTC").value
+    second = 10 ** 9
+
+    resampler.update(base + 10 * second, 10.0, 10.0, 10.0, 10.0, 1)
+    assert resampler.roll(base + 59 * second) == []
+    assert resampler.roll(base + 60 * second) == [("1m", (base, 10.0, 10.0, 10.0, 10.0, 1))]
+    assert resampler.partial("1m") is None
+
+    # 진행 중인 봉이 없어도 이미 완성된 분의 입력은 늦은 것으로 봄
+    assert resampler.update(base + 20 * second, 11.0, 11.0, 11.0, 11.0, 1) == []
+    assert resampler.late == 1
+    assert resampler.partial("1m") is None
+    assert resampler.partial("5m")[4] == 11.0
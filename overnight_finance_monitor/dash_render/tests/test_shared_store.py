@@ -0,0 +1,76 @@
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from bar_cache import BarCache
+from shared_store import SQLiteStore
+
+
+def test_only_one_worker_holds_the_leader_lease(tmp_path):
+    path = str(tmp_path / "store.db")
+    worker_a, worker_b = SQLiteStore(path), SQLiteStore(path)
+
+    assert worker_a.try_acquire_leader("a", ttl_seconds=60)
+    assert not worker_b.try_acquire_leader("b", ttl_seconds=60)
+    # 리더는 lease를 연장할 수 있고, 만료된 lease는 다른 워커가 이어받습니다.
+    assert worker_a.try_acquire_leader("a", ttl_seconds=-1)
+    assert worker_b.try_acquire_leader("b", ttl_seconds=60)
+    assert not worker_a.try_acquire_leader("a", ttl_seconds=60)
+
+
+def test_fresh_leader_lease_resets_run_scoped_settings(tmp_path):
+    path = str(tmp_path / "store.db")
+    worker_a, worker_b = SQLiteStore(path), SQLiteStore(path)
+    assert worker_a.try_acquire_leader("a", ttl_seconds=60, reset_keys=("run",))
+    assert worker_a.setdefault("run", "first") == "first"
+
+    # 연장하거나 다른 워커가 막혔을 때는 그대로
+    assert worker_a.try_acquire_leader("a", ttl_seconds=-1, reset_keys=("run",))
+    assert worker_a.setdefault("run", "second") == "first"
+
+    # 만료된 lease를 새로 얻으면(재시작) 지워짐
+    assert worker_b.try_acquire_leader("b", ttl_seconds=60, reset_keys=("run",))
+    assert worker_b.setdefault("run", "third") == "third"
+    assert not worker_a.try_acquire_leader("a", ttl_seconds=60, reset_keys=("run",))
+    assert worker_a.setdefault("run", "fourth") == "third"
+
+
+def test_history_is_shared_and_deduplicated(tmp_path):
+    path = str(tmp_path / "store.db")
+    writer, reader = SQLiteStore(path, history_limit=3), SQLiteStore(path, history_limit=3)
+
+    ids = [writer.append_history({"Time": f"2026-10-14 00:0{minute}", "Price": 100.0 + minute}) for minute in range(5)]
+    assert ids == sorted(ids) and None not in ids
+    assert writer.append_history({"Time": "2026-10-14 00:04", "Price": 0.0}) is None
+
+    rows = reader.history_since(0)
+    assert [row_id for row_id, _ in rows] == ids[2:]
+    assert [p["Time"] for _, p in rows] == ["2026-10-14 00:02", "2026-10-14 00:03", "2026-10-14 00:04"]
+    assert reader.history_since(rows[-1][0]) == []
+
+
+def test_bar_cache_resumes_from_stored_bars(tmp_path):
+    path = str(tmp_path / "store.db")
+    now = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+    calls = []
+
+    def downloader(ticker, interval, start, end=None):
+        calls.append(start)
+        index = pd.date_range(pd.Timestamp(start).ceil('min'), pd.Timestamp(end or now), freq='1min', inclusive='left')
+        return pd.DataFrame({'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 10.0}, index=index)
+
+    target = now - timedelta(hours=48)
+    first = BarCache(downloader=downloader, store=SQLiteStore(path))
+    expected = first.lookup("ES=F", target, now=now)
+
+    # 리더가 바뀌어 새 프로세스의 캐시가 만들어져도 저장된 봉으로 바로 응답합니다.
+    second = BarCache(downloader=downloader, store=SQLiteStore(path))
+    assert second.lookup("ES=F", target, now=now)[0] == expected[0]
+    assert len(calls) == 1
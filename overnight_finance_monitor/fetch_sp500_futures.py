@@ -1,20 +1,38 @@
 import yfinance as yf
+import os
+import sys
+
+# dash_render의 데이터 모듈(Parquet 보관소 등)을 함께 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dash_render'))
+from bar_archive import BarArchive
+from resampler import resample_frame
 
 def fetch_sp500_futures():
     """
     S&P 500 선물(ES=F) 데이터를 30분 단위로 가져옵니다.
     period='2d': 최근 2일치 데이터를 가져와서 24시간 범위를 포함하도록 합니다.
-    interval='30m': 30분 단위 (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h 등 가능)
+    1분봉을 한 번만 받고, 30분봉은 그 1분봉에서 만듭니다. (주기별로 따로 다운로드하지 않음)
     """
-    print("S&P 500 선물(ES=F) 30분 단위 데이터를 불러오는 중...")
+    print("S&P 500 선물(ES=F) 1분봉을 받아 30분 단위 데이터를 만드는 중...")
     
-    # 데이터 다운로드
-    data = yf.download("ES=F", period="2d", interval="30m")
+    # 데이터 다운로드 (1분봉 한 번)
+    minute_data = yf.download("ES=F", period="2d", interval="1m")
     
-    if data.empty:
+    if minute_data.empty:
         print("데이터를 불러오지 못했습니다. 티커(ES=F) 또는 네트워크 연결을 확인하세요.")
         return None
 
+    # 1분봉 한 번 훑기로 30분봉 생성 (다른 주기가 필요하면 intervals에 추가)
+    data = resample_frame(minute_data, intervals=("30m",))["30m"]
+    # resample_frame은 UTC 인덱스를 반환하므로 yfinance가 준 시간대(거래소 기준)로 되돌립니다.
+    if minute_data.index.tz is not None:
+        data.index = data.index.tz_convert(minute_data.index.tz)
+
+    # 받아온 1분봉과 만든 30분봉을 보관소에 추가
+    archive = BarArchive()
+    archive.append("ES=F", minute_data, "1m")
+    archive.append("ES=F", data, "30m")
+
     # 최근 24시간 데이터 (30분 단위 기준 약 48개 행) 출력
     print("\n[최근 데이터 확인]")
     print(data.tail(48))
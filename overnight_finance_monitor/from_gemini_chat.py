@@ -1,5 +1,6 @@
 import mojito
 import pandas as pd
+from multi_fetch import MultiFetcher
 
 def load_kis_api_info(filepath):
     """KIS API 정보를 외부 파일에서 읽어옵니다."""
@@ -78,27 +79,26 @@ symbols_to_try = [
     "101S3000",  # 코스피200 선물 근월물
 ]
 
+def has_valid_prices(futures_df):
+    """가격(stck_prpr 또는 futs_prpr)이 0보다 큰 분봉이 하나라도 있는지 확인합니다."""
+    if futures_df is None or len(futures_df) == 0:
+        return False
+    for price_col in ('stck_prpr', 'futs_prpr'):
+        if price_col in futures_df.columns:
+            return (pd.to_numeric(futures_df[price_col], errors='coerce') > 0).any()
+    return False
+
 print("\n=== 코스피200 선물 분봉 데이터 조회 테스트 ===")
 
-for symbol in symbols_to_try:
-    print(f"\n{'='*50}")
-    futures_df = get_kospi200_futures_minute_data(symbol)
-    
-    if futures_df is not None and len(futures_df) > 0:
-        # 가격이 유효한 데이터가 있는지 확인
-        if 'stck_prpr' in futures_df.columns:
-            futures_df['close'] = pd.to_numeric(futures_df['stck_prpr'], errors='coerce')
-            valid_data = futures_df[futures_df['close'] > 0]
-            if len(valid_data) > 0:
-                print(f"\n[SUCCESS] {symbol}: 유효한 데이터 {len(valid_data)}개 발견!")
-                print(valid_data.head(10))
-                break
-            else:
-                print(f"[INFO] {symbol}: 데이터는 있지만 가격이 모두 0")
-        elif 'futs_prpr' in futures_df.columns:
-            futures_df['close'] = pd.to_numeric(futures_df['futs_prpr'], errors='coerce')
-            valid_data = futures_df[futures_df['close'] > 0]
-            if len(valid_data) > 0:
-                print(f"\n[SUCCESS] {symbol}: 유효한 데이터 {len(valid_data)}개 발견!")
-                print(valid_data.head(10))
-                break
+# 후보 종목코드를 동시에 조회하고, 목록 순서상 가장 앞선 유효한 결과를 사용합니다.
+symbol, futures_df = MultiFetcher().fetch_first(
+    symbols_to_try, get_kospi200_futures_minute_data, is_valid=has_valid_prices)
+
+if symbol is not None:
+    price_col = 'stck_prpr' if 'stck_prpr' in futures_df.columns else 'futs_prpr'
+    futures_df['close'] = pd.to_numeric(futures_df[price_col], errors='coerce')
+    valid_data = futures_df[futures_df['close'] > 0]
+    print(f"\n[SUCCESS] {symbol}: 유효한 데이터 {len(valid_data)}개 발견!")
+    print(valid_data.head(10))
+else:
+    print("[INFO] 모든 후보 종목코드에서 유효한 가격 데이터를 찾지 못했습니다.")
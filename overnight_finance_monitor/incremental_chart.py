@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+
+
+def to_date_num(index):
+    """tz-aware DatetimeIndex를 matplotlib 날짜 숫자(1970-01-01 기준 일수, UTC)로 벡터 변환합니다."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return mdates.date2num(index.values)
+
+
+class IncrementalChart:
+    """
+    한 번 만든 Figure/Line 객체를 계속 재사용하는 분봉 차트입니다.
+
+    - update: 마지막으로 그린 시각 이후의 봉만 라인 데이터에 덧붙입니다. (형성 중인 마지막 봉은 값만 교체)
+    - max_points: 최근 봉 max_points개만 남기고 그보다 오래된 봉과 장식은 지웁니다. (--watch로 오래 돌려도 메모리 일정)
+    - add_gaps / add_session_markers: 오버나이트 음영, 09:00/15:30 수직선 같은 장식은 처음 보는 것만 추가합니다.
+      텍스트 y 위치는 축 비율(axes fraction) 좌표를 쓰므로 y축 범위가 바뀌어도 다시 계산할 필요가 없습니다.
+    - save: 마지막 저장 이후 바뀐 내용이 있을 때만 PNG를 다시 씁니다.
+    """
+
+    def __init__(self, output_file, title, label, color, tz='Asia/Seoul', xlabel='Time (KST)',
+                 grid_alpha=None, figsize=(15, 8), max_points=None):
+        self.output_file = output_file
+        self.tz = tz
+        self.max_points = max_points
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        self.line, = self.ax.plot([], [], label=label, color=color, linewidth=1)
+        self.ax.xaxis_date(tz=tz)
+        self.ax.set_title(title)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel('Price')
+        self.ax.legend()
+        if grid_alpha is None:
+            self.ax.grid(True)
+        else:
+            self.ax.grid(True, alpha=grid_alpha)
+
+        self._x = np.array([], dtype=np.float64)
+        self._y = np.array([], dtype=np.float64)
+        self._gap_artists = {}  # 시각 -> 그 장식의 artist 목록 (max_points 밖으로 밀려나면 함께 지움)
+        self._marker_artists = {}
+        self._dirty = True
+
+    def __len__(self):
+        return len(self._x)
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    def update(self, series):
+        """
+        series(DatetimeIndex 가격 시리즈)에서 새 봉만 라인에 반영하고, 새로 추가된 봉 개수를 반환합니다.
+        이미 그린 구간과 겹치는 부분은 값이 달라진 경우에만 교체합니다.
+        """
+        series = series.dropna().sort_index()
+        if series.empty:
+            return 0
+        x_new = to_date_num(series.index)
+        y_new = series.to_numpy(dtype=np.float64)
+
+        # 새 데이터의 첫 시각 이전까지는 그대로 두고, 그 이후만 교체
+        cut = np.searchsorted(self._x, x_new[0], side='left')
+        if np.array_equal(self._x[cut:], x_new) and np.array_equal(self._y[cut:], y_new):
+            return 0
+
+        old_len = len(self._x)
+        self._x = np.concatenate([self._x[:cut], x_new])
+        self._y = np.concatenate([self._y[:cut], y_new])
+        added = len(self._x) - old_len
+        if self.max_points is not None and len(self._x) > self.max_points:
+            self._trim(len(self._x) - self.max_points)
+        self.line.set_data(self._x, self._y)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self._dirty = True
+        return added
+
+    def _trim(self, start):
+        """앞쪽 start개 봉과, 남은 첫 봉보다 이른 장식을 지웁니다."""
+        self._x, self._y = self._x[start:], self._y[start:]
+        cutoff_time = pd.Timestamp(mdates.num2date(self._x[0]))
+        for keys in (self._gap_artists, self._marker_artists):
+            for key in [k for k in keys if k < cutoff_time]:
+                for artist in keys.pop(key):
+                    artist.remove()
+
+    def add_gaps(self, gaps, color='darkblue'):
+        """overnight_gaps() 결과 중 아직 그리지 않은 구간만 음영과 변동폭 텍스트로 추가합니다."""
+        transform = self.ax.get_xaxis_transform()
+        added = 0
+        for close_time, gap in gaps.iterrows():
+            if close_time in self._gap_artists:
+                continue
+            open_time = gap['open_time']
+
+            # 오버나이트 구간 음영 표시 (15:30 ~ 익일 09:00)
+            span = self.ax.axvspan(close_time, open_time, color='gray', alpha=0.1)
+
+            # 변동폭 텍스트 표시 (x: 데이터 좌표, y: 축 높이의 10% 지점)
+            mid_point = close_time + (open_time - close_time) / 2
+            text = self.ax.text(mid_point, 0.1, f'Overnight: {gap["change"]:+.2f} ({gap["pct_change"]:+.2f}%)',
+                                transform=transform, color=color, fontweight='bold', horizontalalignment='center')
+            self._gap_artists[close_time] = (span, text)
+            added += 1
+        if added:
+            self._dirty = True
+        return added
+
+    def add_session_markers(self, index, markers=(("09:00", "red"), ("15:30", "green"))):
+        """index 중 markers 시각(현지 시간)에 해당하는 봉 위치에 수직선과 라벨을 추가합니다."""
+        local = pd.DatetimeIndex(index).tz_convert(self.tz)
+        minutes = local.hour * 60 + local.minute
+        transform = self.ax.get_xaxis_transform()
+        added = 0
+        for hhmm, color in markers:
+            hour, minute = map(int, hhmm.split(':'))
+            for ts in local[(minutes == hour * 60 + minute) & (local.second == 0)]:
+                if ts in self._marker_artists:
+                    continue
+                line = self.ax.axvline(x=ts, color=color, linestyle='--', alpha=0.6)
+                text = self.ax.text(ts, 1.0, f' {hhmm}', transform=transform, color=color,
+                                    verticalalignment='bottom', rotation=90)
+                self._marker_artists[ts] = (line, text)
+                added += 1
+        if added:
+            self._dirty = True
+        return added
+
+    def save(self, force=False):
+        """바뀐 내용이 있을 때만 파일로 저장하고, 저장했는지 여부를 반환합니다."""
+        if not (self._dirty or force):
+            return False
+        self.figure.savefig(self.output_file)
+        self._dirty = False
+        return True
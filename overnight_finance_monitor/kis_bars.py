@@ -0,0 +1,157 @@
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+# KIS 분봉 응답(output2)의 가격 필드 이름
+# - 선물 REST(inquire-time-futuroptprice): futs_*
+# - mojito fetch_today_1m_ohlcv 등 주식형 응답: stck_*
+PRICE_FIELDS = {
+    'futs': {'open': 'futs_oprc', 'high': 'futs_hgpr', 'low': 'futs_lwpr', 'close': 'futs_prpr'},
+    'stck': {'open': 'stck_oprc', 'high': 'stck_hgpr', 'low': 'stck_lwpr', 'close': 'stck_prpr'},
+}
+VOLUME_FIELD = 'cntg_vol'
+
+KST_OFFSET_NS = 9 * 3600 * 10**9
+
+
+class OHLCVBars:
+    """
+    KIS 봉(분봉, 실시간 체결로 만든 5m/30m/1h 봉 등)을 열(column)별 NumPy 배열로 보관하는 구조입니다.
+
+    ts: int64 epoch ns (UTC), open/high/low/close: float64, volume: int64
+    문자열(object) 컬럼 DataFrame을 거치지 않으므로 여러 날치 데이터도 메모리를 적게 씁니다.
+    """
+
+    __slots__ = ('ts', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, ts, open, high, low, close, volume):
+        self.ts = ts
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __len__(self):
+        return len(self.ts)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """(ts, open, high, low, close, volume) 튜플 목록으로 만듭니다."""
+        columns = list(zip(*rows)) or [()] * 6
+        return cls(np.array(columns[0], dtype=np.int64),
+                   *(np.array(c, dtype=np.float64) for c in columns[1:5]),
+                   np.array(columns[5], dtype=np.int64))
+
+    def take(self, positions):
+        """positions(정수 배열 또는 불리언 마스크)에 해당하는 봉만 골라 새 OHLCVBars로 반환합니다."""
+        return OHLCVBars(*(getattr(self, name)[positions] for name in self.__slots__))
+
+    def valid(self):
+        """가격이 0보다 큰 봉만 남깁니다. (장 시작 전/체결 없는 분은 0으로 내려옴)"""
+        return self.take(self.close > 0)
+
+    def sorted_unique(self):
+        """같은 시각은 하나만 남기고 시간순으로 정렬합니다."""
+        _, positions = np.unique(self.ts, return_index=True)
+        return self.take(positions)
+
+    def to_frame(self):
+        """
+        기존 스크립트와 같은 형태의 DataFrame으로 변환합니다.
+        time 컬럼은 차트에 그대로 쓰도록 KST 기준 naive datetime입니다.
+        """
+        return pd.DataFrame({
+            'time': pd.to_datetime(self.ts + KST_OFFSET_NS, unit='ns'),
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume,
+        })
+
+
+def _column(records, field, dtype):
+    """레코드 목록에서 한 필드를 꺼내 dtype 배열로 변환합니다. (빈 문자열 등은 0)"""
+    raw = np.asarray(list(map(itemgetter(field), records)))
+    try:
+        return raw.astype(dtype)
+    except ValueError:
+        # 빈 문자열이 섞인 경우에만 느린 경로로 변환합니다.
+        values = pd.to_numeric(raw, errors='coerce').astype(np.float64)
+        return np.nan_to_num(values, nan=0.0).astype(dtype)
+
+
+def _digits(values):
+    """숫자 문자열(또는 정수) 배열을 int64 배열로 변환합니다. (앞자리 0이 빠진 값도 그대로 처리)"""
+    return np.asarray(values).astype(np.int64)
+
+
+def days_from_civil(year, month, day):
+    """
+    그레고리력 날짜 배열을 1970-01-01 기준 일수(int64)로 변환합니다.
+    (Howard Hinnant의 days_from_civil 알고리즘, 정수 연산만 사용)
+    """
+    year = year - (month <= 2)
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def decode_kis_timestamps(dates, hours):
+    """
+    stck_bsop_date(YYYYMMDD) + stck_cntg_hour(HHMMSS) 배열을 UTC epoch ns(int64)로 변환합니다.
+    문자열 결합이나 strptime 없이 자릿수 정수 연산으로만 계산합니다. (KST = UTC+9, 서머타임 없음)
+    """
+    year, month_day = np.divmod(_digits(dates), 10000)
+    month, day = np.divmod(month_day, 100)
+    hour, minute_second = np.divmod(_digits(hours), 10000)
+    minute, second = np.divmod(minute_second, 100)
+    seconds = days_from_civil(year, month, day) * 86400 + hour * 3600 + minute * 60 + second
+    return seconds * 10**9 - KST_OFFSET_NS
+
+
+def decode_kst_datetimes(dates, hours):
+    """decode_kis_timestamps 결과를 Asia/Seoul tz-aware DatetimeIndex로 반환합니다."""
+    return pd.DatetimeIndex(decode_kis_timestamps(dates, hours), tz='UTC').tz_convert('Asia/Seoul')
+
+
+def parse_output2(records, date=None):
+    """
+    KIS 분봉 응답의 output2(레코드 목록)를 OHLCVBars로 바로 변환합니다.
+    stck_bsop_date가 없는 응답이면 date(YYYYMMDD, 기본: 오늘)를 사용합니다.
+    """
+    if not records:
+        empty_f = np.array([], dtype=np.float64)
+        return OHLCVBars(np.array([], dtype=np.int64), empty_f, empty_f, empty_f, empty_f, np.array([], dtype=np.int64))
+
+    first = records[0]
+    if 'futs_prpr' in first:
+        fields = PRICE_FIELDS['futs']
+    elif 'stck_prpr' in first:
+        fields = PRICE_FIELDS['stck']
+    else:
+        raise ValueError(f"가격 필드를 찾을 수 없습니다: {sorted(first)}")
+
+    hours = list(map(itemgetter('stck_cntg_hour'), records))
+    if 'stck_bsop_date' in first:
+        dates = list(map(itemgetter('stck_bsop_date'), records))
+    else:
+        dates = [date or pd.Timestamp.now(tz='Asia/Seoul').strftime('%Y%m%d')] * len(records)
+
+    # 시가/고가/저가가 없는 응답이면 현재가로 대신합니다.
+    close = _column(records, fields['close'], np.float64)
+    prices = {name: _column(records, field, np.float64) if field in first else close
+              for name, field in fields.items() if name != 'close'}
+
+    return OHLCVBars(
+        ts=decode_kis_timestamps(dates, hours),
+        open=prices['open'],
+        high=prices['high'],
+        low=prices['low'],
+        close=close,
+        volume=_column(records, VOLUME_FIELD, np.int64) if VOLUME_FIELD in first else np.zeros(len(records), dtype=np.int64),
+    )
@@ -0,0 +1,380 @@
+import os
+import sys
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# dash_render의 세션 시각을 함께 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dash_render'))
+from market_hours import KRX_FUTURES_OPEN
+
+REAL_BASE_URL = "https://openapi.koreainvestment.com:9443"
+MOCK_BASE_URL = "https://openapivts.koreainvestment.com:29443"
+
+API_INFO_PATH = r"C:\Users\hangs\OneDrive\GitRepositories_related_private_data\KIS_API_INFO.txt"
+
+# mojito가 쓰는 token.dat(pickle)과 겹치지 않도록 별도 파일에 저장합니다. (.gitignore: *.dat)
+TOKEN_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kis_token.dat")
+
+# 만료 직전 토큰으로 요청하지 않도록 이만큼 일찍 재발급합니다.
+TOKEN_REFRESH_MARGIN = 300
+
+# 초당 요청 한도 (실전 20건/초, 모의 2건/초)보다 약간 낮게 설정합니다.
+REAL_RATE_LIMIT = 18
+MOCK_RATE_LIMIT = 2
+
+# KIS 게이트웨이 오류 코드 (HTTP 500 응답 본문의 msg_cd로 옵니다)
+TOKEN_EXPIRED_CODE = "EGW00123"  # 기간이 만료된 token
+RATE_LIMITED_CODE = "EGW00201"   # 초당 거래건수 초과
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 0.5
+
+# 코스피200 선물 정규장 시작 시각 (HHMMSS, market_calendar의 KRX 세션과 같은 값)
+DAY_SESSION_START = KRX_FUTURES_OPEN.replace(':', '') + "00"
+
+
+def load_kis_api_info(filepath):
+    """KIS API 정보를 외부 파일에서 읽어옵니다."""
+    api_info = {}
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and '\t' in line:
+                key, value = line.split('\t', 1)
+                api_info[key] = value
+    return api_info
+
+
+def hhmmss_to_seconds(hhmmss):
+    hhmmss = str(hhmmss).zfill(6)
+    return int(hhmmss[:2]) * 3600 + int(hhmmss[2:4]) * 60 + int(hhmmss[4:])
+
+
+def seconds_to_hhmmss(seconds):
+    return f"{seconds // 3600:02d}{seconds % 3600 // 60:02d}{seconds % 60:02d}"
+
+
+class RateLimiter:
+    """
+    토큰 버킷 방식의 요청 속도 제한기입니다. (여러 스레드에서 공유 가능)
+    rate: 초당 채워지는 토큰 수, capacity: 한 번에 몰아 쓸 수 있는 최대 토큰 수
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 기다립니다."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# 초당 한도는 앱키(계정) 단위이므로 같은 서버로 가는 요청은 프로세스 전체가 한 버킷을 함께 씁니다.
+_SHARED_RATE_LIMITERS = {False: RateLimiter(REAL_RATE_LIMIT), True: RateLimiter(MOCK_RATE_LIMIT)}
+
+
+def shared_rate_limiter(is_mock=False):
+    """KISClient와 multi_fetch.MultiFetcher가 기본으로 함께 쓰는 실전/모의 서버별 RateLimiter"""
+    return _SHARED_RATE_LIMITERS[bool(is_mock)]
+
+
+class KISClient:
+    """
+    한국투자증권 REST API 클라이언트.
+
+    - Access Token을 파일(kis_token.dat)에 저장해 두고 만료 전까지 재사용합니다. (토큰 발급은 횟수 제한이 있음)
+    - 하나의 requests.Session(keep-alive, 커넥션 풀)을 공유하여 요청마다 TLS 연결을 새로 맺지 않습니다.
+    - 선물 현재가(inquire-price), 선물 분봉(inquire-time-futuroptprice) 조회를 메서드로 제공합니다.
+    - 모든 요청은 rate_limiter(토큰 버킷)를 거치므로 여러 스레드에서 동시에 호출해도 초당 한도를 넘지 않습니다.
+    """
+
+    def __init__(self, app_key, app_secret, is_mock=False, base_url=None, token_path=TOKEN_CACHE_PATH,
+                 pool_maxsize=10, timeout=10, rate_limiter=None):
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.base_url = base_url or (MOCK_BASE_URL if is_mock else REAL_BASE_URL)
+        self.token_path = token_path
+        self.timeout = timeout
+        self._token = None
+        self._token_expires_at = 0
+        self._token_lock = threading.Lock()
+        self.rate_limiter = rate_limiter or shared_rate_limiter(is_mock)
+
+        self.session = requests.Session()
+        # 500은 KIS가 EGW 오류(토큰 만료, 초당 한도 초과)를 돌려주는 코드이므로 재시도하지 않고 get()이 직접 처리합니다.
+        # raise_on_status=False: 재시도를 다 써도 예외 대신 마지막 응답을 돌려받아 get()이 None을 반환합니다.
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], allowed_methods=["GET"],
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_api_info(cls, filepath=API_INFO_PATH, **kwargs):
+        """KIS_API_INFO.txt 형식의 파일에서 APP_KEY / APP_Secret을 읽어 클라이언트를 만듭니다."""
+        api_info = load_kis_api_info(filepath)
+        return cls(api_info.get('APP_KEY'), api_info.get('APP_Secret'), **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    # ------------------------------------------------------------------
+    # Access Token
+    # ------------------------------------------------------------------
+    def _token_cache_key(self):
+        return f"{self.base_url}|{self.app_key}"
+
+    def _load_cached_token(self):
+        if not self.token_path or not os.path.exists(self.token_path):
+            return None
+        try:
+            with open(self.token_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f).get(self._token_cache_key())
+        except (OSError, ValueError):
+            return None
+        if entry and entry['expires_at'] - TOKEN_REFRESH_MARGIN > time.time():
+            return entry
+        return None
+
+    def _save_cached_token(self):
+        if not self.token_path:
+            return
+        cache = {}
+        if os.path.exists(self.token_path):
+            try:
+                with open(self.token_path, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except (OSError, ValueError):
+                cache = {}
+        cache[self._token_cache_key()] = {"access_token": self._token, "expires_at": self._token_expires_at}
+        with open(self.token_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+
+    def get_access_token(self, force=False):
+        """메모리 → 파일 캐시 → 신규 발급 순으로 유효한 Access Token을 반환합니다. 실패 시 None."""
+        # 여러 스레드가 동시에 요청해도 토큰은 한 번만 발급되도록 잠급니다.
+        with self._token_lock:
+            return self._get_access_token(force)
+
+    def _get_access_token(self, force):
+        if not force and self._token and self._token_expires_at - TOKEN_REFRESH_MARGIN > time.time():
+            return self._token
+
+        if not force:
+            cached = self._load_cached_token()
+            if cached:
+                self._token, self._token_expires_at = cached['access_token'], cached['expires_at']
+                return self._token
+
+        body = {
+            "grant_type": "client_credentials",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret
+        }
+        res = self.session.post(f"{self.base_url}/oauth2/tokenP", headers={"content-type": "application/json"},
+                                json=body, timeout=self.timeout)
+        if res.status_code != 200:
+            print(f"[ERROR] Token 발급 실패: {res.text}")
+            return None
+
+        data = res.json()
+        self._token = data.get("access_token")
+        self._token_expires_at = time.time() + int(data.get("expires_in", 86400))
+        self._save_cached_token()
+        print("[OK] Access Token 발급 성공 (파일에 저장, 만료 전까지 재사용)")
+        return self._token
+
+    def get_approval_key(self):
+        """실시간 웹소켓 접속키(approval_key)를 발급받습니다. 실패 시 None. (kis_websocket.py에서 사용)"""
+        body = {
+            "grant_type": "client_credentials",
+            "appkey": self.app_key,
+            "secretkey": self.app_secret
+        }
+        res = self.session.post(f"{self.base_url}/oauth2/Approval", headers={"content-type": "application/json"},
+                                json=body, timeout=self.timeout)
+        if res.status_code != 200:
+            print(f"[ERROR] 웹소켓 접속키 발급 실패: {res.text}")
+            return None
+        return res.json().get("approval_key")
+
+    # ------------------------------------------------------------------
+    # 시세 조회
+    # ------------------------------------------------------------------
+    def get(self, path, tr_id, params):
+        """
+        GET 요청을 보내고 응답 JSON(dict)을 반환합니다. HTTP 오류면 None.
+        - 만료된 토큰(EGW00123) 응답을 받으면 한 번만 재발급 후 다시 요청합니다.
+        - 초당 거래건수 초과(EGW00201)면 조금씩 더 기다렸다가 RATE_LIMIT_RETRIES번까지 다시 요청합니다.
+        """
+        refreshed = False
+        throttled = 0
+        force = False
+        while True:
+            token = self.get_access_token(force=force)
+            if not token:
+                return None
+            headers = {
+                "content-type": "application/json; charset=utf-8",
+                "authorization": f"Bearer {token}",
+                "appkey": self.app_key,
+                "appsecret": self.app_secret,
+                "tr_id": tr_id,
+                "custtype": "P"  # 개인
+            }
+            self.rate_limiter.acquire()
+            res = self.session.get(f"{self.base_url}{path}", headers=headers, params=params, timeout=self.timeout)
+            try:
+                data = res.json()
+            except ValueError:
+                data = None
+            msg_cd = data.get('msg_cd') if isinstance(data, dict) else None
+
+            force = False
+            if msg_cd == TOKEN_EXPIRED_CODE and not refreshed:
+                refreshed = force = True
+                continue
+            if msg_cd == RATE_LIMITED_CODE and throttled < RATE_LIMIT_RETRIES:
+                throttled += 1
+                time.sleep(RATE_LIMIT_BACKOFF * throttled)
+                continue
+            if res.status_code != 200 or data is None:
+                print(f"[ERROR] HTTP {res.status_code}: {res.text[:200]}")
+                return None
+            return data
+
+    def inquire_price(self, symbol, market="F"):
+        """선물 현재가 조회 (tr_id: FHMIF10000000)"""
+        params = {
+            "FID_COND_MRKT_DIV_CODE": market,  # F: 선물
+            "FID_INPUT_ISCD": symbol
+        }
+        return self.get("/uapi/domestic-futureoption/v1/quotations/inquire-price", "FHMIF10000000", params)
+
+    def inquire_time_futuroptprice(self, symbol, hour=None, include_past="Y", market="F"):
+        """
+        선물 시간별 체결가(분봉) 조회 (tr_id: FHMIF10020000)
+        hour: 조회 기준 시각 HHMMSS (기본: 현재 시각). 이 시각 이전의 분봉이 최신순으로 한 페이지 반환됩니다.
+        """
+        params = {
+            "FID_COND_MRKT_DIV_CODE": market,  # F: 선물
+            "FID_INPUT_ISCD": symbol,
+            "FID_INPUT_HOUR_1": hour or datetime.now().strftime("%H%M%S"),
+            "FID_PW_DATA_INCU_YN": include_past  # 과거 데이터 포함
+        }
+        return self.get("/uapi/domestic-futureoption/v1/quotations/inquire-time-futuroptprice", "FHMIF10020000", params)
+
+    def fetch_minute_chart_day(self, symbol, session_start=DAY_SESSION_START, end_hour=None, max_workers=4,
+                               business_date=None, max_page_retries=2):
+        """
+        inquire-time-futuroptprice를 여러 페이지 조회하여 session_start ~ end_hour 구간의 분봉 전체를 반환합니다.
+
+        한 페이지는 기준 시각 이전 분봉 N개(최신순)이므로, 첫 페이지로 N을 알아낸 뒤
+        다음 기준 시각들을 (N-1)분 간격으로 미리 계산해 max_workers개씩 동시에 요청합니다.
+        (간격을 한 페이지보다 1분 짧게 잡아 페이지끼리 항상 겹치게 하고, 겹친 행은 중복 제거합니다.)
+        요청은 rate_limiter를 거치므로 KIS 초당 한도 안에서 최대한 빨리 끝납니다.
+
+        - business_date(YYYYMMDD, 기본: 첫 페이지의 영업일)의 행만 모읍니다. (세션 시작 이전 페이지에 섞여 오는 전일 분봉 제외)
+        - 같은 기준 시각의 조회가 max_page_retries번 넘게 실패하거나, 페이지가 더 이른 시각으로 나아가지 못하면
+          거기서 멈추고 그때까지 받은 행만 반환합니다.
+
+        반환: 오래된 순으로 정렬된 output2 행 목록. 첫 페이지 조회가 실패하면 None.
+        """
+        start_sec = hhmmss_to_seconds(session_start)
+        end_hour = end_hour or datetime.now().strftime("%H%M%S")
+
+        def fetch_page(cursor_sec):
+            data = self.inquire_time_futuroptprice(symbol, hour=seconds_to_hhmmss(cursor_sec))
+            if data is None or data.get('rt_cd') != '0':
+                return None
+            return [row for row in data.get('output2') or [] if row.get('stck_cntg_hour')]
+
+        rows_by_key = {}
+
+        def add_rows(rows):
+            """business_date의 행만 추가하고 (그중 가장 이른 시각(초), 다른 영업일 행이 섞여 있었는지)를 반환합니다."""
+            earliest, other_day = None, False
+            for row in rows:
+                date = row.get('stck_bsop_date') or business_date
+                if date != business_date:
+                    other_day = True
+                    continue
+                seconds = hhmmss_to_seconds(row['stck_cntg_hour'])
+                rows_by_key[(date, str(row['stck_cntg_hour']).zfill(6))] = row
+                earliest = seconds if earliest is None else min(earliest, seconds)
+            return earliest, other_day
+
+        def collected():
+            keys = sorted(k for k in rows_by_key if k[0] == business_date and hhmmss_to_seconds(k[1]) >= start_sec)
+            return [rows_by_key[k] for k in keys]
+
+        first = None
+        for _ in range(max_page_retries + 1):
+            first = fetch_page(hhmmss_to_seconds(end_hour))
+            if first is not None:
+                break
+        if first is None:
+            return None
+        if not first:
+            return []
+
+        business_date = business_date or max(row.get('stck_bsop_date', '') for row in first)
+        page_size = len(first)
+        earliest, other_day = add_rows(first)
+        if earliest is None or other_day:
+            return collected()
+        frontier = earliest  # frontier ~ end_hour 구간은 모두 확보됨
+        stride = max(page_size - 1, 1) * 60
+        failures = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while frontier > start_sec:
+                cursors = [frontier - 1 - i * stride for i in range(max_workers)]
+                cursors = [c for c in cursors if c >= start_sec] or [frontier - 1]
+                pages = list(executor.map(fetch_page, cursors))
+
+                previous = frontier
+                failed = reached_start = False
+                for cursor, rows in zip(cursors, pages):
+                    # 앞 페이지와 이어지지 않는 페이지가 나오면 그 지점부터 다음 묶음으로 다시 요청합니다.
+                    if cursor < frontier - 1:
+                        break
+                    if rows is None:
+                        failed = True
+                        failures[cursor] = failures.get(cursor, 0) + 1
+                        if failures[cursor] > max_page_retries:
+                            print(f"[WARNING] {symbol} {seconds_to_hhmmss(cursor)} 이전 분봉 조회 실패. 받은 구간만 반환합니다.")
+                            return collected()
+                        break
+                    earliest, other_day = add_rows(rows)
+                    if earliest is not None:
+                        frontier = min(frontier, earliest)
+                    if earliest is None or other_day or len(rows) < page_size:
+                        # 마지막(가장 이른) 페이지
+                        reached_start = True
+                        break
+                if reached_start:
+                    break
+                if frontier >= previous and not failed:
+                    print(f"[WARNING] {symbol} {seconds_to_hhmmss(frontier)} 이전 분봉이 더 나오지 않습니다. 받은 구간만 반환합니다.")
+                    break
+
+        return collected()
@@ -0,0 +1,162 @@
+"""
+KIS REST 응답을 압축 fixture 파일로 녹화하고, 로컬 stub 서버로 다시 재생하는 도구입니다.
+
+녹화) python kis_fixtures.py record fixtures/kospi200_day.json.gz --symbol 101SC000 --end-hour 153000
+재생) python kis_fixtures.py serve fixtures/kospi200_day.json.gz --port 8765
+      → KISClient("key", "secret", base_url="http://127.0.0.1:8765")로 네트워크 없이 같은 응답을 받습니다.
+
+요청은 (path, tr_id, 쿼리 파라미터)로 구분하므로 같은 인자로 호출하면 항상 같은 응답이 나옵니다.
+"""
+import gzip
+import json
+import argparse
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+from kis_client import KISClient, API_INFO_PATH
+
+
+def fixture_key(path, tr_id, params):
+    """요청을 구분하는 문자열 키 (파라미터 순서와 무관)"""
+    query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    return f"{path}|{tr_id}|{query}"
+
+
+def load_fixtures(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_fixtures(path, responses):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(responses, f, ensure_ascii=False)
+
+
+class KISRecorder:
+    """
+    KISClient.get을 감싸서 모든 응답을 {키: 응답 JSON}으로 모읍니다.
+
+    with KISRecorder(client, "fixture.json.gz"):
+        client.fetch_minute_chart_day("101SC000", end_hour="153000")
+    """
+
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+        self.responses = {}
+        self._lock = threading.Lock()
+        self._original_get = None
+
+    def _get(self, path, tr_id, params):
+        data = self._original_get(path, tr_id, params)
+        if data is not None:
+            with self._lock:
+                self.responses[fixture_key(path, tr_id, params)] = data
+        return data
+
+    def __enter__(self):
+        self._original_get = self.client.get
+        self.client.get = self._get
+        return self
+
+    def __exit__(self, *exc):
+        self.client.get = self._original_get
+        save_fixtures(self.path, self.responses)
+        print(f"[OK] {len(self.responses)}개 응답을 '{self.path}'에 저장했습니다.")
+
+
+class KISFixtureServer:
+    """녹화한 응답을 돌려주는 로컬 KIS stub 서버 (토큰 발급은 항상 성공, 없는 요청은 404)"""
+
+    def __init__(self, responses, host="127.0.0.1", port=0):
+        self.responses = responses
+        self.misses = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self._reply(200, {"access_token": "fixture-token", "expires_in": 86400})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                key = fixture_key(url.path, self.headers.get("tr_id"), dict(parse_qsl(url.query, keep_blank_values=True)))
+                if key in server.responses:
+                    self._reply(200, server.responses[key])
+                else:
+                    server.misses.append(key)
+                    self._reply(404, {"rt_cd": "1", "msg1": f"fixture not found: {key}"})
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.base_url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        return cls(load_fixtures(path), **kwargs)
+
+    def client(self, **kwargs):
+        """이 서버를 가리키는 KISClient (토큰 파일은 쓰지 않음)"""
+        kwargs.setdefault("token_path", None)
+        return KISClient("fixture-key", "fixture-secret", base_url=self.base_url, **kwargs)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KIS 응답 녹화/재생")
+    sub = parser.add_subparsers(dest="command", required=True)
+    record = sub.add_parser("record", help="실제 API를 호출해 현재가 + 하루치 분봉을 녹화")
+    record.add_argument("path")
+    record.add_argument("--symbol", default="101SC000")
+    record.add_argument("--end-hour", default=None, help="분봉 조회 기준 시각 (HHMMSS, 기본: 현재)")
+    record.add_argument("--mock", action="store_true", help="모의투자 서버 사용")
+    serve = sub.add_parser("serve", help="녹화한 응답을 로컬 stub 서버로 재생")
+    serve.add_argument("path")
+    serve.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        # 재생할 때 같은 인자로 호출할 수 있도록 기준 시각을 고정해 출력합니다.
+        end_hour = args.end_hour or datetime.now().strftime("%H%M%S")
+        client = KISClient.from_api_info(API_INFO_PATH, is_mock=args.mock)
+        with KISRecorder(client, args.path):
+            client.inquire_price(args.symbol)
+            client.fetch_minute_chart_day(args.symbol, end_hour=end_hour)
+        print(f"[OK] 재생 시 fetch_minute_chart_day('{args.symbol}', end_hour='{end_hour}')로 호출하세요.")
+        return
+
+    server = KISFixtureServer.from_file(args.path, port=args.port)
+    print(f"[OK] {len(server.responses)}개 응답 재생 중: {server.base_url} (Ctrl+C로 종료)")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
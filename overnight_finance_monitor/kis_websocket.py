@@ -0,0 +1,242 @@
+"""
+KIS 실시간 웹소켓으로 지수선물 체결(H0IFCNT0)을 받아 분봉을 바로 만드는 스트리밍 수집기입니다.
+
+- REST 분봉 조회(폴링) 없이 체결이 올 때마다 진행 중인 봉을 갱신하고, 구간이 끝나면 완성된 봉을 넘겨줍니다.
+  봉 집계는 dash_render/resampler.py의 Resampler가 맡으므로 1m 외에 5m/30m/1h도 같은 체결 스트림에서 함께 만듭니다.
+- 종목/주기별 메모리는 완성 봉 max_bars개 + 진행 중인 봉 하나로 고정됩니다. (체결 원본은 보관하지 않음)
+- PINGPONG은 받은 메시지를 그대로 돌려보내고, 연결이 끊기거나 한동안 아무 메시지도 없으면
+  1초부터 두 배씩(최대 60초) 기다렸다가 다시 접속해 같은 종목을 다시 구독합니다.
+
+사용 예)
+  python kis_websocket.py --symbol 101W12            # 실전 서버, 완성된 1분봉을 출력
+  python kis_websocket.py --symbol 101W12 --mock     # 모의투자 서버
+  python kis_websocket.py --symbol 101W12 --interval 1m 5m   # 1분봉과 5분봉을 함께 출력
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+import websockets
+
+from kis_client import KISClient, API_INFO_PATH, hhmmss_to_seconds
+from kis_bars import OHLCVBars
+
+# dash_render의 증분 리샘플러를 함께 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dash_render'))
+from resampler import Resampler
+
+REAL_WS_URL = "ws://ops.koreainvestment.com:21000"
+MOCK_WS_URL = "ws://ops.koreainvestment.com:31000"
+
+# 지수선물 실시간 체결가
+FUTURES_TICK_TR_ID = "H0IFCNT0"
+# H0IFCNT0 한 건의 필드 위치 ('^' 구분): 종목코드, 영업시간(HHMMSS), 현재가, 최종 체결량
+TICK_SYMBOL, TICK_HOUR, TICK_PRICE, TICK_VOLUME = 0, 1, 5, 9
+
+KST = timezone(timedelta(hours=9))
+NS_PER_SECOND = 10 ** 9
+
+
+def tick_epoch_ns(hhmmss, received):
+    """체결 시각(HHMMSS, KST)을 수신 시각의 날짜 기준 epoch ns(UTC)로 변환합니다."""
+    local = received.astimezone(KST)
+    midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    seconds = hhmmss_to_seconds(hhmmss)
+    # 자정 직후에 도착한 전날 23시대 체결
+    if seconds - (local - midnight).total_seconds() > 12 * 3600:
+        midnight -= timedelta(days=1)
+    return (int(midnight.timestamp()) + seconds) * NS_PER_SECOND
+
+
+def parse_ticks(raw, received, tr_id=FUTURES_TICK_TR_ID):
+    """
+    '0|H0IFCNT0|002|a^b^...' 형식의 체결 메시지를 [(종목, epoch ns, 가격, 체결량)]으로 변환합니다.
+    여러 건이 한 메시지로 오면 필드가 이어 붙어 있으므로 건수로 나눠 자릅니다.
+    암호화(1|...)되었거나 다른 tr_id면 빈 목록.
+    """
+    parts = raw.split('|', 3)
+    if len(parts) < 4 or parts[0] != '0' or parts[1] != tr_id:
+        return []
+    count = int(parts[2])
+    if count <= 0:
+        return []
+    values = parts[3].split('^')
+    width = len(values) // count
+    ticks = []
+    for i in range(count):
+        record = values[i * width:(i + 1) * width]
+        ticks.append((record[TICK_SYMBOL], tick_epoch_ns(record[TICK_HOUR], received),
+                      float(record[TICK_PRICE]), int(record[TICK_VOLUME] or 0)))
+    return ticks
+
+
+class KISWebSocketFeed:
+    """
+    KIS 실시간 웹소켓 수집기.
+
+    feed = KISWebSocketFeed(client.get_approval_key(), ["101W12"], intervals=("1m", "5m"), on_bar=print_bar)
+    asyncio.run(feed.run())
+
+    on_bar(symbol, interval, bar): 봉이 완성될 때마다 호출됩니다. bar는 Resampler와 같은
+    (ts, open, high, low, close, volume) 튜플이고, 종목/주기별 최근 봉은 feed.to_bars()로 얻습니다.
+    """
+
+    def __init__(self, approval_key, symbols, url=REAL_WS_URL, tr_id=FUTURES_TICK_TR_ID, on_bar=None,
+                 intervals=("1m",), max_bars=1440, reconnect_delay=1.0, max_reconnect_delay=60.0, idle_timeout=60.0,
+                 roll_seconds=1.0, roll_grace=2.0, clock=None):
+        self.approval_key = approval_key
+        self.symbols = list(symbols)
+        self.url = url
+        self.tr_id = tr_id
+        self.on_bar = on_bar
+        self.intervals = tuple(intervals)
+        self.resamplers = {symbol: Resampler(self.intervals) for symbol in self.symbols}
+        self.bars = {symbol: {name: deque(maxlen=max_bars) for name in self.intervals} for symbol in self.symbols}
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.idle_timeout = idle_timeout  # 이 시간 동안 아무 메시지(PINGPONG 포함)도 없으면 끊긴 것으로 보고 재접속
+        self.roll_seconds = roll_seconds  # 체결이 없을 때 분 경과를 확인하는 주기
+        self.roll_grace = roll_grace      # 봉 구간이 끝난 뒤 늦게 오는 체결을 기다리는 시간
+        self.connects = 0
+        self.bad_frames = 0  # 형식이 맞지 않아 버린 메시지 수
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._stopping = False
+
+    def subscribe_message(self, symbol, subscribe=True):
+        return json.dumps({
+            "header": {
+                "approval_key": self.approval_key,
+                "custtype": "P",
+                "tr_type": "1" if subscribe else "2",  # 1: 등록, 2: 해제
+                "content-type": "utf-8"
+            },
+            "body": {"input": {"tr_id": self.tr_id, "tr_key": symbol}}
+        })
+
+    def stop(self):
+        """현재 연결이 끝나면 재접속하지 않고 run()을 마칩니다."""
+        self._stopping = True
+
+    async def run(self, max_connects=None):
+        """접속 → 구독 → 수신을 반복합니다. 연결이 끊기면 지수 백오프 후 재접속합니다."""
+        delay = self.reconnect_delay
+        while not self._stopping:
+            try:
+                async with websockets.connect(self.url, ping_interval=None) as ws:
+                    self.connects += 1
+                    for symbol in self.symbols:
+                        await ws.send(self.subscribe_message(symbol))
+                    delay = self.reconnect_delay
+                    await self._receive(ws)
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+                # WebSocketException: 연결 끊김(ConnectionClosed)과 핸드셰이크 거절(InvalidStatus, 예: 503) 모두 포함
+                print(f"[WARNING] 웹소켓 연결 끊김: {e!r}")
+            if self._stopping or (max_connects is not None and self.connects >= max_connects):
+                break
+            print(f"[WARNING] {delay:g}초 후 재접속합니다.")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+        # 종료 시 진행 중인 봉까지 넘겨줍니다.
+        self._roll(None)
+
+    async def _receive(self, ws):
+        idle = 0.0
+        while not self._stopping:
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=self.roll_seconds)
+            except asyncio.TimeoutError:
+                idle += self.roll_seconds
+                if idle >= self.idle_timeout:
+                    raise ConnectionError(f"no message for {idle:g}s")
+                self._roll(int((self._clock().timestamp() - self.roll_grace) * NS_PER_SECOND))
+                continue
+            idle = 0.0
+            reply = self.handle(raw)
+            if reply is not None:
+                await ws.send(reply)
+
+    def handle(self, raw):
+        """
+        수신 메시지 하나를 처리합니다. 서버에 돌려보낼 메시지(PINGPONG)가 있으면 반환합니다.
+        형식이 맞지 않는 메시지는 경고만 남기고 버립니다. (수신 루프와 연결은 유지)
+        """
+        if raw[:1] in ('0', '1'):
+            try:
+                ticks = parse_ticks(raw, self._clock(), self.tr_id)
+            except (IndexError, ValueError) as e:
+                return self._skip(raw, e)
+            for symbol, ts_ns, price, volume in ticks:
+                resampler = self.resamplers.get(symbol)
+                if resampler is None:
+                    continue
+                self._emit(symbol, resampler.update(ts_ns, price, price, price, price, volume))
+            return None
+
+        try:
+            data = json.loads(raw)
+            header = data.get("header", {})
+            body = data.get("body", {})
+        except (ValueError, AttributeError) as e:
+            return self._skip(raw, e)
+        if header.get("tr_id") == "PINGPONG":
+            return raw
+        if body.get("rt_cd") not in (None, "0"):
+            print(f"[ERROR] 구독 실패 ({header.get('tr_key')}): {body.get('msg1')}")
+        return None
+
+    def _skip(self, raw, error):
+        self.bad_frames += 1
+        print(f"[WARNING] 처리할 수 없는 메시지를 건너뜁니다 ({error!r}): {raw[:100]!r}")
+        return None
+
+    def _roll(self, now_ns):
+        for symbol, resampler in self.resamplers.items():
+            self._emit(symbol, resampler.roll(now_ns))
+
+    def _emit(self, symbol, completed):
+        for interval, bar in completed:
+            self.bars[symbol][interval].append(bar)
+            if self.on_bar:
+                self.on_bar(symbol, interval, bar)
+
+    def late(self, symbol):
+        """symbol에서 이미 완성된 구간에 늦게 도착해 반영하지 않은 체결 수 (주기별로 셈)"""
+        return self.resamplers[symbol].late
+
+    def to_bars(self, symbol, interval="1m", include_current=False):
+        """symbol의 interval 봉 중 완성된 것(include_current면 진행 중인 봉 포함)을 kis_bars.OHLCVBars로 반환합니다."""
+        current = self.resamplers[symbol].partial(interval) if include_current else None
+        return OHLCVBars.from_rows(list(self.bars[symbol][interval]) + ([current] if current else []))
+
+
+def print_bar(symbol, interval, bar):
+    ts, o, h, l, c, v = bar
+    start = datetime.fromtimestamp(ts / NS_PER_SECOND, KST).strftime('%Y-%m-%d %H:%M')
+    print(f"{symbol} {interval:>3} {start}  O {o:.2f}  H {h:.2f}  L {l:.2f}  C {c:.2f}  V {v}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KIS 실시간 선물 체결 → 분봉")
+    parser.add_argument("--symbol", nargs="+", default=["101W12"])
+    parser.add_argument("--interval", nargs="+", default=["1m"], help="만들 봉 주기 (예: 1m 5m 30m 1h)")
+    parser.add_argument("--mock", action="store_true", help="모의투자 서버 사용")
+    args = parser.parse_args()
+
+    client = KISClient.from_api_info(API_INFO_PATH, is_mock=args.mock)
+    approval_key = client.get_approval_key()
+    if not approval_key:
+        return
+    feed = KISWebSocketFeed(approval_key, args.symbol, url=MOCK_WS_URL if args.mock else REAL_WS_URL,
+                            intervals=args.interval, on_bar=print_bar)
+    try:
+        asyncio.run(feed.run())
+    except KeyboardInterrupt:
+        print("[OK] 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from kis_client import shared_rate_limiter
+
+
+class MultiFetcher:
+    """
+    여러 종목을 동시에 조회하는 스레드 풀 기반 도구입니다. (mojito 등 blocking 호출용)
+
+    - 호스트별 동시 요청 수 제한(max_per_host)과 토큰 버킷 속도 제한(rate_limiter)을 함께 적용합니다.
+      rate_limiter를 주지 않으면 KISClient와 같은 서버별 공용 limiter(kis_client.shared_rate_limiter)를 씁니다.
+    - fetch_all: 모든 종목 결과를 {symbol: 결과}로 반환합니다. (예외가 난 종목은 예외 객체)
+    - fetch_first: 목록 순서상 가장 앞선 '유효한' 결과를 반환하고 나머지 대기 중 요청은 취소합니다.
+    따라서 후보 종목코드 여러 개를 확인하는 데 요청 1~2회 정도의 시간만 걸립니다.
+    """
+
+    def __init__(self, max_per_host=4, rate_limiter=None, is_mock=False):
+        self.max_per_host = max_per_host
+        self.rate_limiter = rate_limiter or shared_rate_limiter(is_mock)
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host):
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[host]
+
+    def _call(self, fetch, symbol, host):
+        with self._slot(host):
+            self.rate_limiter.acquire()
+            return fetch(symbol)
+
+    def _submit_all(self, executor, symbols, fetch, host):
+        return {executor.submit(self._call, fetch, symbol, host): symbol for symbol in symbols}
+
+    def fetch_all(self, symbols, fetch, host="kis"):
+        """모든 종목을 동시에 조회해 {symbol: 결과 또는 예외}를 입력 순서대로 반환합니다."""
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_per_host) as executor:
+            futures = self._submit_all(executor, symbols, fetch, host)
+            for future, symbol in futures.items():
+                try:
+                    results[symbol] = future.result()
+                except Exception as e:
+                    results[symbol] = e
+        return {symbol: results[symbol] for symbol in symbols}
+
+    def fetch_first(self, symbols, fetch, is_valid=lambda result: result is not None, host="kis"):
+        """
+        is_valid를 만족하는 결과 중 symbols 순서상 가장 앞선 것을 (symbol, 결과)로 반환합니다.
+        앞선 종목들의 결과가 모두 나오는 즉시 반환하며, 하나도 없으면 (None, None)을 반환합니다.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_per_host)
+        try:
+            futures = self._submit_all(executor, symbols, fetch, host)
+            by_symbol = {symbol: future for future, symbol in futures.items()}
+            pending = set(futures)
+            while True:
+                # 목록 순서대로 확인: 앞 종목이 아직 진행 중이면 기다리고, 실패/무효면 다음 종목으로
+                for symbol in symbols:
+                    future = by_symbol[symbol]
+                    if not future.done():
+                        break
+                    if future.exception() is None and is_valid(future.result()):
+                        return symbol, future.result()
+                else:
+                    return None, None
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,301 @@
+"""
+한국시간 15:30에 나스닥/S&P 선물 1분봉을 DB에 적재하는 도구입니다.
+
+- 봉은 (symbol, interval, ts) 기준 upsert이므로 같은 구간을 여러 번 적재해도 중복되지 않습니다.
+- executemany로 batch_size행씩 한 번에 바인딩합니다. (Oracle에서는 array DML로 처리되어
+  며칠치 1분봉도 행 단위 INSERT 대신 수 초 안에 적재됩니다.)
+- 연결은 풀에서 빌려 쓰고 반납합니다. Oracle은 oracledb 풀, 그 외 DB-API(sqlite3 등)는 BarConnectionPool.
+
+사용 예)
+  python oracle_ingest.py --symbols ES=F NQ=F --days 1                 # Oracle (ORACLE_USER/ORACLE_PASSWORD/ORACLE_DSN)
+  python oracle_ingest.py --symbols ES=F --days 3 --sqlite bars.db      # 로컬 SQLite로 확인
+  python oracle_ingest.py --at-close                                    # KRX 거래일마다 선물 마감(15:45) 직후 적재 (휴장일 건너뜀)
+"""
+import os
+import sys
+import queue
+import sqlite3
+import argparse
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+# dash_render의 데이터 모듈(다운로드 함수 등)을 함께 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dash_render'))
+from bar_cache import download_bars
+from market_calendar import KRX
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABLE = "FUTURES_BARS"
+DEFAULT_SYMBOLS = ("ES=F", "NQ=F")
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# Oracle: 바인드 변수 배열을 MERGE 한 문장으로 처리 (executemany → array DML)
+ORACLE_MERGE = """
+MERGE INTO {table} t
+USING (SELECT :1 AS symbol, :2 AS interval_code, :3 AS ts, :4 AS open_price, :5 AS high_price,
+              :6 AS low_price, :7 AS close_price, :8 AS volume FROM dual) s
+ON (t.symbol = s.symbol AND t.interval_code = s.interval_code AND t.ts = s.ts)
+WHEN MATCHED THEN UPDATE SET
+    t.open_price = s.open_price, t.high_price = s.high_price, t.low_price = s.low_price,
+    t.close_price = s.close_price, t.volume = s.volume, t.updated_at = SYSTIMESTAMP
+WHEN NOT MATCHED THEN INSERT (symbol, interval_code, ts, open_price, high_price, low_price, close_price, volume, updated_at)
+    VALUES (s.symbol, s.interval_code, s.ts, s.open_price, s.high_price, s.low_price, s.close_price, s.volume, SYSTIMESTAMP)
+"""
+
+ORACLE_DDL = """
+CREATE TABLE {table} (
+    symbol        VARCHAR2(20) NOT NULL,
+    interval_code VARCHAR2(8)  NOT NULL,
+    ts            TIMESTAMP    NOT NULL,
+    open_price    NUMBER,
+    high_price    NUMBER,
+    low_price     NUMBER,
+    close_price   NUMBER,
+    volume        NUMBER,
+    updated_at    TIMESTAMP DEFAULT SYSTIMESTAMP,
+    CONSTRAINT pk_{table} PRIMARY KEY (symbol, interval_code, ts)
+)
+"""
+
+SQLITE_UPSERT = """
+INSERT INTO {table} (symbol, interval_code, ts, open_price, high_price, low_price, close_price, volume, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+ON CONFLICT(symbol, interval_code, ts) DO UPDATE SET
+    open_price = excluded.open_price, high_price = excluded.high_price, low_price = excluded.low_price,
+    close_price = excluded.close_price, volume = excluded.volume, updated_at = excluded.updated_at
+"""
+
+SQLITE_DDL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    symbol        TEXT NOT NULL,
+    interval_code TEXT NOT NULL,
+    ts            TEXT NOT NULL,
+    open_price    REAL,
+    high_price    REAL,
+    low_price     REAL,
+    close_price   REAL,
+    volume        INTEGER,
+    updated_at    TEXT,
+    PRIMARY KEY (symbol, interval_code, ts)
+) WITHOUT ROWID
+"""
+
+
+class BarConnectionPool:
+    """
+    DB-API 연결을 최대 size개까지 만들어 재사용하는 간단한 풀입니다.
+    (oracledb.ConnectionPool과 같은 acquire/release 인터페이스)
+    """
+
+    def __init__(self, connect, size=4):
+        self._connect = connect
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return self._connect()
+        return self._idle.get()
+
+    def release(self, connection):
+        self._idle.put(connection)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def create_sqlite_pool(path, size=4):
+    """SQLite 파일용 연결 풀 (여러 스레드에서 빌려 쓸 수 있도록 check_same_thread=False)"""
+    def connect():
+        connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+    return BarConnectionPool(connect, size)
+
+
+def create_oracle_pool(user=None, password=None, dsn=None, min_size=1, max_size=4):
+    """oracledb 연결 풀 (환경변수 ORACLE_USER / ORACLE_PASSWORD / ORACLE_DSN 사용 가능)"""
+    import oracledb
+    return oracledb.create_pool(
+        user=user or os.environ.get("ORACLE_USER"),
+        password=password or os.environ.get("ORACLE_PASSWORD"),
+        dsn=dsn or os.environ.get("ORACLE_DSN"),
+        min=min_size, max=max_size, increment=1)
+
+
+def bar_rows(symbol, frame, interval="1m", ts_format=None):
+    """
+    봉 DataFrame(DatetimeIndex, Open/High/Low/Close/Volume 또는 소문자 컬럼)을 바인드용 튜플 목록으로 변환합니다.
+    - ts: UTC naive datetime (ts_format을 주면 그 형식의 문자열)
+    - 컬럼별로 한 번에 변환하므로 행마다 pandas 객체를 만들지 않습니다.
+    """
+    if frame is None or frame.empty:
+        return []
+    frame = frame.copy()
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame.columns = frame.columns.get_level_values(0)
+    frame.columns = [str(c).lower() for c in frame.columns]
+    frame = frame.dropna(subset=["close"])
+
+    index = pd.DatetimeIndex(frame.index)
+    index = index.tz_convert('UTC').tz_localize(None) if index.tz is not None else index
+    ts = index.strftime(ts_format).tolist() if ts_format else index.to_pydatetime().tolist()
+
+    columns = []
+    for name in BAR_COLUMNS:
+        if name not in frame.columns:
+            columns.append([None] * len(frame))
+            continue
+        values = frame[name].to_numpy(dtype=np.float64)
+        column = values.tolist() if name != "volume" else [int(v) if v == v else None for v in values]
+        columns.append(column)
+    n = len(ts)
+    return list(zip([symbol] * n, [interval] * n, ts, *columns))
+
+
+class BarWriter:
+    """
+    봉을 (symbol, interval, ts) 기준으로 upsert합니다.
+
+    dialect='oracle' : MERGE + executemany (array DML)
+    dialect='sqlite' : INSERT ... ON CONFLICT DO UPDATE + executemany
+    driver는 dialect의 DB-API 모듈(oracledb/sqlite3)로, DB 오류는 driver.Error로 잡습니다.
+    """
+
+    def __init__(self, pool, dialect="oracle", table=DEFAULT_TABLE, batch_size=5000):
+        if dialect not in ("oracle", "sqlite"):
+            raise ValueError(f"Unsupported dialect: {dialect}")
+        self.pool = pool
+        self.dialect = dialect
+        self.table = table
+        self.batch_size = batch_size
+        if dialect == "oracle":
+            import oracledb
+            self.driver = oracledb
+        else:
+            self.driver = sqlite3
+        self._sql = (ORACLE_MERGE if dialect == "oracle" else SQLITE_UPSERT).format(table=table)
+
+    @contextmanager
+    def _connection(self):
+        connection = self.pool.acquire()
+        try:
+            yield connection
+        finally:
+            self.pool.release(connection)
+
+    def create_table(self):
+        """테이블을 만듭니다. (Oracle은 이미 있으면 ORA-00955 오류를 무시)"""
+        ddl = (ORACLE_DDL if self.dialect == "oracle" else SQLITE_DDL).format(table=self.table)
+        with self._connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(ddl)
+            except self.driver.Error as e:
+                if "ORA-00955" not in str(e):
+                    raise
+            finally:
+                cursor.close()
+            connection.commit()
+
+    def write(self, symbol, frame, interval="1m"):
+        """한 종목의 봉을 batch_size행씩 upsert하고 적재한 행 수를 반환합니다. (전체가 한 트랜잭션)"""
+        rows = bar_rows(symbol, frame, interval, ts_format="%Y-%m-%d %H:%M:%S" if self.dialect == "sqlite" else None)
+        if not rows:
+            return 0
+        with self._connection() as connection:
+            cursor = connection.cursor()
+            try:
+                if self.dialect == "oracle":
+                    # 첫 행에 None(거래량 없음 등)이 있어도 배치 전체가 같은 타입으로 바인딩되도록 지정
+                    cursor.setinputsizes(20, 8, self.driver.DB_TYPE_TIMESTAMP, *[self.driver.DB_TYPE_NUMBER] * 5)
+                for start in range(0, len(rows), self.batch_size):
+                    cursor.executemany(self._sql, rows[start:start + self.batch_size])
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+        logger.info(f"{symbol} ({interval}) {len(rows)}행 적재")
+        return len(rows)
+
+    def write_many(self, frames, interval="1m"):
+        """{symbol: frame}을 풀 크기만큼 동시에 적재하고 {symbol: 행 수}를 반환합니다."""
+        workers = max(1, min(len(frames), getattr(self.pool, "size", None) or getattr(self.pool, "max", 1)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {symbol: executor.submit(self.write, symbol, frame, interval) for symbol, frame in frames.items()}
+            return {symbol: future.result() for symbol, future in futures.items()}
+
+
+def snapshot_1530(writer, symbols=DEFAULT_SYMBOLS, days=1, interval="1m", downloader=None, now=None):
+    """15:30 (KST) 적재 작업: 최근 days일의 봉을 받아 한 번에 upsert합니다."""
+    downloader = downloader or download_bars
+    now = now or datetime.now(timezone.utc)
+    start = now - timedelta(days=days)
+    frames = {symbol: downloader(symbol, interval, start, None) for symbol in symbols}
+    return writer.write_many(frames, interval)
+
+
+def run_at_close(writer, symbols=DEFAULT_SYMBOLS, days=1, interval="1m", calendar=KRX,
+                 settle=timedelta(minutes=1)):
+    """calendar의 마감 시각(KRX: 코스피200 선물 15:45 KST)마다 settle 뒤에 snapshot_1530을 실행합니다. 주말/휴장일은 건너뜁니다."""
+    while True:
+        close = calendar.next_close(datetime.now(timezone.utc))
+        wake = close + settle
+        logger.info(f"다음 적재 시각: {wake.tz_convert(calendar.tz)}")
+        time.sleep(max((wake - pd.Timestamp.now(tz='UTC')).total_seconds(), 0))
+        try:
+            snapshot_1530(writer, symbols, days, interval)
+        except writer.driver.Error:
+            logger.exception("적재 실패")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="선물 1분봉 DB 적재 (15:30 KST)")
+    parser.add_argument("--symbols", nargs="+", default=list(DEFAULT_SYMBOLS))
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--interval", default="1m")
+    parser.add_argument("--table", default=DEFAULT_TABLE)
+    parser.add_argument("--sqlite", default=None, help="Oracle 대신 이 SQLite 파일에 적재")
+    parser.add_argument("--create-table", action="store_true")
+    parser.add_argument("--at-close", action="store_true", help="KRX 선물 장 마감(15:45 KST)마다 반복 적재")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        pool, dialect = create_sqlite_pool(args.sqlite), "sqlite"
+    else:
+        pool, dialect = create_oracle_pool(), "oracle"
+    writer = BarWriter(pool, dialect=dialect, table=args.table)
+    if args.create_table or dialect == "sqlite":
+        writer.create_table()
+    if args.at_close:
+        run_at_close(writer, args.symbols, args.days, args.interval)
+        return
+    counts = snapshot_1530(writer, args.symbols, args.days, args.interval)
+    logger.info(f"적재 완료: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,16 @@
-import requests
-import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
+from kis_client import KISClient, API_INFO_PATH
+from kis_bars import parse_output2
 
-def load_kis_api_info(filepath):
-    """KIS API 정보를 외부 파일에서 읽어옵니다."""
-    api_info = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line and '\t' in line:
-                key, value = line.split('\t', 1)
-                api_info[key] = value
-    return api_info
-
-def get_access_token(app_key, app_secret, is_mock=False):
-    """Access Token 발급"""
-    if is_mock:
-        base_url = "https://openapivts.koreainvestment.com:29443"
-    else:
-        base_url = "https://openapi.koreainvestment.com:9443"
-    
-    url = f"{base_url}/oauth2/tokenP"
-    headers = {"content-type": "application/json"}
-    body = {
-        "grant_type": "client_credentials",
-        "appkey": app_key,
-        "appsecret": app_secret
-    }
-    
-    res = requests.post(url, headers=headers, json=body)
-    return res.json().get("access_token"), base_url
-
-def fetch_futures_current_price(base_url, access_token, app_key, app_secret, symbol):
+def fetch_futures_current_price(client, symbol):
     """
     선물 현재가 조회 (API 연결 테스트용)
     """
-    url = f"{base_url}/uapi/domestic-futureoption/v1/quotations/inquire-price"
-    
-    headers = {
-        "content-type": "application/json; charset=utf-8",
-        "authorization": f"Bearer {access_token}",
-        "appkey": app_key,
-        "appsecret": app_secret,
-        "tr_id": "FHMIF10000000",  # 선물 현재가 조회
-        "custtype": "P"
-    }
-    
-    params = {
-        "FID_COND_MRKT_DIV_CODE": "F",  # F: 선물
-        "FID_INPUT_ISCD": symbol
-    }
-    
     print(f"[DEBUG] 선물 현재가 조회: {symbol}")
-    res = requests.get(url, headers=headers, params=params)
+    data = client.inquire_price(symbol)
     
-    if res.status_code == 200:
-        data = res.json()
+    if data is not None:
         print(f"[DEBUG] 응답 코드: {data.get('rt_cd')}, 메시지: {data.get('msg1')}")
         if data.get('rt_cd') == '0' and 'output' in data:
             output = data['output']
@@ -65,74 +19,40 @@ def fetch_futures_current_price(base_url, access_token, app_key, app_secret, sym
             print(f"    - 저가: {output.get('futs_lwpr', 'N/A')}")
             print(f"    - 전일대비: {output.get('futs_prdy_vrss', 'N/A')}")
             print(f"    - 거래량: {output.get('acml_vol', 'N/A')}")
-        return data
-    else:
-        print(f"[ERROR] HTTP {res.status_code}")
-        return None
+    return data
 
-def fetch_futures_minute_chart(base_url, access_token, app_key, app_secret, symbol, time_unit="1"):
+def fetch_futures_minute_chart(client, symbol, time_unit="1"):
     """
     선물 분봉 데이터 조회 (한국투자증권 API 직접 호출)
     
     symbol: 선물 종목코드 (예: 101SC000 - 코스피200 선물 연속)
     time_unit: 분봉 단위 (1, 3, 5, 10, 15, 30, 45, 60)
-    """
-    # 선물 분봉 조회 API 엔드포인트
-    url = f"{base_url}/uapi/domestic-futureoption/v1/quotations/inquire-time-futuroptprice"
     
-    headers = {
-        "content-type": "application/json; charset=utf-8",
-        "authorization": f"Bearer {access_token}",
-        "appkey": app_key,
-        "appsecret": app_secret,
-        "tr_id": "FHMIF10020000",  # 선물 시간별 체결가 조회
-        "custtype": "P"  # 개인
-    }
-    
-    # 현재 시간
-    now = datetime.now()
-    end_time = now.strftime("%H%M%S")
-    
-    params = {
-        "FID_COND_MRKT_DIV_CODE": "F",  # F: 선물
-        "FID_INPUT_ISCD": symbol,
-        "FID_INPUT_HOUR_1": end_time,
-        "FID_PW_DATA_INCU_YN": "Y"  # 과거 데이터 포함
-    }
-    
-    print(f"[DEBUG] 요청 URL: {url}")
+    한 번의 요청은 한 페이지만 돌려주므로, 현재 시각부터 장 시작까지 페이지를 이어 붙여 하루치 전체를 가져옵니다.
+    """
     print(f"[DEBUG] 종목코드: {symbol}")
     
-    res = requests.get(url, headers=headers, params=params)
+    rows = client.fetch_minute_chart_day(symbol, end_hour=datetime.now().strftime("%H%M%S"))
     
-    if res.status_code == 200:
-        data = res.json()
-        print(f"[DEBUG] 응답 코드: {data.get('rt_cd')}, 메시지: {data.get('msg1')}")
-        return data
-    else:
-        print(f"[ERROR] HTTP {res.status_code}: {res.text[:200]}")
+    if rows is None:
+        print("[ERROR] 분봉 조회 실패")
         return None
+    print(f"[DEBUG] 페이지 병합 완료: {len(rows)}개 분봉")
+    return {"rt_cd": "0", "msg1": "OK", "output2": rows}
 
 def plot_kospi200_futures():
     """코스피200 24시간 연속선물 분봉 차트 생성"""
     
-    # API 정보 로드
-    API_INFO_PATH = r"C:\Users\hangs\OneDrive\GitRepositories_related_private_data\KIS_API_INFO.txt"
-    api_info = load_kis_api_info(API_INFO_PATH)
-    
-    APP_KEY = api_info.get('APP_KEY')
-    APP_SECRET = api_info.get('APP_Secret')
-    
     print("한국투자증권 선물 API 연결 중 (실전투자 모드)...")
     
-    # Access Token 발급 (실전투자)
-    access_token, base_url = get_access_token(APP_KEY, APP_SECRET, is_mock=False)
+    # API 정보 로드 및 클라이언트 생성 (토큰은 파일에 캐시되어 만료 전까지 재사용)
+    client = KISClient.from_api_info(API_INFO_PATH, is_mock=False)
     
-    if not access_token:
+    if not client.get_access_token():
         print("[ERROR] Access Token 발급 실패")
         return None
     
-    print(f"[OK] Access Token 발급 성공")
+    print(f"[OK] Access Token 준비 완료")
     
     # 코스피200 선물 종목코드
     # 101SC000: 코스피200 선물 연속 (근월물 기준)
@@ -140,57 +60,41 @@ def plot_kospi200_futures():
     
     # 먼저 현재가 조회로 API 연결 테스트
     print(f"\n{symbol} 선물 현재가 조회 중...")
-    price_data = fetch_futures_current_price(base_url, access_token, APP_KEY, APP_SECRET, symbol)
+    price_data = fetch_futures_current_price(client, symbol)
     
     print(f"\n{symbol} 선물 분봉 데이터 조회 중...")
     
     # 선물 분봉 데이터 조회
-    data = fetch_futures_minute_chart(base_url, access_token, APP_KEY, APP_SECRET, symbol, time_unit="1")
+    data = fetch_futures_minute_chart(client, symbol, time_unit="1")
     
     if data and data.get('rt_cd') == '0':
         output2 = data.get('output2', [])
         
         if output2:
-            df = pd.DataFrame(output2)
-            print(f"[OK] {len(df)}개의 분봉 데이터 수신")
+            print(f"[OK] {len(output2)}개의 분봉 데이터 수신")
             
             # 데이터 구조 확인
-            print(f"\n[DEBUG] 컬럼: {df.columns.tolist()}")
-            print(df.head(5))
+            print(f"\n[DEBUG] 필드: {sorted(output2[0])}")
             
             # 데이터 전처리
             # 선물 API 응답 필드: stck_bsop_date, stck_cntg_hour, futs_prpr, futs_hgpr, futs_lwpr, futs_oprc, cntg_vol
-            if 'futs_prpr' in df.columns:
-                df['close'] = pd.to_numeric(df['futs_prpr'], errors='coerce')
-            elif 'stck_prpr' in df.columns:
-                df['close'] = pd.to_numeric(df['stck_prpr'], errors='coerce')
-            else:
-                print("[WARNING] 가격 컬럼을 찾을 수 없습니다.")
-                print(f"사용 가능한 컬럼: {df.columns.tolist()}")
+            try:
+                bars = parse_output2(output2)
+            except ValueError as e:
+                print(f"[WARNING] {e}")
                 return None
             
             # 유효한 데이터 필터링
-            df = df[df['close'] > 0]
-            print(f"[OK] 유효한 데이터: {len(df)}개")
+            bars = bars.valid()
+            print(f"[OK] 유효한 데이터: {len(bars)}개")
             
-            if len(df) == 0:
+            if len(bars) == 0:
                 print("[WARNING] 유효한 데이터가 없습니다.")
                 return None
             
-            # 날짜+시간 결합
-            if 'stck_bsop_date' in df.columns:
-                df['time'] = pd.to_datetime(
-                    df['stck_bsop_date'].astype(str) + df['stck_cntg_hour'].astype(str).str.zfill(6),
-                    format='%Y%m%d%H%M%S'
-                )
-            else:
-                today = datetime.now().date()
-                df['time'] = df['stck_cntg_hour'].apply(
-                    lambda x: datetime.combine(today, datetime.strptime(str(x).zfill(6), '%H%M%S').time())
-                )
-            
-            # 시간순 정렬
-            df = df.drop_duplicates(subset=['time']).sort_values('time')
+            # 중복 제거 및 시간순 정렬 (stck_bsop_date가 없으면 오늘 날짜 기준)
+            df = bars.sorted_unique().to_frame()
+            print(df.head(5))
             
             # 차트 그리기
             plt.figure(figsize=(15, 8))
@@ -1,7 +1,7 @@
 import mojito
-import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
+from kis_bars import parse_output2
 
 def load_kis_api_info(filepath):
     """KIS API 정보를 외부 파일에서 읽어옵니다."""
@@ -48,32 +48,19 @@ def plot_kospi_futures_from_kis():
         resp = broker.fetch_today_1m_ohlcv(symbol)
         
         if 'output2' in resp and resp['output2']:
-            df = pd.DataFrame(resp['output2'])
-            print(f"[OK] {len(df)}개의 분봉 데이터 수신")
-            
-            # 데이터 전처리 - 날짜와 시간을 결합
-            df['close'] = pd.to_numeric(df['stck_prpr'], errors='coerce')
-            df['high'] = pd.to_numeric(df['stck_hgpr'], errors='coerce')
-            df['low'] = pd.to_numeric(df['stck_lwpr'], errors='coerce')
-            df['open'] = pd.to_numeric(df['stck_oprc'], errors='coerce')
-            df['volume'] = pd.to_numeric(df['cntg_vol'], errors='coerce')
+            bars = parse_output2(resp['output2'])
+            print(f"[OK] {len(bars)}개의 분봉 데이터 수신")
             
             # 유효한 데이터만 필터링 (가격이 0보다 큰 것)
-            df = df[df['close'] > 0]
-            print(f"[OK] 유효한 데이터: {len(df)}개")
+            bars = bars.valid()
+            print(f"[OK] 유효한 데이터: {len(bars)}개")
             
-            if len(df) == 0:
+            if len(bars) == 0:
                 print("[WARNING] 유효한 데이터가 없습니다.")
                 return None
             
-            # 날짜+시간 결합 (stck_bsop_date + stck_cntg_hour)
-            df['time'] = pd.to_datetime(
-                df['stck_bsop_date'].astype(str) + df['stck_cntg_hour'].astype(str).str.zfill(6),
-                format='%Y%m%d%H%M%S'
-            )
-            
             # 중복 제거 및 시간순 정렬
-            df = df.drop_duplicates(subset=['time']).sort_values('time')
+            df = bars.sorted_unique().to_frame()
             
             # 차트 그리기
             plt.figure(figsize=(15, 8))
@@ -1,21 +1,35 @@
 import yfinance as yf
-import matplotlib.pyplot as plt
 import pandas as pd
+import os
+import sys
+import time
+import argparse
 
-def plot_sp500_futures_1m():
+# dash_render의 데이터 모듈(Parquet 보관소 등)을 함께 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dash_render'))
+from bar_archive import BarArchive
+from overnight import overnight_gaps
+from incremental_chart import IncrementalChart
+from market_calendar import CME, SessionSchedule
+
+def plot_sp500_futures_1m(chart=None, period="3d"):
     """
     S&P 500 선물(ES=F) 데이터를 1분 단위로 가져와서 최근 3일치를 차트로 그립니다.
     """
     ticker = "ES=F"
-    print(f"{ticker} 1분 단위 데이터를 3일치 불러오는 중...")
+    print(f"{ticker} 1분 단위 데이터(period={period})를 불러오는 중...")
     
     # yfinance에서 1분 단위 데이터는 최근 7일까지만 제공됩니다.
     # period='3d', interval='1m'
-    data = yf.download(ticker, period="3d", interval="1m")
+    data = yf.download(ticker, period=period, interval="1m")
     
     if data.empty:
         print("데이터를 불러오지 못했습니다.")
-        return
+        return chart
+
+    # 받아온 1분봉 중 보관소의 마지막 봉 이후만 추가 (yfinance 보관 기간이 지나도 기록이 남도록)
+    # 형성 중인 마지막 봉은 값이 아직 바뀌므로 다음 실행에서 완성된 뒤에 보관합니다.
+    BarArchive().append_new(ticker, data.iloc[:-1], "1m")
 
     # 'Close' 가격 컬럼 선택 (MultiIndex 대응)
     if isinstance(data.columns, pd.MultiIndex):
@@ -26,66 +40,46 @@ def plot_sp500_futures_1m():
     # 인덱스를 한국 시간(KST)으로 변환
     close_prices.index = close_prices.index.tz_convert('Asia/Seoul')
 
-    # 차트 그리기
-    plt.figure(figsize=(15, 8))
-    plt.plot(close_prices.index, close_prices.values, label='S&P 500 Futures (ES=F) - 1m', color='blue', linewidth=1)
-    
-    # 한국 시간 기준 오전 9시와 오후 3시 30분 표시 및 변동률 계산
-    unique_days = sorted(pd.Series(close_prices.index.date).unique())
-    
-    for i in range(len(unique_days)):
-        day = unique_days[i]
-        
-        # 1. 당일 오후 15:30 (KST)
-        kst_1530 = pd.Timestamp(year=day.year, month=day.month, day=day.day, hour=15, minute=30, tz='Asia/Seoul')
-        
-        # 2. 다음날 오전 09:00 (KST)
-        if i + 1 < len(unique_days):
-            next_day = unique_days[i+1]
-            kst_0900_next = pd.Timestamp(year=next_day.year, month=next_day.month, day=next_day.day, hour=9, minute=0, tz='Asia/Seoul')
-            
-            # 두 시점의 데이터가 모두 존재하는지 확인
-            if kst_1530 in close_prices.index and kst_0900_next in close_prices.index:
-                price_1530 = close_prices.loc[kst_1530]
-                price_0900 = close_prices.loc[kst_0900_next]
-                change = price_0900 - price_1530
-                pct_change = (change / price_1530) * 100
-                
-                # 오버나이트 구간 음영 표시 (15:30 ~ 익일 09:00)
-                plt.axvspan(kst_1530, kst_0900_next, color='gray', alpha=0.1)
-                
-                # 변동폭 텍스트 표시
-                mid_point = kst_1530 + (kst_0900_next - kst_1530) / 2
-                plt.text(mid_point, plt.ylim()[0] + (plt.ylim()[1] - plt.ylim()[0]) * 0.1, 
-                         f'Overnight: {change:+.2f} ({pct_change:+.2f}%)', 
-                         color='darkblue', fontweight='bold', horizontalalignment='center')
+    # 차트는 처음 한 번만 만들고, 이후에는 새 봉과 새 장식만 추가합니다. (처음 받은 봉 개수만큼만 유지)
+    if chart is None:
+        chart = IncrementalChart("sp500_futures_3d_1m.png",
+                                 title='S&P 500 Futures (ES=F) - Last 3 Days (Overnight Variations in KST)',
+                                 label='S&P 500 Futures (ES=F) - 1m', color='blue', xlabel='Time',
+                                 max_points=len(close_prices))
+    added = chart.update(close_prices)
 
-        # 기존 마커 (수직선) 표시
-        # 오전 9:00 (KST)
-        kst_0900 = pd.Timestamp(year=day.year, month=day.month, day=day.day, hour=9, minute=0, tz='Asia/Seoul')
-        if kst_0900 in close_prices.index:
-            plt.axvline(x=kst_0900, color='red', linestyle='--', alpha=0.6)
-            plt.text(kst_0900, plt.ylim()[1], ' 09:00', color='red', verticalalignment='bottom', rotation=90)
-            
-        # 오후 3:30 (KST)
-        if kst_1530 in close_prices.index:
-            plt.axvline(x=kst_1530, color='green', linestyle='--', alpha=0.6)
-            plt.text(kst_1530, plt.ylim()[1], ' 15:30', color='green', verticalalignment='bottom', rotation=90)
+    # 15:30 (KST) → 익일 09:00 (KST) 오버나이트 변동을 모든 날짜에 대해 한 번에 계산
+    chart.add_gaps(overnight_gaps(close_prices, open="09:00", close="15:30", tz="Asia/Seoul"))
 
-    plt.title(f'S&P 500 Futures (ES=F) - Last 3 Days (Overnight Variations in KST)')
-    plt.xlabel('Time')
-    plt.ylabel('Price')
-    plt.legend()
-    plt.grid(True)
-    
-    # 파일로 저장
-    output_file = "sp500_futures_3d_1m.png"
-    plt.savefig(output_file)
-    print(f"차트가 '{output_file}'로 저장되었습니다.")
+    # 한국 시간 기준 오전 9시와 오후 3시 30분 표시 (해당 시각의 봉이 있는 날만)
+    chart.add_session_markers(close_prices.index)
+
+    # 파일로 저장 (바뀐 내용이 없으면 건너뜀)
+    if chart.save():
+        print(f"차트가 '{chart.output_file}'로 저장되었습니다. (새 봉 {added}개)")
+    else:
+        print("새 데이터가 없어 차트를 다시 저장하지 않았습니다.")
     
     # 최근 데이터 일부 출력
     print("\n[최근 5분 데이터]")
     print(data.tail())
 
+    return chart
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--watch", type=int, default=0, help="N초마다 최근 1일치를 다시 받아 차트를 갱신 (0: 한 번만 실행)")
+    args = parser.parse_args()
+
+    chart = plot_sp500_futures_1m()
+    # 장이 닫힌 동안(주말/휴장)에는 다음 개장까지 잠들고, 마감 시각에 한 번 더 받아 마지막 봉을 반영합니다.
+    schedule = SessionSchedule(CME, args.watch)
+    while args.watch > 0:
+        time.sleep(schedule.seconds_until_next())
+        if not schedule.should_run():
+            continue
+        # 차트 객체를 재사용하므로 새 봉이 있을 때만 다시 그려 저장합니다.
+        chart = plot_sp500_futures_1m(chart, period="1d")
+
 if __name__ == "__main__":
-    plot_sp500_futures_1m()
+    main()
@@ -2,6 +2,8 @@ import mojito
 import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
+from multi_fetch import MultiFetcher
+from kis_client import MOCK_RATE_LIMIT
 
 def load_kis_api_info(filepath):
     """KIS API 정보를 외부 파일에서 읽어옵니다."""
@@ -51,29 +53,36 @@ def plot_kospi200_futures_from_kis():
         "201SC000",   # 24시간 연속선물 시도
     ]
     
-    for symbol in future_codes:
+    def has_minute_bars(resp):
+        return resp is not None and 'output2' in resp and bool(resp['output2'])
+    
+    def fetch_1m(symbol):
         print(f"\n{symbol} 선물 분봉 데이터 조회 시도...")
-        
         try:
-            # 선물 분봉 데이터 조회 시도
             resp = broker.fetch_today_1m_ohlcv(symbol)
-            
-            if 'output2' in resp and resp['output2']:
-                df = pd.DataFrame(resp['output2'])
-                print(f"[OK] {symbol}: {len(df)}개의 분봉 데이터 수신!")
-                
-                # 응답 데이터 구조 확인
-                print(f"컬럼: {df.columns.tolist()}")
-                print(df.head(3))
-                
-                return df, symbol
-            else:
-                print(f"[INFO] {symbol}: 데이터 없음")
-                if 'msg1' in resp:
-                    print(f"  메시지: {resp.get('msg1', '')}")
-                    
         except Exception as e:
             print(f"[ERROR] {symbol}: {e}")
+            return None
+        if not has_minute_bars(resp):
+            print(f"[INFO] {symbol}: 데이터 없음")
+            if 'msg1' in resp:
+                print(f"  메시지: {resp.get('msg1', '')}")
+        return resp
+    
+    # 후보 종목코드를 동시에 조회하고, 목록 순서상 가장 앞선 유효한 결과만 사용합니다.
+    # (모의투자 초당 한도만큼만 동시에 요청하고, 속도 제한은 KISClient와 같은 공용 limiter를 따름)
+    fetcher = MultiFetcher(max_per_host=MOCK_RATE_LIMIT, is_mock=True)
+    symbol, resp = fetcher.fetch_first(future_codes, fetch_1m, is_valid=has_minute_bars)
+    
+    if symbol is not None:
+        df = pd.DataFrame(resp['output2'])
+        print(f"[OK] {symbol}: {len(df)}개의 분봉 데이터 수신!")
+        
+        # 응답 데이터 구조 확인
+        print(f"컬럼: {df.columns.tolist()}")
+        print(df.head(3))
+        
+        return df, symbol
     
     # 다른 방법 시도: 해외선물 API 사용
     print("\n[INFO] 해외선물 API로 코스피200 야간선물 조회 시도...")
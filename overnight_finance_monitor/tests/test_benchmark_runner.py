@@ -0,0 +1,27 @@
+import sys
+import os
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(os.path.join(parent_dir, 'benchmarks'))
+
+import runner
+
+
+def test_run_save_and_compare_flags_regressions(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "REGISTRY", {})
+    runner.benchmark("sum", params=[10, 1000])(lambda n: (lambda: sum(range(n))))
+    results = runner.run(repeat=2)
+    assert set(results) == {"sum[10]", "sum[1000]"}
+
+    runner.save_results(results, "old", directory=str(tmp_path))
+    baseline = runner.load_baseline(exclude="new", directory=str(tmp_path))
+    assert baseline["revision"] == "old"
+
+    slower = {key: dict(value, min=value["min"] * 3) for key, value in results.items()}
+    slower["extra"] = {"min": 1.0}
+    regressions = runner.compare(slower, baseline, threshold=1.2)
+    assert sorted(key for key, *_ in regressions) == ["sum[1000]", "sum[10]"]
+    assert runner.compare(results, baseline, threshold=1.2) == []
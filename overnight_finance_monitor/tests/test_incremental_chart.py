@@ -0,0 +1,74 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(os.path.join(parent_dir, 'dash_render'))
+
+from incremental_chart import IncrementalChart
+from overnight import overnight_gaps
+
+
+def make_series(start, end):
+    index = pd.date_range(start, end, freq="1min", tz="Asia/Seoul")
+    return pd.Series(np.linspace(100.0, 110.0, len(index)), index=index)
+
+
+def test_update_appends_only_new_bars(tmp_path):
+    chart = IncrementalChart(str(tmp_path / "chart.png"), title="t", label="l", color="blue")
+    full = make_series("2026-10-15 08:00", "2026-10-16 10:00")
+
+    assert chart.update(full[:-30]) == len(full) - 30
+    assert chart.update(full) == 30
+    assert len(chart.line.get_xdata()) == len(full)
+
+    # 같은 데이터를 다시 넣으면 변경 없음
+    assert chart.update(full[-120:]) == 0
+
+    # 형성 중인 마지막 봉의 값만 바뀐 경우: 개수는 그대로, 값은 교체
+    revised = full[-5:].copy()
+    revised.iloc[-1] = 999.0
+    assert chart.update(revised) == 0
+    assert chart.line.get_ydata()[-1] == 999.0
+    assert len(chart) == len(full)
+
+
+def test_decorations_added_once_and_save_only_when_dirty(tmp_path):
+    output = tmp_path / "chart.png"
+    chart = IncrementalChart(str(output), title="t", label="l", color="blue")
+    series = make_series("2026-10-15 08:00", "2026-10-16 10:00")
+
+    chart.update(series)
+    assert chart.add_gaps(overnight_gaps(series)) == 1
+    assert chart.add_session_markers(series.index) == 3  # 10/15 09:00, 15:30, 10/16 09:00
+    assert chart.save() is True
+    assert output.exists()
+
+    # 같은 장식은 다시 추가되지 않고, 바뀐 것이 없으면 저장하지 않음
+    assert chart.add_gaps(overnight_gaps(series)) == 0
+    assert chart.add_session_markers(series.index) == 0
+    assert chart.update(series) == 0
+    assert chart.save() is False
+
+    # 텍스트는 축 비율 좌표이므로 y축 범위와 무관하게 같은 위치
+    label = [t for t in chart.ax.texts if t.get_text().startswith("Overnight")][0]
+    assert label.get_position()[1] == 0.1
+
+
+def test_max_points_trims_old_bars_and_decorations(tmp_path):
+    series = make_series("2026-10-15 08:00", "2026-10-16 10:00")
+    chart = IncrementalChart(str(tmp_path / "chart.png"), title="t", label="l", color="blue", max_points=600)
+    chart.update(series[:600])
+    assert chart.add_session_markers(series.index[:600]) == 2  # 10/15 09:00, 15:30
+    assert len(chart.ax.lines) == 3
+
+    # 새 봉이 들어오면 오래된 봉과 그 구간의 장식이 함께 밀려납니다.
+    assert chart.update(series) == len(series) - 600
+    assert len(chart) == 600
+    assert chart.line.get_xdata()[-1] == chart._x[-1]
+    assert len(chart.ax.lines) == 1 and not chart._marker_artists
@@ -0,0 +1,73 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from kis_bars import parse_output2, decode_kis_timestamps, decode_kst_datetimes
+
+
+def futures_record(date, hour, price, volume="3"):
+    return {
+        "stck_bsop_date": date, "stck_cntg_hour": hour,
+        "futs_prpr": price, "futs_oprc": price, "futs_hgpr": price, "futs_lwpr": price,
+        "cntg_vol": volume,
+    }
+
+
+def test_parse_output2_builds_typed_columns():
+    records = [
+        futures_record("20261016", "090100", "352.15", "7"),
+        futures_record("20261016", "90000", "351.80", "12"),  # 앞자리 0이 빠진 시각
+    ]
+    bars = parse_output2(records)
+
+    assert bars.ts.dtype == np.int64
+    assert bars.close.dtype == np.float64
+    assert bars.volume.dtype == np.int64
+    # 09:00 KST == 00:00 UTC
+    assert bars.ts[1] == pd.Timestamp("2026-10-16 00:00", tz="UTC").value
+    assert bars.close.tolist() == [352.15, 351.80]
+    assert bars.volume.tolist() == [7, 12]
+
+
+def test_sorted_unique_and_valid():
+    records = [
+        futures_record("20261016", "090200", "352.00"),
+        futures_record("20261016", "090100", "0"),
+        futures_record("20261016", "090000", "351.50"),
+        futures_record("20261016", "090200", "352.00"),
+        futures_record("20261016", "090300", ""),  # 빈 문자열은 0으로 처리
+    ]
+    frame = parse_output2(records).valid().sorted_unique().to_frame()
+
+    assert frame["time"].tolist() == [pd.Timestamp("2026-10-16 09:00"), pd.Timestamp("2026-10-16 09:02")]
+    assert frame["close"].tolist() == [351.50, 352.00]
+
+
+def test_parse_output2_stock_fields_without_date():
+    records = [{"stck_cntg_hour": "153000", "stck_prpr": "100.5", "stck_oprc": "100", "stck_hgpr": "101", "stck_lwpr": "99"}]
+    frame = parse_output2(records, date="20261016").to_frame()
+
+    assert frame["time"].iloc[0] == pd.Timestamp("2026-10-16 15:30")
+    assert frame[["open", "high", "low", "close"]].iloc[0].tolist() == [100.0, 101.0, 99.0, 100.5]
+    assert frame["volume"].iloc[0] == 0
+
+
+def test_decode_kis_timestamps_matches_pandas():
+    days = pd.date_range("1999-12-25", "2101-03-05", freq="37D")
+    dates = days.strftime("%Y%m%d").tolist()
+    hours = ["235959" if i % 2 else "90501" for i in range(len(dates))]
+    expected = pd.to_datetime([d + h.zfill(6) for d, h in zip(dates, hours)], format="%Y%m%d%H%M%S")
+
+    ts = decode_kis_timestamps(dates, hours)
+    assert ts.tolist() == (expected.as_unit("ns").asi8 - 9 * 3600 * 10**9).tolist()
+
+    kst = decode_kst_datetimes(dates, hours)
+    assert str(kst.tz) == "Asia/Seoul"
+    assert kst.tz_localize(None).equals(expected.as_unit("ns"))
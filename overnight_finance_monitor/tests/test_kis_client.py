@@ -0,0 +1,232 @@
+import sys
+import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from kis_client import KISClient, RateLimiter
+
+
+class StubKIS:
+    """KIS REST API 흉내를 내는 로컬 HTTP 서버 (keep-alive 지원)"""
+
+    def __init__(self):
+        self.token_requests = 0
+        self.client_ports = set()
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, payload, status=200):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                stub.token_requests += 1
+                self._reply({"access_token": f"token-{stub.token_requests}", "expires_in": 86400})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                stub.client_ports.add(self.client_address[1])
+                stub.requests.append((url.path, self.headers["tr_id"], parse_qs(url.query), self.headers["authorization"]))
+                self._reply({"rt_cd": "0", "msg1": "OK", "output": {"futs_prpr": "350.25"}, "output2": []})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_token_is_issued_once_and_reused_from_disk(tmp_path):
+    stub = StubKIS()
+    token_path = str(tmp_path / "kis_token.dat")
+    try:
+        first = KISClient("key", "secret", base_url=stub.base_url, token_path=token_path)
+        assert first.inquire_price("101SC000")["output"]["futs_prpr"] == "350.25"
+        first.inquire_price("101SC000")
+
+        # 새 프로세스(새 클라이언트)도 파일에 저장된 토큰을 그대로 사용합니다.
+        second = KISClient("key", "secret", base_url=stub.base_url, token_path=token_path)
+        second.inquire_time_futuroptprice("101SC000", hour="153000")
+        assert stub.token_requests == 1
+        assert all(auth == "Bearer token-1" for *_, auth in stub.requests)
+
+        path, tr_id, params, _ = stub.requests[-1]
+        assert path.endswith("/inquire-time-futuroptprice") and tr_id == "FHMIF10020000"
+        assert params["FID_INPUT_HOUR_1"] == ["153000"]
+    finally:
+        stub.close()
+
+
+def test_requests_share_one_keep_alive_connection(tmp_path):
+    stub = StubKIS()
+    try:
+        client = KISClient("key", "secret", base_url=stub.base_url, token_path=str(tmp_path / "kis_token.dat"))
+        for _ in range(5):
+            client.inquire_price("101SC000")
+        assert len(stub.requests) == 5
+        assert len(stub.client_ports) == 1
+    finally:
+        stub.close()
+
+
+class GatewayErrorStub(StubKIS):
+    """처음 몇 번은 KIS 게이트웨이 오류(HTTP 500 + msg_cd)를 돌려주는 스텁"""
+
+    def __init__(self, errors):
+        super().__init__()
+        self.errors = list(errors)
+        handler = self.server.RequestHandlerClass
+        stub = self
+
+        def do_GET(self):
+            stub.requests.append(self.headers["authorization"])
+            if stub.errors:
+                self._reply({"rt_cd": "1", "msg_cd": stub.errors.pop(0), "msg1": "gateway error"}, status=500)
+            else:
+                self._reply({"rt_cd": "0", "msg1": "OK", "output": {"futs_prpr": "350.25"}})
+        handler.do_GET = do_GET
+
+
+def test_expired_token_500_refreshes_token_exactly_once(tmp_path):
+    stub = GatewayErrorStub(["EGW00123"])
+    try:
+        client = KISClient("key", "secret", base_url=stub.base_url, token_path=str(tmp_path / "kis_token.dat"))
+        assert client.inquire_price("101SC000")["output"]["futs_prpr"] == "350.25"
+        # 최초 발급 1회 + 만료 응답에 따른 재발급 1회, HTTP 재시도 없이 요청 2번
+        assert stub.token_requests == 2
+        assert stub.requests == ["Bearer token-1", "Bearer token-2"]
+    finally:
+        stub.close()
+
+
+def test_rate_limited_500_is_retried_and_repeated_expiry_returns_none(tmp_path, monkeypatch):
+    monkeypatch.setattr("kis_client.RATE_LIMIT_BACKOFF", 0.0)
+    stub = GatewayErrorStub(["EGW00201", "EGW00201"])
+    try:
+        client = KISClient("key", "secret", base_url=stub.base_url, token_path=str(tmp_path / "kis_token.dat"))
+        assert client.inquire_price("101SC000")["output"]["futs_prpr"] == "350.25"
+        assert len(stub.requests) == 3 and stub.token_requests == 1
+
+        # 재발급한 토큰도 만료 응답이면 예외(RetryError) 없이 None을 반환합니다.
+        stub.errors = ["EGW00123", "EGW00123"]
+        assert client.inquire_price("101SC000") is None
+        assert stub.token_requests == 2
+    finally:
+        stub.close()
+
+
+class PagedMinuteStub(StubKIS):
+    """08:45 ~ 15:45 분봉을 기준 시각 이전 page_size개씩 최신순으로 돌려주는 스텁"""
+
+    def __init__(self, page_size=30, missing=()):
+        super().__init__()
+        self.page_size = page_size
+        minutes = [m for m in range(8 * 60 + 45, 15 * 60 + 46) if m not in missing]
+        self.bars = [f"{m // 60:02d}{m % 60:02d}00" for m in minutes]
+        handler = self.server.RequestHandlerClass
+        stub = self
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            cursor = parse_qs(url.query)["FID_INPUT_HOUR_1"][0]
+            stub.requests.append(cursor)
+            page = [h for h in stub.bars if h <= cursor][::-1][:stub.page_size]
+            rows = [{"stck_bsop_date": "20261016", "stck_cntg_hour": h, "futs_prpr": "350.00"} for h in page]
+            self._reply({"rt_cd": "0", "msg1": "OK", "output2": rows})
+        handler.do_GET = do_GET
+
+
+def test_fetch_minute_chart_day_walks_back_to_session_start(tmp_path):
+    # 중간에 체결이 없는 분(11:00~11:09)이 있어도 빠짐없이 이어 붙여야 합니다.
+    missing = set(range(11 * 60, 11 * 60 + 10))
+    stub = PagedMinuteStub(page_size=30, missing=missing)
+    try:
+        client = KISClient("key", "secret", base_url=stub.base_url, token_path=str(tmp_path / "kis_token.dat"),
+                           rate_limiter=RateLimiter(rate=1000))
+        rows = client.fetch_minute_chart_day("101SC000", session_start="084500", end_hour="154500", max_workers=4)
+        hours = [r["stck_cntg_hour"] for r in rows]
+        assert hours == stub.bars
+        # 420여 개 분봉 / 페이지 30개 → 순차 조회와 거의 같은 요청 수로 끝납니다.
+        assert len(stub.requests) <= len(stub.bars) // 29 + 5
+    finally:
+        stub.close()
+
+
+class TwoDayMinuteStub(StubKIS):
+    """전일 15:00~15:45 분봉 뒤에 당일 08:45~10:00 분봉이 이어지고, failing 기준 시각은 항상 실패하는 스텁"""
+
+    def __init__(self, page_size=30, failing=()):
+        super().__init__()
+        self.page_size = page_size
+        self.failing = set(failing)
+        self.bars = [("20261015", f"15{m:02d}00") for m in range(46)]
+        self.bars += [("20261016", f"{m // 60:02d}{m % 60:02d}00") for m in range(8 * 60 + 45, 10 * 60 + 1)]
+        handler = self.server.RequestHandlerClass
+        stub = self
+
+        def do_GET(self):
+            cursor = parse_qs(urlparse(self.path).query)["FID_INPUT_HOUR_1"][0]
+            stub.requests.append(cursor)
+            if cursor in stub.failing:
+                self._reply({"rt_cd": "1", "msg1": "ERROR"})
+                return
+            # 당일 기준 시각 이전 분봉이 모자라면 전일 분봉이 이어서 옵니다. (FID_PW_DATA_INCU_YN=Y)
+            page = [b for b in stub.bars if b[0] == "20261015" or b[1] <= cursor][::-1]
+            rows = [{"stck_bsop_date": d, "stck_cntg_hour": h, "futs_prpr": "350.00"} for d, h in page[:stub.page_size]]
+            self._reply({"rt_cd": "0", "msg1": "OK", "output2": rows})
+        handler.do_GET = do_GET
+
+
+def test_fetch_minute_chart_day_keeps_only_the_business_date(tmp_path):
+    stub = TwoDayMinuteStub(page_size=30)
+    try:
+        client = KISClient("key", "secret", base_url=stub.base_url, token_path=str(tmp_path / "kis_token.dat"),
+                           rate_limiter=RateLimiter(rate=1000))
+        # 세션 시작을 자정으로 잡아도 전일 15시대 분봉은 섞이지 않습니다.
+        rows = client.fetch_minute_chart_day("101SC000", session_start="000000", end_hour="100000")
+        assert {r["stck_bsop_date"] for r in rows} == {"20261016"}
+        assert [r["stck_cntg_hour"] for r in rows] == [h for d, h in stub.bars if d == "20261016"]
+    finally:
+        stub.close()
+
+
+def test_fetch_minute_chart_day_gives_up_on_a_failing_page(tmp_path):
+    # 09:30:59 기준 페이지가 계속 실패해도 무한히 다시 요청하지 않고 받은 구간만 반환합니다.
+    stub = TwoDayMinuteStub(page_size=30, failing={"093059"})
+    try:
+        client = KISClient("key", "secret", base_url=stub.base_url, token_path=str(tmp_path / "kis_token.dat"),
+                           rate_limiter=RateLimiter(rate=1000))
+        rows = client.fetch_minute_chart_day("101SC000", end_hour="100000", max_workers=1, max_page_retries=2)
+        assert rows[0]["stck_cntg_hour"] == "093100" and rows[-1]["stck_cntg_hour"] == "100000"
+        assert stub.requests.count("093059") == 3
+    finally:
+        stub.close()
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=50, capacity=1)
+    started = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - started >= 0.09
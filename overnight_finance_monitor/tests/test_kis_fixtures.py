@@ -0,0 +1,31 @@
+import sys
+import os
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from kis_fixtures import KISRecorder, KISFixtureServer, fixture_key
+
+PRICE_PATH = "/uapi/domestic-futureoption/v1/quotations/inquire-price"
+
+
+def test_recorded_responses_are_replayed_by_stub_server(tmp_path):
+    fixture_path = str(tmp_path / "kis.json.gz")
+    live = {fixture_key(PRICE_PATH, "FHMIF10000000", {"FID_COND_MRKT_DIV_CODE": "F", "FID_INPUT_ISCD": "101SC000"}):
+            {"rt_cd": "0", "msg1": "정상처리", "output": {"futs_prpr": "352.15"}}}
+
+    # '실제' 서버 역할을 하는 stub에서 녹화
+    with KISFixtureServer(live) as upstream:
+        client = upstream.client()
+        with KISRecorder(client, fixture_path) as recorder:
+            assert client.inquire_price("101SC000")["output"]["futs_prpr"] == "352.15"
+        assert len(recorder.responses) == 1
+
+    # 녹화 파일만으로 같은 응답을 재생하고, 녹화하지 않은 요청은 None
+    with KISFixtureServer.from_file(fixture_path) as replay:
+        client = replay.client()
+        assert client.inquire_price("101SC000") == {"rt_cd": "0", "msg1": "정상처리", "output": {"futs_prpr": "352.15"}}
+        assert client.inquire_price("105V1000") is None
+        assert len(replay.misses) == 1
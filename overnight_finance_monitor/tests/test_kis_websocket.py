@@ -0,0 +1,168 @@
+import sys
+import os
+import json
+import asyncio
+from http import HTTPStatus
+from datetime import datetime, timezone
+
+import pandas as pd
+from websockets.asyncio.server import serve
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from kis_websocket import KISWebSocketFeed, parse_ticks
+
+# 2026-10-16 09:05 KST
+RECEIVED = datetime(2026, 10, 16, 0, 5, tzinfo=timezone.utc)
+
+
+def kst_ns(text):
+    return pd.Timestamp(text, tz="Asia/Seoul").value
+
+
+# 실제 H0IFCNT0 수신 메시지 (체결 2건, 건당 49개 필드)
+RECORDED_FRAME = (
+    "0|H0IFCNT0|002|"
+    "101W12^090001^-1.25^5^-0.35^352.15^353.00^353.10^351.90^3^1520^1340250^352.33^0.82^-0.18^355.20^349.10^0.00"
+    "^286512^-12^084500^5^-0.85^084612^5^-0.95^085930^2^0.25^98.51^98.51^1.05^-12^0.64^352.20^352.15^12^9^710^805"
+    "^95^760^758^4410^5120^11.63^359.90^344.40^N^"
+    "101W12^090002^-1.20^5^-0.34^352.20^353.00^353.10^351.90^1^1521^1340602^352.33^0.87^-0.18^355.20^349.10^0.00"
+    "^286512^-12^084500^5^-0.80^084612^5^-0.90^085930^2^0.30^98.62^98.62^1.05^-12^0.69^352.20^352.15^11^9^710^806"
+    "^96^760^759^4402^5120^11.64^359.90^344.40^N"
+)
+
+
+def tick_record(hour, price, volume, symbol="101W12"):
+    # H0IFCNT0 필드 중 종목코드(0), 시각(1), 현재가(5), 체결량(9)만 의미 있는 값으로 채움
+    fields = [symbol, hour, "1.00", "2", "0.30", f"{price:.2f}", "0", "0", "0", str(volume), "1000", "0"]
+    return "^".join(fields)
+
+
+def tick_message(*records):
+    return f"0|H0IFCNT0|{len(records):03d}|" + "^".join(records)
+
+
+def test_parse_ticks_splits_multi_record_messages():
+    raw = tick_message(tick_record("090001", 352.15, 3), tick_record("090002", 352.20, 1))
+    assert parse_ticks(raw, RECEIVED) == [
+        ("101W12", kst_ns("2026-10-16 09:00:01"), 352.15, 3),
+        ("101W12", kst_ns("2026-10-16 09:00:02"), 352.20, 1),
+    ]
+    # 자정 직후 도착한 전날 체결은 전날 날짜로
+    after_midnight = datetime(2026, 10, 16, 15, 0, 5, tzinfo=timezone.utc)
+    assert parse_ticks(tick_message(tick_record("235959", 1.0, 1)), after_midnight)[0][1] == kst_ns("2026-10-16 23:59:59")
+    assert parse_ticks("1|H0IFCNT0|001|encrypted", RECEIVED) == []
+
+
+def test_feed_builds_bars_from_frames_in_bounded_memory():
+    bars = []
+    feed = KISWebSocketFeed("approval", ["101W12"], intervals=("1m", "5m"), max_bars=3,
+                            on_bar=lambda symbol, interval, bar: bars.append((interval, bar)), clock=lambda: RECEIVED)
+    start = kst_ns("2026-10-16 09:00")
+    assert feed.handle(RECORDED_FRAME) is None
+    feed.handle(tick_message(tick_record("090040", 351.90, 2)))
+    assert bars == []
+
+    feed.handle(tick_message(tick_record("090105", 352.50, 1)))
+    assert bars == [("1m", (start, 352.15, 352.20, 351.90, 351.90, 6))]
+    feed.handle(tick_message(tick_record("090050", 399.00, 1)))  # 이미 완성된 분의 늦은 체결
+    assert feed.late("101W12") == 1
+
+    for minute in range(2, 10):
+        feed.handle(tick_message(tick_record(f"09{minute:02d}00", 350.0 + minute, 1)))
+    assert len(feed.to_bars("101W12")) == 3
+    assert list(feed.to_bars("101W12", include_current=True).close) == [356.0, 357.0, 358.0, 359.0]
+
+    feed.handle(tick_message(tick_record("091000", 360.0, 1)))
+    assert [(interval, bar[0]) for interval, bar in bars[-2:]] == [("1m", start + 9 * 60 * 10 ** 9),
+                                                                   ("5m", start + 5 * 60 * 10 ** 9)]
+    five_minute = feed.to_bars("101W12", "5m")
+    assert list(five_minute.ts) == [start, start + 5 * 60 * 10 ** 9]
+    assert (five_minute.open[1], five_minute.high[1], five_minute.close[1], five_minute.volume[1]) == (355.0, 359.0, 359.0, 5)
+
+
+def test_feed_subscribes_answers_pingpong_and_resubscribes_after_reconnect():
+    received = []
+    connections = []
+
+    async def handler(ws):
+        connections.append(ws)
+        subscription = json.loads(await ws.recv())
+        received.append(subscription)
+        if len(connections) == 1:
+            await ws.send(json.dumps({"header": {"tr_id": "PINGPONG", "datetime": "20261016090500"}}))
+            received.append(json.loads(await ws.recv()))
+            await ws.send(tick_message(tick_record("090001", 352.15, 3), tick_record("090030", 352.40, 2)))
+            await ws.send(tick_message(tick_record("090110", 352.05, 1)))
+            # 연결 끊김 흉내
+            await ws.close()
+        else:
+            await ws.send(tick_message(tick_record("090205", 352.50, 4)))
+            await ws.close()
+
+    bars = []
+
+    async def scenario():
+        async with serve(handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            feed = KISWebSocketFeed("approval", ["101W12"], url=f"ws://127.0.0.1:{port}",
+                                    on_bar=lambda symbol, interval, bar: bars.append(bar),
+                                    reconnect_delay=0.01, clock=lambda: RECEIVED)
+            await asyncio.wait_for(feed.run(max_connects=2), timeout=10)
+            return feed
+
+    feed = asyncio.run(scenario())
+
+    assert feed.connects == 2
+    subscriptions = [m for m in received if "body" in m]
+    assert [m["body"]["input"] for m in subscriptions] == [{"tr_id": "H0IFCNT0", "tr_key": "101W12"}] * 2
+    assert subscriptions[0]["header"]["approval_key"] == "approval"
+    assert {"header": {"tr_id": "PINGPONG", "datetime": "20261016090500"}} in received
+
+    # 재접속 전후 체결이 이어져 09:00, 09:01, 09:02(종료 시 완성) 봉이 만들어짐
+    assert [bar[0] for bar in bars] == [kst_ns("2026-10-16 09:00"), kst_ns("2026-10-16 09:01"), kst_ns("2026-10-16 09:02")]
+    assert bars[0][1:] == (352.15, 352.40, 352.15, 352.40, 5)
+
+
+def test_feed_skips_malformed_frames():
+    bars = []
+    feed = KISWebSocketFeed("approval", ["101W12"], on_bar=lambda symbol, interval, bar: bars.append(bar), clock=lambda: RECEIVED)
+    assert feed.handle("0|H0IFCNT0|001|101W12^090000^x") is None
+    assert feed.handle("0|H0IFCNT0|abc|101W12") is None
+    assert feed.handle("not json") is None
+    assert feed.bad_frames == 3
+
+    # 이후의 정상 체결은 그대로 처리됩니다.
+    feed.handle(tick_message(tick_record("090001", 352.15, 3)))
+    feed.handle(tick_message(tick_record("090101", 352.20, 1)))
+    assert [bar[0] for bar in bars] == [kst_ns("2026-10-16 09:00")]
+
+
+def test_feed_reconnects_after_rejected_handshake():
+    attempts = []
+
+    def process_request(connection, request):
+        attempts.append(request.path)
+        if len(attempts) <= 2:
+            return connection.respond(HTTPStatus.SERVICE_UNAVAILABLE, "busy\n")
+        return None
+
+    async def handler(ws):
+        await ws.recv()
+        await ws.send(tick_message(tick_record("090001", 352.15, 3)))
+        await ws.close()
+
+    async def scenario():
+        async with serve(handler, "127.0.0.1", 0, process_request=process_request) as server:
+            port = server.sockets[0].getsockname()[1]
+            feed = KISWebSocketFeed("approval", ["101W12"], url=f"ws://127.0.0.1:{port}",
+                                    reconnect_delay=0.01, clock=lambda: RECEIVED)
+            await asyncio.wait_for(feed.run(max_connects=1), timeout=10)
+            return feed
+
+    feed = asyncio.run(scenario())
+    # 503으로 거절된 핸드셰이크 두 번 뒤에도 멈추지 않고 다시 접속합니다.
+    assert len(attempts) == 3 and feed.connects == 1
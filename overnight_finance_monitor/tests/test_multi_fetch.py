@@ -0,0 +1,69 @@
+import sys
+import os
+import time
+import threading
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from kis_client import KISClient, RateLimiter
+from multi_fetch import MultiFetcher
+
+
+class SlowFetch:
+    """요청마다 delay초가 걸리는 가짜 조회 함수. 동시에 실행된 최대 개수를 기록합니다."""
+
+    def __init__(self, delay, results):
+        self.delay = delay
+        self.results = results
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, symbol):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        result = self.results[symbol]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_fetch_all_runs_concurrently_within_host_limit():
+    symbols = [f"S{i}" for i in range(6)]
+    fetch = SlowFetch(0.2, {s: s.lower() for s in symbols})
+    fetcher = MultiFetcher(max_per_host=3, rate_limiter=RateLimiter(rate=1000))
+
+    started = time.monotonic()
+    results = fetcher.fetch_all(symbols, fetch)
+    elapsed = time.monotonic() - started
+
+    assert results == {s: s.lower() for s in symbols}
+    assert fetch.max_active == 3
+    assert elapsed < 0.2 * len(symbols) / 2
+
+
+def test_fetch_first_prefers_list_order_and_skips_failures():
+    results = {"101V3000": RuntimeError("no permission"), "101SC000": None, "101S3000": "bars", "201SC000": "other"}
+    fetch = SlowFetch(0.1, results)
+    fetcher = MultiFetcher(max_per_host=4, rate_limiter=RateLimiter(rate=1000))
+
+    started = time.monotonic()
+    symbol, result = fetcher.fetch_first(list(results), fetch)
+    assert (symbol, result) == ("101S3000", "bars")
+    assert time.monotonic() - started < 0.3
+
+    assert fetcher.fetch_first(["101V3000", "101SC000"], fetch) == (None, None)
+
+
+def test_default_rate_limiter_is_shared_with_kis_client():
+    client = KISClient("key", "secret", token_path=None)
+    assert MultiFetcher().rate_limiter is client.rate_limiter
+    assert MultiFetcher(is_mock=True).rate_limiter is KISClient("key", "secret", is_mock=True, token_path=None).rate_limiter
+    assert MultiFetcher().rate_limiter is not MultiFetcher(is_mock=True).rate_limiter
@@ -0,0 +1,100 @@
+import sys
+import os
+import sqlite3
+import logging
+
+import numpy as np
+import pandas as pd
+
+# 부모 디렉토리를 path에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from oracle_ingest import BarWriter, BarConnectionPool, create_sqlite_pool, bar_rows, snapshot_1530
+
+
+def make_bars(start, periods, base=5000.0):
+    index = pd.date_range(start, periods=periods, freq="1min", tz="UTC")
+    close = base + np.arange(periods, dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                         'Volume': np.arange(periods)}, index=index)
+
+
+def count_rows(path, symbol=None):
+    with sqlite3.connect(path) as connection:
+        if symbol is None:
+            return connection.execute("SELECT COUNT(*) FROM FUTURES_BARS").fetchone()[0]
+        return connection.execute("SELECT COUNT(*) FROM FUTURES_BARS WHERE symbol = ?", (symbol,)).fetchone()[0]
+
+
+def test_upsert_is_idempotent_and_updates_revised_bars(tmp_path):
+    path = str(tmp_path / "bars.db")
+    writer = BarWriter(create_sqlite_pool(path), dialect="sqlite", batch_size=100)
+    writer.create_table()
+
+    bars = make_bars("2026-10-15 00:00", 3 * 24 * 60)
+    assert writer.write("ES=F", bars) == len(bars)
+    assert count_rows(path) == len(bars)
+
+    # 같은 구간 재적재 + 마지막 봉 수정 + 새 봉 1개
+    revised = pd.concat([bars, make_bars(bars.index[-1] + pd.Timedelta(minutes=1), 1)])
+    revised.iloc[-2, revised.columns.get_loc('Close')] = 1.5
+    writer.write("ES=F", revised)
+
+    assert count_rows(path) == len(bars) + 1
+    with sqlite3.connect(path) as connection:
+        ts = bars.index[-1].strftime("%Y-%m-%d %H:%M:%S")
+        close = connection.execute("SELECT close_price FROM FUTURES_BARS WHERE symbol = 'ES=F' AND ts = ?", (ts,)).fetchone()[0]
+    assert close == 1.5
+
+
+def test_bar_rows_normalizes_columns_and_drops_empty_bars():
+    bars = make_bars("2026-10-15 09:00", 3)
+    bars.columns = pd.MultiIndex.from_product([bars.columns, ["NQ=F"]])
+    bars.iloc[1, 3] = np.nan
+
+    rows = bar_rows("NQ=F", bars, ts_format="%Y-%m-%d %H:%M:%S")
+
+    assert [r[2] for r in rows] == ["2026-10-15 09:00:00", "2026-10-15 09:02:00"]
+    assert rows[0] == ("NQ=F", "1m", "2026-10-15 09:00:00", 5000.0, 5001.0, 4999.0, 5000.0, 0)
+    assert bar_rows("NQ=F", pd.DataFrame()) == []
+
+
+def test_pool_reuses_connections():
+    created = []
+
+    def connect():
+        created.append(sqlite3.connect(":memory:", check_same_thread=False))
+        return created[-1]
+
+    pool = BarConnectionPool(connect, size=2)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    second = pool.acquire()
+    assert second is not first and len(created) == 2
+
+
+def test_snapshot_writes_every_symbol(tmp_path):
+    path = str(tmp_path / "bars.db")
+    writer = BarWriter(create_sqlite_pool(path), dialect="sqlite")
+    writer.create_table()
+
+    def downloader(ticker, interval, start, end):
+        return make_bars("2026-10-16 00:00", 60, base=20000.0 if ticker == "NQ=F" else 5000.0)
+
+    counts = snapshot_1530(writer, downloader=downloader)
+
+    assert counts == {"ES=F": 60, "NQ=F": 60}
+    assert count_rows(path, "NQ=F") == 60
+
+
+def test_write_logs_loaded_rows(tmp_path, caplog):
+    writer = BarWriter(create_sqlite_pool(str(tmp_path / "bars.db")), dialect="sqlite")
+    writer.create_table()
+
+    with caplog.at_level(logging.INFO, logger="oracle_ingest"):
+        writer.write("ES=F", make_bars("2026-10-16 00:00", 5))
+
+    assert "ES=F (1m) 5행 적재" in caplog.text